@@ -0,0 +1,180 @@
+"""
+Aggregates Module
+Maintains student counts by field of study, type, year, course and age.
+"""
+
+from collections import Counter
+from serialization import StudentRecord, student_type
+
+# Names of the maintained counts, each keyed by the value it counts
+AGGREGATES = ("field_of_study", "type", "year", "course", "age")
+
+# Counters keyed by aggregate name
+_counts = {name: Counter() for name in AGGREGATES}
+
+# Number of students counted
+_total = 0
+
+# Whether the counts reflect the database; cleared by invalidate()
+_built = True
+
+def _student_values(student):
+    """Get the counted field of study, type, year, courses and age of a student object or record."""
+    if isinstance(student, StudentRecord):
+        return student.field_of_study, student.type, student.year, student.courses, student.age
+    return (student.get_field_of_study(), student_type(student), student.get_year(),
+            student.get_courses(), student.get_age())
+
+def _count(student, change):
+    """Add change (1 or -1) to every count the student contributes to."""
+    global _total
+
+    field_of_study, type_name, year, courses, age = _student_values(student)
+    keys = (
+        ("field_of_study", field_of_study),
+        ("type", type_name),
+        ("year", year),
+        ("age", age)
+    )
+    # A course listed twice by one student is only counted once
+    keys += tuple(("course", course) for course in set(courses))
+
+    for name, key in keys:
+        counts = _counts[name]
+        value = counts[key] + change
+        if value:
+            counts[key] = value
+        else:
+            del counts[key]
+
+    _total += change
+
+def add_student(student):
+    """
+    Count a new student.
+
+    Args:
+        student: A Student, Undergraduate, or Postgraduate object, or a StudentRecord.
+    """
+    if _built:
+        _count(student, 1)
+
+def update_student(old_student, new_student):
+    """
+    Replace a student's contribution to the counts.
+
+    Args:
+        old_student: The student object or record currently counted.
+        new_student: The student object replacing it.
+    """
+    if _built:
+        _count(old_student, -1)
+        _count(new_student, 1)
+
+def remove_student(student):
+    """
+    Stop counting a student.
+
+    Args:
+        student: A Student, Undergraduate, or Postgraduate object, or a StudentRecord.
+    """
+    if _built:
+        _count(student, -1)
+
+def compute(students):
+    """
+    Count students from scratch, without touching the maintained counts.
+
+    Args:
+        students (iterable): Student objects or StudentRecord tuples.
+
+    Returns:
+        dict: The total under "total" and a Counter per name in AGGREGATES.
+    """
+    counts = {name: Counter() for name in AGGREGATES}
+    total = 0
+
+    for student in students:
+        field_of_study, type_name, year, courses, age = _student_values(student)
+        counts["field_of_study"][field_of_study] += 1
+        counts["type"][type_name] += 1
+        counts["year"][year] += 1
+        counts["age"][age] += 1
+        counts["course"].update(set(courses))
+        total += 1
+
+    counts["total"] = total
+    return counts
+
+def rebuild(students):
+    """
+    Recount every student.
+
+    Args:
+        students (iterable): Student objects or StudentRecord tuples.
+    """
+    global _total, _built
+
+    counts = compute(students)
+    _total = counts.pop("total")
+    _counts.update(counts)
+    _built = True
+
+def invalidate():
+    """
+    Drop the counts until the next rebuild.
+
+    Changes made while the counts are invalidated are ignored, since the
+    rebuild will pick them up.
+    """
+    global _total, _built
+
+    for counts in _counts.values():
+        counts.clear()
+    _total = 0
+    _built = False
+
+def is_built():
+    """
+    Check whether the counts are up to date.
+
+    Returns:
+        bool: False if the counts were invalidated and not rebuilt since.
+    """
+    return _built
+
+def snapshot():
+    """
+    Get a copy of the current counts.
+
+    Returns:
+        dict: The number of students under "total" and a Counter per name
+            in AGGREGATES, mapping each value to its number of students.
+    """
+    counts = {name: Counter(_counts[name]) for name in AGGREGATES}
+    counts["total"] = _total
+    return counts
+
+def differences(students):
+    """
+    Compare the maintained counts with a full recount.
+
+    Args:
+        students (iterable): Every student in the database.
+
+    Returns:
+        list: A description of each count that differs, empty if they all match.
+    """
+    expected = compute(students)
+    actual = snapshot()
+    problems = []
+
+    if actual["total"] != expected["total"]:
+        problems.append(f"total: counted {actual['total']}, expected {expected['total']}")
+
+    for name in AGGREGATES:
+        for key in set(actual[name]) | set(expected[name]):
+            if actual[name][key] != expected[name][key]:
+                problems.append(f"{name} {key!r}: counted {actual[name][key]}, expected {expected[name][key]}")
+
+    return problems
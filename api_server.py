@@ -0,0 +1,385 @@
+"""
+API Server Module
+Serves the student operations as a JSON API over HTTP, without Streamlit.
+
+Requests are parsed on an asyncio event loop, so many clients can stay
+connected at once, and the operations themselves run in a thread pool
+since they may block on storage I/O.
+
+Endpoints:
+    GET    /students?offset=0&limit=50&sort=name&order=desc   One page of students
+    GET    /students/<id>                                     One student
+    GET    /search?q=<keyword>&offset=0&limit=50              Students containing the keyword
+    GET    /search?q=<keyword>&fuzzy=1&limit=20               Closest matches, best first
+    POST   /students                                          Add a student, generating a missing ID
+    POST   /students/bulk                                     Add a list of students at once
+    PUT    /students/<id>                                     Replace a student's details
+    DELETE /students/<id>                                     Delete a student
+
+Students are sent and returned in the storage format (see COLUMNS in
+bulk_import). Errors are returned as {"error": message}.
+
+Usage: python api_server.py [--host 127.0.0.1] [--port 8080] [--storage students.json]
+       [--flush-window SECONDS]
+"""
+
+import sys
+import json
+import asyncio
+import logging
+import argparse
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs, unquote
+from concurrent.futures import ThreadPoolExecutor
+import database
+import persistence
+import student_operations
+from bulk_import import row_to_student, import_rows
+from id_generator import generate_id_from_name, release_ids
+from serialization import student_to_dict
+from exceptions import (
+    StudentManagementException,
+    ValidationException,
+    StorageException,
+    DuplicateStudentIDException,
+    StudentNotFoundException
+)
+
+# Largest request head and body accepted, in bytes
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+# Page size used when a list or search request does not give a limit, and the largest allowed
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+# Number of threads running operations
+WORKER_THREADS = 8
+
+# Seconds an idle keep-alive connection is kept open
+KEEP_ALIVE_SECONDS = 30
+
+logger = logging.getLogger(__name__)
+
+class HTTPError(Exception):
+    """Error returned to the client with a specific HTTP status."""
+
+    def __init__(self, status, message):
+        """
+        Initialize an HTTPError.
+
+        Args:
+            status (HTTPStatus): The response status.
+            message (str): The error message sent to the client.
+        """
+        super().__init__(message)
+        self.status = status
+
+def _get_int(query, name, default, maximum=None):
+    """Read a non-negative integer query parameter."""
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        value = int(values[0])
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} must be an integer")
+    if value < 0:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} must not be negative")
+    return value if maximum is None else min(value, maximum)
+
+def _get_flag(query, name):
+    """Read a boolean query parameter such as fuzzy=1."""
+    values = query.get(name)
+    return bool(values) and values[0].lower() in ("1", "true", "yes")
+
+def _page(students, offset, limit, total):
+    """Build the response for a page of students."""
+    return {
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "students": [student_to_dict(student) for student in students]
+    }
+
+def list_students(query):
+    """Handle GET /students."""
+    offset = _get_int(query, "offset", 0)
+    limit = _get_int(query, "limit", DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+
+    sort_by = query.get("sort", [None])[0]
+    if sort_by is not None and sort_by not in database.SORT_FIELDS:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"sort must be one of {', '.join(database.SORT_FIELDS)}")
+    descending = query.get("order", ["asc"])[0] == "desc"
+
+    students = student_operations.list_students_page(offset, limit, sort_by, descending)
+    return HTTPStatus.OK, _page(students, offset, limit, student_operations.count_students())
+
+def get_student(student_id):
+    """Handle GET /students/<id>."""
+    student = student_operations.get_student_by_id(student_id)
+    if student is None:
+        raise StudentNotFoundException(f"Student with ID {student_id} does not exist.")
+    return HTTPStatus.OK, student_to_dict(student)
+
+def search(query):
+    """Handle GET /search."""
+    keyword = query.get("q", [""])[0]
+    if not keyword:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "q is required")
+
+    if _get_flag(query, "fuzzy"):
+        limit = _get_int(query, "limit", student_operations.FUZZY_SEARCH_LIMIT, MAX_PAGE_SIZE)
+        matches = student_operations.fuzzy_search_students(keyword, limit)
+        return HTTPStatus.OK, {
+            "matches": [{"similarity": similarity, "student": student_to_dict(student)}
+                        for student, similarity in matches]
+        }
+
+    offset = _get_int(query, "offset", 0)
+    limit = _get_int(query, "limit", DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    students = student_operations.search_students(keyword)
+    return HTTPStatus.OK, _page(students[offset:offset + limit], offset, limit, len(students))
+
+def add_student(body):
+    """Handle POST /students."""
+    if not isinstance(body, dict):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Request body must be a student object")
+
+    student_id = str(body.get("id") or "").strip()
+    reserved = []
+    if not student_id:
+        student_id = generate_id_from_name(str(body.get("name") or ""), str(body.get("age") or ""),
+                                           reserve=True)
+        reserved.append(student_id)
+
+    try:
+        student = row_to_student(body, student_id)
+        student_operations.add_student(student)
+    finally:
+        release_ids(reserved)
+
+    return HTTPStatus.CREATED, student_to_dict(student)
+
+def bulk_add_students(body):
+    """Handle POST /students/bulk."""
+    if not isinstance(body, list):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Request body must be a list of students")
+
+    added, errors = import_rows(body)
+    return HTTPStatus.OK, {
+        "added": [student.get_student_id() for student in added],
+        "errors": [{"row": row_number, "error": message} for row_number, message in errors]
+    }
+
+def update_student(student_id, body):
+    """Handle PUT /students/<id>."""
+    if not isinstance(body, dict):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Request body must be a student object")
+
+    student = row_to_student(body, student_id)
+    student_operations.update_student(student)
+    return HTTPStatus.OK, student_to_dict(student)
+
+def delete_student(student_id):
+    """Handle DELETE /students/<id>."""
+    student_operations.delete_student(student_id)
+    return HTTPStatus.NO_CONTENT, None
+
+def route(method, target, body):
+    """
+    Run the handler for a request.
+
+    Args:
+        method (str): The HTTP method.
+        target (str): The request path and query string.
+        body (bytes): The request body.
+
+    Returns:
+        tuple: (status, payload), where payload is JSON-serializable or None.
+
+    Raises:
+        HTTPError: If no handler matches or the request is malformed.
+        StudentManagementException: If the operation fails.
+    """
+    url = urlsplit(target)
+    query = parse_qs(url.query)
+    parts = [unquote(part) for part in url.path.strip("/").split("/")]
+
+    def json_body():
+        try:
+            return json.loads(body or b"null")
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {str(e)}")
+
+    if parts == ["students"]:
+        if method == "GET":
+            return list_students(query)
+        if method == "POST":
+            return add_student(json_body())
+    elif parts == ["students", "bulk"] and method == "POST":
+        return bulk_add_students(json_body())
+    elif len(parts) == 2 and parts[0] == "students":
+        if method == "GET":
+            return get_student(parts[1])
+        if method == "PUT":
+            return update_student(parts[1], json_body())
+        if method == "DELETE":
+            return delete_student(parts[1])
+    elif parts == ["search"]:
+        if method == "GET":
+            return search(query)
+    else:
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"No such endpoint: {url.path}")
+
+    raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} is not supported on {url.path}")
+
+def handle(method, target, body):
+    """
+    Handle a request, turning errors into error responses.
+
+    Runs in a worker thread, including the JSON encoding of the response.
+
+    Returns:
+        tuple: (status, response body bytes).
+    """
+    try:
+        status, payload = route(method, target, body)
+    except HTTPError as e:
+        status, payload = e.status, {"error": str(e)}
+    except StudentNotFoundException as e:
+        status, payload = HTTPStatus.NOT_FOUND, {"error": str(e)}
+    except DuplicateStudentIDException as e:
+        status, payload = HTTPStatus.CONFLICT, {"error": str(e)}
+    except ValidationException as e:
+        status, payload = HTTPStatus.BAD_REQUEST, {"error": str(e)}
+    except StorageException as e:
+        status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+    except StudentManagementException as e:
+        status, payload = HTTPStatus.BAD_REQUEST, {"error": str(e)}
+    except Exception:
+        # A bug must still produce a response rather than a dropped connection
+        logger.exception("Error handling %s %s", method, target)
+        status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"}
+
+    if payload is None:
+        return status, b""
+    return status, json.dumps(payload).encode("utf-8")
+
+def _response(status, body, keep_alive):
+    """Build the bytes of an HTTP response."""
+    head = [f"HTTP/1.1 {status.value} {status.phrase}"]
+    if body:
+        head.append("Content-Type: application/json")
+    head.append(f"Content-Length: {len(body)}")
+    head.append("Connection: keep-alive" if keep_alive else "Connection: close")
+    return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+async def handle_connection(reader, writer, executor):
+    """
+    Serve the requests of one client connection until it closes.
+
+    Args:
+        reader (asyncio.StreamReader): The connection's reader.
+        writer (asyncio.StreamWriter): The connection's writer.
+        executor (ThreadPoolExecutor): Runs the operations.
+    """
+    loop = asyncio.get_running_loop()
+
+    try:
+        while True:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_SECONDS)
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                break
+            except asyncio.LimitOverrunError:
+                writer.write(_response(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, b"", False))
+                break
+
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ")
+            except ValueError:
+                writer.write(_response(HTTPStatus.BAD_REQUEST, b"", False))
+                break
+
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                if name:
+                    headers[name.strip().lower()] = value.strip()
+
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+            if "chunked" in headers.get("transfer-encoding", "").lower():
+                writer.write(_response(HTTPStatus.LENGTH_REQUIRED, b"", False))
+                break
+            try:
+                length = int(headers.get("content-length", "0"))
+            except ValueError:
+                length = -1
+            if length < 0 or length > MAX_BODY_BYTES:
+                writer.write(_response(HTTPStatus.REQUEST_ENTITY_TOO_LARGE if length > 0
+                                       else HTTPStatus.BAD_REQUEST, b"", False))
+                break
+
+            try:
+                body = await reader.readexactly(length) if length else b""
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+
+            status, response_body = await loop.run_in_executor(executor, handle, method, target, body)
+            writer.write(_response(status, response_body, keep_alive))
+            await writer.drain()
+
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def serve(host, port):
+    """
+    Run the server until it is cancelled.
+
+    Args:
+        host (str): Address to listen on.
+        port (int): Port to listen on.
+    """
+    executor = ThreadPoolExecutor(max_workers=WORKER_THREADS, thread_name_prefix="student-api")
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(reader, writer, executor),
+        host, port, limit=MAX_HEADER_BYTES
+    )
+
+    print(f"Serving the student API on http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        executor.shutdown(wait=True)
+
+def main(argv):
+    """Parse the command line, load the students and serve the API."""
+    parser = argparse.ArgumentParser(description="Serve the student operations as a JSON API.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    parser.add_argument("--storage", help="path of the storage file")
+    parser.add_argument("--flush-window", type=float, default=persistence.FLUSH_WINDOW_SECONDS,
+                        help="seconds to group changes into one save")
+    args = parser.parse_args(argv)
+
+    persistence.FLUSH_WINDOW_SECONDS = args.flush_window
+    student_operations.initialize(args.storage)
+
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        student_operations.flush()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,50 @@
+"""
+Atomic Files Module
+Writes files so that readers never see them half written.
+"""
+
+import os
+import shutil
+import tempfile
+
+def write_atomically(path, write, mode='w'):
+    """
+    Write a file so that it is either fully replaced or left untouched.
+
+    The data is written to a temporary file in the same directory, flushed
+    to disk and then renamed over the target, so a crash mid-write never
+    leaves a truncated file behind.
+
+    Args:
+        path (str): Path of the file to write.
+        write (callable): Called with the open temporary file to write the data.
+        mode (str): File mode, 'w' for text or 'wb' for binary data.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, mode) as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    # Make the rename itself durable where the platform allows it
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
@@ -0,0 +1,4 @@
+"""
+Benchmarks Package
+Scripts for measuring the performance of the Student Management System.
+"""
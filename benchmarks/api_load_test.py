@@ -0,0 +1,223 @@
+"""
+API Load Test
+Measures the throughput and latency of a running API server.
+
+Concurrent clients keep one connection open each and send a mix of
+lookups by ID and keyword searches for a fixed duration, then the request
+rate and latency percentiles are printed and can be written as JSON.
+
+Usage: python -m benchmarks.api_load_test [--host 127.0.0.1] [--port 8080]
+       [--clients 50] [--duration 10] [--search-rate 0.2] [--output results.json]
+"""
+
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import platform
+from datetime import datetime, timezone
+from benchmarks.operations_benchmark import percentile, search_keywords
+
+# Number of clients sending requests at the same time
+DEFAULT_CLIENTS = 50
+
+# Seconds the test runs for
+DEFAULT_DURATION = 10
+
+# Share of requests that are searches rather than lookups by ID
+DEFAULT_SEARCH_RATE = 0.2
+
+# Number of student IDs fetched to look up
+ID_SAMPLE_SIZE = 1000
+
+class Client:
+    """A keep-alive HTTP connection to the API server."""
+
+    def __init__(self, host, port):
+        """
+        Initialize a Client.
+
+        Args:
+            host (str): Address of the server.
+            port (int): Port of the server.
+        """
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, path):
+        """
+        Send a GET request and read the response.
+
+        Args:
+            path (str): The request path and query string.
+
+        Returns:
+            tuple: (status, body bytes).
+        """
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        self.writer.write(f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\n\r\n".encode("latin-1"))
+        await self.writer.drain()
+
+        head = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+        status = int(head.split(" ", 2)[1])
+        length = 0
+        for line in head.split("\r\n")[1:]:
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        body = await self.reader.readexactly(length) if length else b""
+        return status, body
+
+    def close(self):
+        """Close the connection."""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+async def fetch_ids(host, port):
+    """Get a sample of student IDs from the server."""
+    client = Client(host, port)
+    try:
+        status, body = await client.request(f"/students?limit={ID_SAMPLE_SIZE}")
+    finally:
+        client.close()
+    if status != 200:
+        raise RuntimeError(f"Listing students failed with status {status}")
+    return [student["id"] for student in json.loads(body)["students"]]
+
+async def run_client(host, port, ids, search_rate, deadline, rng, results):
+    """
+    Send requests until the deadline, recording each one.
+
+    Args:
+        host (str): Address of the server.
+        port (int): Port of the server.
+        ids (list): Student IDs to look up.
+        search_rate (float): Share of requests that are searches.
+        deadline (float): time.perf_counter() value at which to stop.
+        rng (random.Random): The random generator.
+        results (dict): Durations in seconds keyed by request kind, and the error count.
+    """
+    client = Client(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            if not ids or rng.random() < search_rate:
+                kind, path = "search", f"/search?q={search_keywords(rng, 1)[0][0]}&limit=50"
+            else:
+                kind, path = "get_student", f"/students/{rng.choice(ids)}"
+
+            start = time.perf_counter()
+            try:
+                status, _ = await client.request(path)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                client.close()
+                status = None
+            duration = time.perf_counter() - start
+
+            if status == 200:
+                results[kind].append(duration)
+            else:
+                results["errors"] += 1
+    finally:
+        client.close()
+
+async def run(host, port, clients, duration, search_rate, seed=0):
+    """
+    Run the load test.
+
+    Args:
+        host (str): Address of the server.
+        port (int): Port of the server.
+        clients (int): Number of concurrent clients.
+        duration (float): Seconds to run for.
+        search_rate (float): Share of requests that are searches.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        dict: The durations of successful requests keyed by kind, and the error count.
+    """
+    ids = await fetch_ids(host, port)
+    results = {"get_student": [], "search": [], "errors": 0}
+    deadline = time.perf_counter() + duration
+
+    await asyncio.gather(*(
+        run_client(host, port, ids, search_rate, deadline, random.Random(seed + index), results)
+        for index in range(clients)
+    ))
+    return results
+
+def summarize(kind, durations, elapsed):
+    """
+    Summarize the requests of one kind.
+
+    Args:
+        kind (str): The request kind.
+        durations (list): Duration of each request in seconds.
+        elapsed (float): Seconds the test ran for.
+
+    Returns:
+        dict: The result entry, with times in milliseconds.
+    """
+    durations = sorted(durations)
+    return {
+        "request": kind,
+        "requests": len(durations),
+        "requests_per_second": len(durations) / elapsed,
+        "mean_ms": sum(durations) / len(durations) * 1000,
+        "p50_ms": percentile(durations, 0.5) * 1000,
+        "p95_ms": percentile(durations, 0.95) * 1000,
+        "p99_ms": percentile(durations, 0.99) * 1000,
+        "max_ms": durations[-1] * 1000
+    }
+
+def main(argv):
+    """Run the load test, print a table and optionally write the results as JSON."""
+    parser = argparse.ArgumentParser(description="Measure the throughput and latency of the API server.")
+    parser.add_argument("--host", default="127.0.0.1", help="address of the server")
+    parser.add_argument("--port", type=int, default=8080, help="port of the server")
+    parser.add_argument("--clients", type=int, default=DEFAULT_CLIENTS, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="seconds to run for")
+    parser.add_argument("--search-rate", type=float, default=DEFAULT_SEARCH_RATE,
+                        help="share of requests that are searches")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = asyncio.run(run(args.host, args.port, args.clients, args.duration, args.search_rate))
+    elapsed = time.perf_counter() - start
+
+    summaries = [summarize(kind, results[kind], elapsed) for kind in ("get_student", "search") if results[kind]]
+    if len(summaries) > 1:
+        summaries.append(summarize("all", results["get_student"] + results["search"], elapsed))
+
+    print(f"{'request':<12}  {'requests':>9}  {'req/s':>9}  {'mean ms':>9}  {'p50 ms':>9}  "
+          f"{'p95 ms':>9}  {'p99 ms':>9}  {'max ms':>9}")
+    for result in summaries:
+        print(f"{result['request']:<12}  {result['requests']:>9}  {result['requests_per_second']:>9.1f}  "
+              f"{result['mean_ms']:>9.3f}  {result['p50_ms']:>9.3f}  {result['p95_ms']:>9.3f}  "
+              f"{result['p99_ms']:>9.3f}  {result['max_ms']:>9.3f}")
+    print(f"errors: {results['errors']}")
+
+    if args.output:
+        report = {
+            "benchmark": "api",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "clients": args.clients,
+            "duration_seconds": args.duration,
+            "search_rate": args.search_rate,
+            "errors": results["errors"],
+            "results": summaries
+        }
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=4)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
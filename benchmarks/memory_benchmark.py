@@ -0,0 +1,148 @@
+"""
+Memory Benchmark
+Measures the memory used per student by the model classes.
+
+Each student is decoded from its own JSON line, as when loading from storage,
+and built either with the current __slots__ models or with an equivalent
+__dict__-based class that mirrors the previous layout.
+
+Usage: python -m benchmarks.memory_benchmark [count ...]
+"""
+
+import sys
+import gc
+import json
+import random
+import tracemalloc
+from models.student import Student
+from models.undergraduate import Undergraduate
+from models.postgraduate import Postgraduate
+
+# Record counts measured when none are given on the command line
+DEFAULT_COUNTS = [100_000, 1_000_000]
+
+COURSES = ["Programming", "Data Structures", "Algorithms", "Software Design", "Web Development",
+           "Statistics", "Machine Learning", "Data Mining", "Big Data", "Neural Networks"]
+FIELDS = ["Software Engineering", "Data Science"]
+MINORS = ["Mathematics", "Business", "Electronics", "Psychology", "Physics"]
+DOMAINS = ["Artificial Intelligence", "Machine Learning", "Computer Vision", "Robotics"]
+
+class DictStudent:
+    """Student stored the previous way: private attributes in a __dict__ and a list of courses."""
+
+    def __init__(self, student_id, name, age, course, year):
+        self.__student_id = student_id
+        self.__name = name
+        self.__age = age
+        self.__courses = list(course)
+        self.__year = year
+        self.__field_of_study = None
+
+    def set_field_of_study(self, field):
+        self.__field_of_study = field
+
+class DictUndergraduate(DictStudent):
+    """Undergraduate stored the previous way."""
+
+    def __init__(self, student_id, name, age, course, year, minor):
+        super().__init__(student_id, name, age, course, year)
+        self.__minor = minor
+
+class DictPostgraduate(DictStudent):
+    """Postgraduate stored the previous way."""
+
+    def __init__(self, student_id, name, age, course, year, graduation_year, domain):
+        super().__init__(student_id, name, age, course, year)
+        self.__domain = domain
+
+LAYOUTS = {
+    "dict": (DictStudent, DictUndergraduate, DictPostgraduate),
+    "slots": (Student, Undergraduate, Postgraduate)
+}
+
+def generate_lines(count, seed=0):
+    """
+    Generate JSON lines describing random students.
+
+    Args:
+        count (int): Number of students to generate.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        list: One JSON string per student.
+    """
+    rng = random.Random(seed)
+    lines = []
+    for i in range(count):
+        lines.append(json.dumps({
+            "id": f"STU{i:07d}",
+            "name": f"Student {i}",
+            "age": rng.randint(18, 40),
+            "courses": rng.sample(COURSES, rng.randint(1, 4)),
+            "year": rng.randint(1, 7),
+            "field_of_study": rng.choice(FIELDS),
+            "type": rng.choice(["student", "undergraduate", "postgraduate"]),
+            "minor": rng.choice(MINORS),
+            "domain": rng.choice(DOMAINS)
+        }))
+    return lines
+
+def build_students(lines, layout):
+    """
+    Build student objects from JSON lines.
+
+    Args:
+        lines (list): JSON strings produced by generate_lines.
+        layout (str): "dict" or "slots".
+
+    Returns:
+        list: The student objects.
+    """
+    student_class, undergraduate_class, postgraduate_class = LAYOUTS[layout]
+    students = []
+    for line in lines:
+        data = json.loads(line)
+        if data["type"] == "undergraduate":
+            student = undergraduate_class(data["id"], data["name"], data["age"],
+                                          data["courses"], data["year"], data["minor"])
+        elif data["type"] == "postgraduate":
+            student = postgraduate_class(data["id"], data["name"], data["age"],
+                                         data["courses"], data["year"], 0, data["domain"])
+        else:
+            student = student_class(data["id"], data["name"], data["age"],
+                                    data["courses"], data["year"])
+        student.set_field_of_study(data["field_of_study"])
+        students.append(student)
+    return students
+
+def measure(lines, layout):
+    """
+    Measure the memory held by the students built from the given lines.
+
+    Args:
+        lines (list): JSON strings produced by generate_lines.
+        layout (str): "dict" or "slots".
+
+    Returns:
+        float: Bytes per student, including the list holding them.
+    """
+    gc.collect()
+    tracemalloc.start()
+    students = build_students(lines, layout)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del students
+    return current / len(lines)
+
+def main(counts):
+    """Run the benchmark for each record count and print the results."""
+    print(f"{'records':>10}  {'dict bytes/student':>20}  {'slots bytes/student':>20}  {'saving':>8}")
+    for count in counts:
+        lines = generate_lines(count)
+        before = measure(lines, "dict")
+        after = measure(lines, "slots")
+        print(f"{count:>10}  {before:>20.1f}  {after:>20.1f}  {1 - after / before:>8.1%}")
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_COUNTS)
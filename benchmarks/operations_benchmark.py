@@ -0,0 +1,183 @@
+"""
+Operations Benchmark
+Times the core student operations on synthetic rosters of growing size.
+
+For each roster size the roster is saved to and loaded from a temporary
+storage file, and then each operation is timed over a sample of calls.
+Results are printed as a table and can be written as JSON to compare
+scaling curves between releases.
+
+Usage: python -m benchmarks.operations_benchmark [--mode json|journal|sqlite|sharded]
+       [--samples N] [--output results.json] [count ...]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+from datetime import datetime, timezone
+import storage
+import persistence
+import student_operations
+from id_generator import generate_id_from_name
+from catalog import FIELDS_OF_STUDY
+from benchmarks.roster import generate_students, random_student, random_name, student_id, LAST_NAMES
+
+# Roster sizes measured when none are given on the command line
+DEFAULT_COUNTS = [1_000, 10_000, 100_000, 1_000_000]
+
+# Number of calls timed per operation and roster size
+DEFAULT_SAMPLES = 200
+
+# Storage mode used by default. Journal mode keeps the cost of a single
+# change independent of the roster size, unlike rewriting the JSON file.
+DEFAULT_MODE = "journal"
+
+def percentile(sorted_values, fraction):
+    """
+    Get a percentile of sorted values using the nearest rank.
+
+    Args:
+        sorted_values (list): Values in ascending order.
+        fraction (float): The percentile as a fraction, such as 0.95.
+
+    Returns:
+        float: The value at that percentile.
+    """
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+def summarize(operation, count, durations):
+    """
+    Summarize the timings of one operation.
+
+    Args:
+        operation (str): Name of the operation.
+        count (int): Number of students in the roster.
+        durations (list): Duration of each call in seconds.
+
+    Returns:
+        dict: The result entry, with times in milliseconds.
+    """
+    durations = sorted(durations)
+    return {
+        "operation": operation,
+        "records": count,
+        "samples": len(durations),
+        "mean_ms": sum(durations) / len(durations) * 1000,
+        "p50_ms": percentile(durations, 0.5) * 1000,
+        "p95_ms": percentile(durations, 0.95) * 1000,
+        "max_ms": durations[-1] * 1000
+    }
+
+def time_calls(function, arguments):
+    """
+    Time a function once per set of arguments.
+
+    Args:
+        function (callable): The function to time.
+        arguments (list): Argument tuples, one per call.
+
+    Returns:
+        list: Duration of each call in seconds.
+    """
+    durations = []
+    for args in arguments:
+        start = time.perf_counter()
+        function(*args)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+def search_keywords(rng, samples):
+    """Pick search keywords the way users type them: surnames, courses and fields."""
+    courses = [course for field in FIELDS_OF_STUDY.values() for course in field]
+    terms = LAST_NAMES + courses + list(FIELDS_OF_STUDY)
+    return [(rng.choice(terms)[:rng.randint(3, 8)],) for _ in range(samples)]
+
+def run(count, samples, mode, seed=0):
+    """
+    Benchmark every operation on a roster of the given size.
+
+    Args:
+        count (int): Number of students in the roster.
+        samples (int): Number of calls timed per operation.
+        mode (str): The storage mode to use.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        list: One result entry per operation, as returned by summarize().
+    """
+    rng = random.Random(seed)
+    roster = generate_students(count, seed)
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        storage.STORAGE_MODE = mode
+        storage.STORAGE_FILE = os.path.join(directory, "students.json")
+
+        results.append(summarize("save_students", count, time_calls(storage.save_students, [(roster,)])))
+        del roster
+        results.append(summarize("load_students", count, time_calls(storage.load_students, [()])))
+
+        student_operations.initialize()
+        existing = [student_id(index) for index in rng.sample(range(count), min(samples, count))]
+
+        new_students = [(random_student(rng, student_id(count + index)),) for index in range(samples)]
+        results.append(summarize("add_student", count, time_calls(student_operations.add_student, new_students)))
+
+        updates = [(random_student(rng, existing_id),) for existing_id in existing]
+        results.append(summarize("update_student", count, time_calls(student_operations.update_student, updates)))
+
+        lookups = [(rng.choice(existing),) for _ in range(samples)]
+        results.append(summarize("get_student_by_id", count,
+                                 time_calls(student_operations.get_student_by_id, lookups)))
+
+        results.append(summarize("search_students", count,
+                                 time_calls(student_operations.search_students, search_keywords(rng, samples))))
+
+        people = [(random_name(rng), rng.randint(17, 45)) for _ in range(samples)]
+        results.append(summarize("generate_id_from_name", count, time_calls(generate_id_from_name, people)))
+
+        results.append(summarize("delete_student", count,
+                                 time_calls(student_operations.delete_student, [(i,) for i in existing])))
+
+        persistence.flush()
+
+    return results
+
+def main(argv):
+    """Run the benchmark, print a table and optionally write the results as JSON."""
+    parser = argparse.ArgumentParser(description="Time student operations on synthetic rosters.")
+    parser.add_argument("counts", nargs="*", type=int, default=DEFAULT_COUNTS, help="roster sizes")
+    parser.add_argument("--mode", default=DEFAULT_MODE, choices=["json", "journal", "sqlite", "sharded"],
+                        help="storage mode")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="calls timed per operation")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    print(f"{'records':>10}  {'operation':<22}  {'mean ms':>10}  {'p50 ms':>10}  {'p95 ms':>10}  {'max ms':>10}")
+    results = []
+    for count in args.counts:
+        for result in run(count, args.samples, args.mode):
+            results.append(result)
+            print(f"{count:>10}  {result['operation']:<22}  {result['mean_ms']:>10.3f}  "
+                  f"{result['p50_ms']:>10.3f}  {result['p95_ms']:>10.3f}  {result['max_ms']:>10.3f}")
+
+    if args.output:
+        report = {
+            "benchmark": "operations",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "storage_mode": args.mode,
+            "samples": args.samples,
+            "results": results
+        }
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=4)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,102 @@
+"""
+Synthetic Roster
+Generates realistic rosters of students for benchmarks.
+
+Fields of study, courses, minors and research domains are drawn from the
+same catalog the application offers, so searches and sorts behave as they
+would on real data.
+"""
+
+import random
+from catalog import FIELDS_OF_STUDY, MINORS, DOMAINS
+from models.student import Student
+from models.undergraduate import Undergraduate
+from models.postgraduate import Postgraduate
+
+# Share of each student type in a roster
+TYPE_WEIGHTS = {"undergraduate": 0.6, "postgraduate": 0.25, "student": 0.15}
+
+# Relative popularity of each field of study, in catalog order
+FIELD_WEIGHTS = [14, 12, 8, 8, 16, 10, 12, 10, 10]
+
+# Chance that a student also takes a course outside their field
+ELECTIVE_RATE = 0.1
+
+FIRST_NAMES = ["James", "Mary", "Ahmed", "Fatima", "Wei", "Mei", "Carlos", "Sofia", "Olusegun", "Amara",
+               "Ivan", "Anna", "Hiroshi", "Yuki", "Rahul", "Priya", "Liam", "Emma", "Omar", "Layla",
+               "Daniel", "Sarah", "Ali", "Aisha", "Lucas", "Chloe", "Noah", "Zara", "Mateo", "Hana"]
+LAST_NAMES = ["Smith", "Khan", "Chen", "Garcia", "Okafor", "Petrov", "Tanaka", "Patel", "Murphy", "Hassan",
+              "Johnson", "Ali", "Wang", "Lopez", "Adeyemi", "Ivanova", "Sato", "Sharma", "Brown", "Haddad",
+              "Miller", "Sarwar", "Li", "Martinez", "Mensah", "Novak", "Kim", "Singh", "Wilson", "Rahman"]
+
+def student_id(index):
+    """
+    Get the ID of the student at a position in a synthetic roster.
+
+    Args:
+        index (int): Position of the student.
+
+    Returns:
+        str: A valid student ID.
+    """
+    return f"STU{index:07d}"
+
+def random_name(rng):
+    """
+    Pick a random full name.
+
+    Args:
+        rng (random.Random): The random generator.
+
+    Returns:
+        str: A first and last name.
+    """
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+def random_student(rng, student_id):
+    """
+    Build a random student with the given ID.
+
+    Args:
+        rng (random.Random): The random generator.
+        student_id (str): The ID to give the student.
+
+    Returns:
+        Student, Undergraduate, or Postgraduate object.
+    """
+    student_type = rng.choices(list(TYPE_WEIGHTS), weights=list(TYPE_WEIGHTS.values()))[0]
+    field_of_study = rng.choices(list(FIELDS_OF_STUDY), weights=FIELD_WEIGHTS)[0]
+
+    courses = rng.sample(FIELDS_OF_STUDY[field_of_study], rng.randint(1, 4))
+    if rng.random() < ELECTIVE_RATE:
+        elective = rng.choice(FIELDS_OF_STUDY[rng.choice(list(FIELDS_OF_STUDY))])
+        if elective not in courses:
+            courses.append(elective)
+
+    name = random_name(rng)
+
+    if student_type == "undergraduate":
+        student = Undergraduate(student_id, name, rng.randint(17, 25), courses, rng.randint(1, 4),
+                                rng.choice(MINORS))
+    elif student_type == "postgraduate":
+        student = Postgraduate(student_id, name, rng.randint(21, 45), courses, rng.randint(1, 3), 0,
+                               rng.choice(DOMAINS))
+    else:
+        student = Student(student_id, name, rng.randint(16, 40), courses, rng.randint(1, 7))
+
+    student.set_field_of_study(field_of_study)
+    return student
+
+def generate_students(count, seed=0):
+    """
+    Generate a synthetic roster.
+
+    Args:
+        count (int): Number of students to generate.
+        seed (int): Seed for the random generator, so runs are repeatable.
+
+    Returns:
+        list: Student, Undergraduate, and Postgraduate objects with IDs from student_id().
+    """
+    rng = random.Random(seed)
+    return [random_student(rng, student_id(index)) for index in range(count)]
@@ -0,0 +1,239 @@
+"""
+Binary Storage Module
+Reads and writes compact binary snapshots of the student records.
+
+A snapshot starts with a header holding a magic number, the schema version
+and the record count. It is followed by a table of every distinct string,
+and then one fixed-width column per field, in which strings are stored as
+indexes into the table. All numbers are little-endian.
+"""
+
+import gc
+import sys
+import json
+import struct
+from array import array
+from itertools import accumulate, islice, repeat
+from operator import getitem
+from serialization import StudentRecord, student_to_dict, dict_to_record, record_to_dict
+
+MAGIC = b"SMSB"
+SCHEMA_VERSION = 1
+
+# Magic number, schema version, record count and string count
+HEADER = struct.Struct("<4sHII")
+
+# Byte length of the encoded string table
+LENGTH = struct.Struct("<I")
+
+# Typecodes of the 32-bit array columns
+UINT32 = "I" if array("I").itemsize == 4 else "L"
+INT32 = "i" if array("i").itemsize == 4 else "l"
+
+# String index stored for missing values such as an empty field of study
+NONE_INDEX = 0
+
+def _to_record(student):
+    """Get the compact record of a student object or record."""
+    if isinstance(student, StudentRecord):
+        return student
+    return dict_to_record(student_to_dict(student))
+
+def _write_array(file, values):
+    """Write an array in little-endian byte order."""
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    file.write(values.tobytes())
+
+def _read_array(data, offset, typecode, count):
+    """Read an array of count little-endian values, returning it and the next offset."""
+    values = array(typecode)
+    end = offset + values.itemsize * count
+    if end > len(data):
+        raise ValueError("Unexpected end of binary snapshot")
+    values.frombytes(data[offset:end])
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values, end
+
+def dump(students, file):
+    """
+    Write students to a binary file as a snapshot.
+
+    Args:
+        students (list): Student, Undergraduate and Postgraduate objects,
+            or StudentRecord tuples.
+        file: A file open for writing bytes.
+    """
+    strings = {}
+    table = []
+
+    def encode(value):
+        if value is None:
+            return NONE_INDEX
+        index = strings.get(value)
+        if index is None:
+            table.append(value)
+            index = strings[value] = len(table)
+        return index
+
+    ids = array(UINT32)
+    names = array(UINT32)
+    ages = array(INT32)
+    years = array(INT32)
+    fields_of_study = array(UINT32)
+    types = array(UINT32)
+    minors = array(UINT32)
+    domains = array(UINT32)
+    course_counts = array(UINT32)
+    courses = array(UINT32)
+
+    for student in students:
+        record = _to_record(student)
+        ids.append(encode(record.id))
+        names.append(encode(record.name))
+        ages.append(record.age)
+        years.append(record.year)
+        fields_of_study.append(encode(record.field_of_study))
+        types.append(encode(record.type))
+        minors.append(encode(record.minor))
+        domains.append(encode(record.domain))
+        course_counts.append(len(record.courses))
+        courses.extend(encode(course) for course in record.courses)
+
+    # Lengths are counted in characters so the table can be decoded in one go
+    text = "".join(table).encode("utf-8")
+    file.write(HEADER.pack(MAGIC, SCHEMA_VERSION, len(ids), len(table)))
+    _write_array(file, array(UINT32, [len(value) for value in table]))
+    file.write(LENGTH.pack(len(text)))
+    file.write(text)
+
+    for column in (ids, names, ages, years, fields_of_study, types, minors, domains, course_counts):
+        _write_array(file, column)
+    file.write(LENGTH.pack(len(courses)))
+    _write_array(file, courses)
+
+def load(file):
+    """
+    Read students from a binary snapshot as compact records.
+
+    Args:
+        file: A file open for reading bytes.
+
+    Returns:
+        list: StudentRecord tuples in insertion order.
+
+    Raises:
+        ValueError: If the file is not a valid snapshot or has a newer schema version.
+    """
+    data = memoryview(file.read())
+
+    if len(data) < HEADER.size:
+        raise ValueError("Unexpected end of binary snapshot")
+    magic, version, count, string_count = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a binary student snapshot")
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"Unsupported binary snapshot version: {version}")
+    offset = HEADER.size
+
+    lengths, offset = _read_array(data, offset, UINT32, string_count)
+    (text_length,) = LENGTH.unpack_from(data, offset)
+    offset += LENGTH.size
+    text = str(data[offset:offset + text_length], "utf-8")
+    offset += text_length
+
+    ends = list(accumulate(lengths))
+    table = [None]
+    table.extend(map(getitem, repeat(text), map(slice, [0] + ends[:-1], ends)))
+
+    columns = []
+    for typecode in (UINT32, UINT32, INT32, INT32, UINT32, UINT32, UINT32, UINT32, UINT32):
+        column, offset = _read_array(data, offset, typecode, count)
+        columns.append(column)
+    ids, names, ages, years, fields_of_study, types, minors, domains, course_counts = columns
+
+    (course_total,) = LENGTH.unpack_from(data, offset)
+    offset += LENGTH.size
+    course_indexes, offset = _read_array(data, offset, UINT32, course_total)
+    # Creating millions of tuples would otherwise trigger repeated garbage
+    # collections that find nothing to free
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        lookup = table.__getitem__
+        courses = map(lookup, course_indexes)
+        course_tuples = [tuple(islice(courses, course_count)) for course_count in course_counts]
+
+        # Build the records column by column without a Python-level loop per field
+        return list(map(StudentRecord._make, zip(
+            map(lookup, ids), map(lookup, names), ages, course_tuples, years,
+            map(lookup, fields_of_study), map(lookup, types), map(lookup, minors), map(lookup, domains)
+        )))
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+def load_records(path):
+    """
+    Load all student records from a binary snapshot file.
+
+    Args:
+        path (str): Path of the snapshot file.
+
+    Returns:
+        list: StudentRecord tuples in insertion order.
+
+    Raises:
+        ValueError: If the file is not a valid snapshot.
+    """
+    with open(path, 'rb') as file:
+        return load(file)
+
+def json_to_binary(json_path, path):
+    """
+    Convert a JSON storage file to a binary snapshot.
+
+    Args:
+        json_path (str): Path of the JSON storage file.
+        path (str): Path of the snapshot file to write.
+
+    Returns:
+        int: The number of students converted.
+    """
+    with open(json_path, 'r') as file:
+        records = [dict_to_record(data) for data in json.load(file)]
+
+    with open(path, 'wb') as file:
+        dump(records, file)
+    return len(records)
+
+def binary_to_json(path, json_path):
+    """
+    Convert a binary snapshot to a JSON storage file.
+
+    Args:
+        path (str): Path of the snapshot file.
+        json_path (str): Path of the JSON storage file to write.
+
+    Returns:
+        int: The number of students converted.
+    """
+    records = load_records(path)
+
+    with open(json_path, 'w') as file:
+        json.dump([record_to_dict(record) for record in records], file, indent=4)
+    return len(records)
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1].endswith(".json"):
+        count = json_to_binary(sys.argv[1], sys.argv[2])
+    elif len(sys.argv) == 3 and sys.argv[2].endswith(".json"):
+        count = binary_to_json(sys.argv[1], sys.argv[2])
+    else:
+        print("Usage: python binary_storage.py <students.json> <students.bin>")
+        print("       python binary_storage.py <students.bin> <students.json>")
+        sys.exit(1)
+
+    print(f"Converted {count} students to {sys.argv[2]}")
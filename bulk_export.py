@@ -0,0 +1,321 @@
+"""
+Bulk Export Module
+Streams students to CSV, JSON Lines or Parquet files a chunk at a time.
+
+Students are read from the database in chunks of CHUNK_SIZE and each chunk
+is written before the next one is read, so exporting uses the same memory
+whatever the number of students. Exported CSV files can be imported again
+with bulk_import.py.
+
+Usage: python bulk_export.py [--columns id,name,...] [--filter column=value ...]
+       [--chunk-size 10000] <students.csv|students.jsonl|students.parquet>
+"""
+
+import io
+import os
+import sys
+import csv
+import json
+import argparse
+import database
+from exceptions import StudentManagementException, ValidationException
+from serialization import student_to_dict
+from student_operations import iter_student_chunks, iter_student_frame_chunks
+from atomic_files import write_atomically
+from bulk_import import COLUMNS
+
+FORMATS = ["csv", "jsonl", "parquet"]
+
+# Number of students read from the database and written at a time
+CHUNK_SIZE = 10000
+
+# Columns holding whole numbers, whose filter values are converted to int
+INTEGER_COLUMNS = {"age", "year"}
+
+def check_columns(columns):
+    """
+    Check that every column can be exported.
+
+    Args:
+        columns (list): Column names.
+
+    Raises:
+        ValidationException: If a column is not in COLUMNS.
+    """
+    unknown = [column for column in columns if column not in COLUMNS]
+    if unknown:
+        raise ValidationException(f"Unknown export columns: {', '.join(unknown)}")
+
+def parse_filters(expressions):
+    """
+    Parse "column=value" filter expressions.
+
+    Filters on the same column accept any of their values.
+
+    Args:
+        expressions (list): Filter expressions such as "type=undergraduate".
+
+    Returns:
+        dict: The set of accepted values keyed by column.
+
+    Raises:
+        ValidationException: If an expression is malformed or names an unknown column.
+    """
+    filters = {}
+    for expression in expressions:
+        column, separator, value = expression.partition("=")
+        column = column.strip()
+        if not separator or not column:
+            raise ValidationException(f"Filters must look like column=value: {expression}")
+        check_columns([column])
+
+        value = value.strip()
+        if column in INTEGER_COLUMNS:
+            try:
+                value = int(value)
+            except ValueError:
+                raise ValidationException(f"Filter value for {column} must be an integer")
+        filters.setdefault(column, set()).add(value)
+    return filters
+
+def _matches(data, filters):
+    """Check a student's data against filters, where a course filter matches any enrolled course."""
+    for column, values in filters.items():
+        if column == "courses":
+            if values.isdisjoint(data["courses"]):
+                return False
+        elif data.get(column) not in values:
+            return False
+    return True
+
+def iter_rows(columns=None, filters=None, chunk_size=CHUNK_SIZE):
+    """
+    Read the students to export in insertion order, a chunk at a time.
+
+    Students that were not accessed yet are converted straight from their
+    compact records, without building student objects. When
+    database.COLUMNAR_MIRROR is set, the selected columns of each chunk
+    are instead copied from the columnar mirror and filtered as whole columns.
+
+    Args:
+        columns (list, optional): Columns to include, all of COLUMNS by default.
+        filters (dict, optional): Accepted values keyed by column, as returned
+            by parse_filters. A student is exported if it matches every column.
+        chunk_size (int): Maximum number of students read at a time.
+
+    Yields:
+        list: Row dictionaries with the selected columns. Courses are a list
+            and missing values are None.
+
+    Raises:
+        ValidationException: If a column or filter is unknown, or the chunk size is not positive.
+    """
+    columns = list(columns or COLUMNS)
+    check_columns(columns)
+    check_columns(filters or [])
+    if chunk_size < 1:
+        raise ValidationException("The chunk size must be at least 1")
+
+    if database.COLUMNAR_MIRROR:
+        yield from _iter_mirror_rows(columns, filters, chunk_size)
+        return
+
+    for chunk in iter_student_chunks(chunk_size):
+        rows = []
+        for entry in chunk:
+            data = student_to_dict(entry)
+            if not filters or _matches(data, filters):
+                rows.append({column: data.get(column) for column in columns})
+        if rows:
+            yield rows
+
+def _iter_mirror_rows(columns, filters, chunk_size):
+    """Read the students to export from the columnar mirror, as iter_rows does."""
+    for frame in iter_student_frame_chunks(chunk_size, list(dict.fromkeys(columns + list(filters or [])))):
+        if filters:
+            keep = None
+            for column, values in filters.items():
+                if column == "courses":
+                    matches = frame["courses"].map(lambda courses: not values.isdisjoint(courses))
+                else:
+                    matches = frame[column].isin(list(values))
+                keep = matches if keep is None else keep & matches
+            frame = frame[keep.to_numpy()]
+        if not len(frame):
+            continue
+
+        values = []
+        for column in columns:
+            series = frame[column]
+            if column == "courses":
+                values.append([list(courses) for courses in series])
+            elif column in INTEGER_COLUMNS:
+                values.append(series.tolist())
+            else:
+                # Missing categorical values are NaN in the frame and None in rows
+                values.append(series.astype(object).where(series.notna(), None).tolist())
+        yield [dict(zip(columns, row)) for row in zip(*values)]
+
+def write_csv(chunks, file, columns):
+    """
+    Write row chunks as CSV with a header row.
+
+    Courses are joined with commas, as read by bulk_import.py.
+
+    Args:
+        chunks (iterable): Lists of row dictionaries.
+        file: An open text file.
+        columns (list): The columns of the rows.
+
+    Returns:
+        int: The number of rows written.
+    """
+    writer = csv.DictWriter(file, fieldnames=columns)
+    writer.writeheader()
+
+    count = 0
+    for rows in chunks:
+        if "courses" in columns:
+            for row in rows:
+                row["courses"] = ", ".join(row["courses"])
+        writer.writerows(rows)
+        count += len(rows)
+    return count
+
+def write_jsonl(chunks, file):
+    """
+    Write row chunks as JSON Lines, one object per student.
+
+    Args:
+        chunks (iterable): Lists of row dictionaries.
+        file: An open text file.
+
+    Returns:
+        int: The number of rows written.
+    """
+    count = 0
+    for rows in chunks:
+        file.write("".join(json.dumps(row) + "\n" for row in rows))
+        count += len(rows)
+    return count
+
+def write_parquet(chunks, file, columns):
+    """
+    Write row chunks as a Parquet file, one row group per chunk.
+
+    Args:
+        chunks (iterable): Lists of row dictionaries.
+        file: An open binary file.
+        columns (list): The columns of the rows.
+
+    Returns:
+        int: The number of rows written.
+
+    Raises:
+        ValidationException: If pyarrow is not installed.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValidationException("Parquet export requires the pyarrow package")
+
+    types = {column: pa.int64() if column in INTEGER_COLUMNS else pa.string() for column in columns}
+    if "courses" in types:
+        types["courses"] = pa.list_(pa.string())
+    schema = pa.schema(list(types.items()))
+
+    count = 0
+    with pq.ParquetWriter(file, schema) as writer:
+        for rows in chunks:
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            count += len(rows)
+    return count
+
+def export_students(file, file_format, columns=None, filters=None, chunk_size=CHUNK_SIZE):
+    """
+    Export students to an open file.
+
+    Args:
+        file: An open binary file.
+        file_format (str): "csv", "jsonl" or "parquet".
+        columns (list, optional): Columns to include, all of COLUMNS by default.
+        filters (dict, optional): Accepted values keyed by column, as returned by parse_filters.
+        chunk_size (int): Maximum number of students read and written at a time.
+
+    Returns:
+        int: The number of students exported.
+
+    Raises:
+        ValidationException: If the format, a column or a filter is unsupported.
+    """
+    if file_format not in FORMATS:
+        raise ValidationException(f"Unsupported export format: {file_format}")
+
+    columns = list(columns or COLUMNS)
+    chunks = iter_rows(columns, filters, chunk_size)
+
+    if file_format == "parquet":
+        return write_parquet(chunks, file, columns)
+
+    text = io.TextIOWrapper(file, encoding="utf-8", newline="")
+    try:
+        if file_format == "csv":
+            return write_csv(chunks, text, columns)
+        return write_jsonl(chunks, text)
+    finally:
+        # Leave the binary file open for the caller
+        text.flush()
+        text.detach()
+
+def export_file(path, columns=None, filters=None, chunk_size=CHUNK_SIZE):
+    """
+    Export students to a CSV, JSON Lines or Parquet file, based on its extension.
+
+    The file is replaced atomically, so it is never left half written.
+
+    Args:
+        path (str): Path of the file to write.
+        columns (list, optional): Columns to include, all of COLUMNS by default.
+        filters (dict, optional): Accepted values keyed by column, as returned by parse_filters.
+        chunk_size (int): Maximum number of students read and written at a time.
+
+    Returns:
+        int: The number of students exported.
+
+    Raises:
+        ValidationException: If the format, a column or a filter is unsupported.
+        StorageException: If the students cannot be loaded.
+    """
+    file_format = os.path.splitext(path)[1].lower().lstrip(".")
+    if file_format not in FORMATS:
+        raise ValidationException(f"Unsupported export format: {file_format}")
+
+    counts = []
+    write_atomically(path, lambda file: counts.append(
+        export_students(file, file_format, columns, filters, chunk_size)), mode='wb')
+    return counts[0]
+
+def main(argv):
+    """Export the students to the file given on the command line."""
+    parser = argparse.ArgumentParser(description="Export students to CSV, JSON Lines or Parquet.")
+    parser.add_argument("path", help="file to write, whose extension (.csv, .jsonl or .parquet) sets the format")
+    parser.add_argument("--columns", help=f"comma-separated columns to include, from {','.join(COLUMNS)}")
+    parser.add_argument("--filter", action="append", default=[], metavar="COLUMN=VALUE",
+                        help="only export students with this value; repeat to accept several values "
+                             "or filter on several columns")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="students written at a time")
+    args = parser.parse_args(argv)
+
+    columns = [column.strip() for column in args.columns.split(",")] if args.columns else None
+
+    try:
+        count = export_file(args.path, columns, parse_filters(args.filter), args.chunk_size)
+    except StudentManagementException as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+
+    print(f"Exported {count} students to {args.path}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,261 @@
+"""
+Bulk Import Module
+Reads students from CSV or JSON files and adds them to the system in one batch.
+"""
+
+import os
+import sys
+import csv
+import json
+from exceptions import StudentManagementException, ValidationException
+from validation import validate_name, validate_age, validate_year, validate_minor, validate_domain
+from id_generator import generate_id_from_name, reserve_ids, release_ids
+from models.student import Student
+from models.undergraduate import Undergraduate
+from models.postgraduate import Postgraduate
+from student_operations import validate_students, bulk_add_students
+
+# Columns recognised in import files. The ID is generated when missing, and
+# type defaults to a regular student.
+COLUMNS = ["id", "name", "age", "courses", "year", "field_of_study", "type", "minor", "domain"]
+
+def read_rows(file, file_format):
+    """
+    Read student rows from an open text file.
+
+    CSV files need a header row with column names from COLUMNS. JSON files
+    must contain a list of objects, such as the students.json storage file.
+
+    Args:
+        file: An open text file.
+        file_format (str): "csv" or "json".
+
+    Returns:
+        list: One dictionary per row.
+
+    Raises:
+        ValidationException: If the file format is unsupported or the file is malformed.
+    """
+    try:
+        if file_format == "csv":
+            return list(csv.DictReader(file))
+        if file_format == "json":
+            rows = json.load(file)
+            if not isinstance(rows, list):
+                raise ValidationException("JSON import file must contain a list of students")
+            return rows
+    except (csv.Error, ValueError) as e:
+        raise ValidationException(f"Could not read import file: {str(e)}")
+
+    raise ValidationException(f"Unsupported import format: {file_format}")
+
+def _get_text(row, column):
+    """Get a text column from a row, treating missing values as empty."""
+    value = row.get(column)
+    return "" if value is None else str(value).strip()
+
+def _get_int(row, column, label):
+    """Get an integer column from a row."""
+    value = row.get(column)
+    if isinstance(value, int):
+        return value
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        raise ValidationException(f"{label} must be an integer")
+
+def _get_courses(row):
+    """Get the courses of a row, from a list or a comma-separated string."""
+    courses = row.get("courses", row.get("course"))
+    if not isinstance(courses, list):
+        text = _get_text(row, "courses") or _get_text(row, "course")
+        courses = text.split(",") if text else []
+    if not courses:
+        raise ValidationException("Courses are required")
+
+    names = []
+    for course in courses:
+        if not isinstance(course, str) or not course.strip():
+            raise ValidationException("Each course must be a non-empty name")
+        names.append(course.strip())
+    return names
+
+def row_to_student(row, student_id):
+    """
+    Build a student object from an import row.
+
+    Args:
+        row (dict): The row data.
+        student_id (str): The ID to give the student.
+
+    Returns:
+        Student, Undergraduate, or Postgraduate object.
+
+    Raises:
+        StudentManagementException: If the row data is invalid.
+    """
+    name = _get_text(row, "name")
+    validate_name(name)
+    age = _get_int(row, "age", "Age")
+    validate_age(age)
+    year = _get_int(row, "year", "Year")
+    validate_year(year)
+
+    courses = _get_courses(row)
+
+    student_type = _get_text(row, "type").lower() or "student"
+
+    if student_type == "undergraduate":
+        minor = _get_text(row, "minor")
+        validate_minor(minor)
+        student = Undergraduate(student_id, name, age, courses, year, minor)
+    elif student_type == "postgraduate":
+        domain = _get_text(row, "domain")
+        validate_domain(domain)
+        try:
+            student = Postgraduate(student_id, name, age, courses, year, 0, domain)
+        except ValueError as e:
+            raise ValidationException(str(e))
+    elif student_type == "student":
+        student = Student(student_id, name, age, courses, year)
+    else:
+        raise ValidationException(f"Unknown student type: {student_type}")
+
+    field_of_study = _get_text(row, "field_of_study")
+    if field_of_study:
+        student.set_field_of_study(field_of_study)
+
+    return student
+
+def rows_to_students(rows):
+    """
+    Build student objects from import rows, generating missing IDs.
+
+    The IDs given in the rows and the generated IDs are reserved so no two
+    students in the batch get the same generated ID. The caller must pass
+    the returned reserved IDs to release_ids once the batch is done.
+
+    Args:
+        rows (list): Row dictionaries from read_rows.
+
+    Returns:
+        tuple: (students, row_numbers, errors, reserved), where row_numbers
+            holds the 1-based row number of each student, errors is a list of
+            (row_number, message) tuples for rows that could not be read,
+            and reserved is the set of reserved IDs.
+    """
+    students = []
+    row_numbers = []
+    errors = []
+
+    reserved = {_get_text(row, "id") for row in rows if isinstance(row, dict)}
+    reserved.discard("")
+    reserve_ids(reserved)
+
+    for row_number, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            errors.append((row_number, "Row must be an object with student fields"))
+            continue
+
+        try:
+            student_id = _get_text(row, "id")
+            if not student_id:
+                student_id = generate_id_from_name(_get_text(row, "name"), _get_text(row, "age"),
+                                                   reserve=True)
+                reserved.add(student_id)
+
+            students.append(row_to_student(row, student_id))
+            row_numbers.append(row_number)
+        except StudentManagementException as e:
+            errors.append((row_number, str(e)))
+
+    return students, row_numbers, errors, reserved
+
+def import_rows(rows, dry_run=False):
+    """
+    Import students from row dictionaries, saving them all at once.
+
+    Every row is validated, including duplicate IDs within the batch and
+    against existing students. Valid rows are added, invalid rows are reported.
+
+    Args:
+        rows (list): Row dictionaries with the fields in COLUMNS.
+        dry_run (bool): Only validate the rows without adding any students.
+
+    Returns:
+        tuple: (added, errors), where added is the list of students added (or
+            that would be added on a dry run) and errors is a list of
+            (row_number, message) tuples sorted by row number.
+    """
+    students, row_numbers, errors, reserved = rows_to_students(rows)
+
+    try:
+        if dry_run:
+            batch_errors = validate_students(students)
+            rejected = {index for index, _ in batch_errors}
+            added = [student for index, student in enumerate(students) if index not in rejected]
+        else:
+            added, batch_errors = bulk_add_students(students)
+    finally:
+        release_ids(reserved)
+
+    errors.extend((row_numbers[index], message) for index, message in batch_errors)
+    errors.sort()
+    return added, errors
+
+def import_students(file, file_format, dry_run=False):
+    """
+    Import students from an open file, saving them all at once.
+
+    Args:
+        file: An open text file.
+        file_format (str): "csv" or "json".
+        dry_run (bool): Only validate the rows without adding any students.
+
+    Returns:
+        tuple: (added, errors) as returned by import_rows.
+
+    Raises:
+        ValidationException: If the file cannot be read.
+    """
+    return import_rows(read_rows(file, file_format), dry_run)
+
+def import_file(path, dry_run=False):
+    """
+    Import students from a CSV or JSON file, based on its extension.
+
+    Args:
+        path (str): Path of the file to import.
+        dry_run (bool): Only validate the rows without adding any students.
+
+    Returns:
+        tuple: (added, errors) as returned by import_students.
+
+    Raises:
+        ValidationException: If the file cannot be read.
+    """
+    file_format = os.path.splitext(path)[1].lower().lstrip(".")
+
+    with open(path, 'r', newline='', encoding='utf-8-sig') as file:
+        return import_students(file, file_format, dry_run)
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    dry_run = "--dry-run" in args
+    paths = [arg for arg in args if arg != "--dry-run"]
+
+    if len(paths) != 1:
+        print("Usage: python bulk_import.py [--dry-run] <students.csv|students.json>")
+        sys.exit(1)
+
+    try:
+        added, errors = import_file(paths[0], dry_run)
+    except StudentManagementException as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+
+    for row_number, message in errors:
+        print(f"Row {row_number}: {message}")
+
+    action = "Would add" if dry_run else "Added"
+    print(f"{action} {len(added)} students, {len(errors)} rows rejected")
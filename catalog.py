@@ -0,0 +1,37 @@
+"""
+Catalog Module
+Lists the fields of study, courses, minors and research domains offered.
+"""
+
+# Courses offered by each field of study
+FIELDS_OF_STUDY = {
+    "Software Engineering": ["Programming", "Data Structures", "Algorithms", "Software Design", "Web Development"],
+    "Data Science": ["Statistics", "Machine Learning", "Data Mining", "Big Data", "Neural Networks"],
+    "Civil Engineering": ["Mechanics", "Structures", "Materials", "Hydraulics", "Surveying"],
+    "Mechanical Engineering": ["Thermodynamics", "Fluid Dynamics", "Machine Design", "Control Systems", "Manufacturing"],
+    "Business": ["Accounting", "Marketing", "Finance", "Management", "Economics", "Business Ethics"],
+    "Arts": ["Fine Arts", "Music", "Theater", "Literature", "Philosophy", "History"],
+    "Sciences": ["Physics", "Chemistry", "Biology", "Mathematics", "Astronomy", "Geology"],
+    "Medicine": ["Anatomy", "Physiology", "Pathology", "Pharmacology", "Microbiology", "Immunology"],
+    "Law": ["Constitutional Law", "Criminal Law", "Civil Law", "International Law", "Corporate Law", "Human Rights Law"]
+}
+
+# Minor subjects available to undergraduates
+MINORS = [
+    "Mathematics", "Business", "Electronics", "Psychology", "Communication",
+    "Business Management", "Computer Science", "Renewable Energy", "Physics",
+    "Foreign Language", "Law", "Data Analytics", "Digital Media", "Education",
+    "Environmental Studies", "Public Health", "Ethics", "Nutrition", "Management",
+    "International Relations", "Political Science", "Economics", "Philosophy"
+]
+
+# Research domains available to postgraduates
+DOMAINS = [
+    "Artificial Intelligence", "Machine Learning", "Computer Vision", 
+    "Natural Language Processing", "Cybersecurity", "Networks", 
+    "Human-Computer Interaction", "Robotics", "Materials Science", 
+    "Structural Engineering", "Energy Systems", "Control Systems", 
+    "Biomedical Engineering", "Nanotechnology", "Finance", 
+    "Marketing Analytics", "Operations Management", "Leadership", 
+    "Business Analytics", "Entrepreneurship", "Supply Chain Management"
+]
@@ -0,0 +1,342 @@
+"""
+Columnar Module
+Maintains a column-oriented copy of the students in NumPy arrays.
+
+Each field is stored as one array with a row per student, in insertion
+order. Field of study, type, minor and domain are stored as integer codes
+into a list of their distinct values, so they can be read as pandas
+categoricals. Changes are applied in place: an update rewrites the
+student's row, a new student is appended, and a deleted student's row is
+marked as deleted and only dropped once deleted rows make up
+COMPACTION_THRESHOLD of the arrays.
+
+The mirror is only built when it is first used, and NumPy is only imported
+then, so importing the database stays fast when the mirror is not used.
+"""
+
+from serialization import StudentRecord, student_to_dict
+
+# Columns in the order they appear in frames, named as in the storage format
+COLUMNS = ("id", "name", "age", "courses", "year", "field_of_study", "type", "minor", "domain")
+
+# Columns stored as codes into a list of their distinct values
+CATEGORICAL_COLUMNS = ("field_of_study", "type", "minor", "domain")
+
+# Columns stored as 64-bit integers; the others hold Python objects
+INTEGER_COLUMNS = ("age", "year")
+
+# Share of deleted rows at which the arrays are compacted
+COMPACTION_THRESHOLD = 0.25
+
+# Number of rows allocated for an empty mirror
+INITIAL_CAPACITY = 1024
+
+# Arrays keyed by column, with spare rows at the end for new students
+_columns = {}
+
+# Distinct values of each categorical column in order of first use, and
+# their codes. A missing value has code -1.
+_categories = {}
+_codes = {}
+
+# Row of each student keyed by ID
+_rows = {}
+
+# Whether each row holds a student rather than a deleted one, or None
+# while no arrays are allocated
+_live = None
+
+# Number of rows in use, including deleted ones, and how many were deleted
+_size = 0
+_deleted = 0
+
+# Whether the mirror reflects the database; set by rebuild() and cleared by
+# invalidate(). Changes are ignored until the first rebuild.
+_built = False
+
+def _allocate(capacity):
+    """Create empty arrays with room for capacity rows."""
+    # Imported here so that importing this module stays fast
+    import numpy as np
+
+    arrays = {}
+    for column in COLUMNS:
+        if column in CATEGORICAL_COLUMNS:
+            arrays[column] = np.full(capacity, -1, dtype=np.int32)
+        elif column in INTEGER_COLUMNS:
+            arrays[column] = np.zeros(capacity, dtype=np.int64)
+        else:
+            arrays[column] = np.empty(capacity, dtype=object)
+    return arrays
+
+def _clear():
+    """Empty the mirror and release its arrays."""
+    global _live, _size, _deleted
+
+    _columns.clear()
+    _categories.clear()
+    _codes.clear()
+    _rows.clear()
+    _live = None
+    _size = 0
+    _deleted = 0
+
+def _reset(capacity):
+    """Empty the mirror, keeping room for capacity rows."""
+    global _live
+    import numpy as np
+
+    _clear()
+    _columns.update(_allocate(capacity))
+    for column in CATEGORICAL_COLUMNS:
+        _categories[column] = []
+        _codes[column] = {}
+    _live = np.zeros(capacity, dtype=bool)
+
+def _student_id(student):
+    """Get the ID of a student object or record."""
+    if type(student) is StudentRecord:
+        return student.id
+    return student.get_student_id()
+
+def _code(column, value):
+    """Get the code of a categorical value, adding it to the column's categories if new."""
+    if value is None:
+        return -1
+    codes = _codes[column]
+    code = codes.get(value)
+    if code is None:
+        code = codes[value] = len(_categories[column])
+        _categories[column].append(value)
+    return code
+
+def _write(row, data):
+    """Store a student's storage-format data in a row."""
+    for column in COLUMNS:
+        value = data.get(column)
+        if column in CATEGORICAL_COLUMNS:
+            value = _code(column, value)
+        elif column == "courses":
+            value = tuple(value)
+        _columns[column][row] = value
+
+def _grow():
+    """Double the number of rows allocated."""
+    global _live
+    import numpy as np
+
+    capacity = max(len(_live) * 2, INITIAL_CAPACITY)
+    arrays = _allocate(capacity)
+    for column, array in arrays.items():
+        array[:_size] = _columns[column][:_size]
+    _columns.update(arrays)
+
+    live = np.zeros(capacity, dtype=bool)
+    live[:_size] = _live[:_size]
+    _live = live
+
+def _compact():
+    """Drop the deleted rows, keeping the others in order."""
+    global _size, _deleted
+    import numpy as np
+
+    keep = np.flatnonzero(_live[:_size])
+    count = len(keep)
+    for column, array in _columns.items():
+        array[:count] = array[keep]
+        if array.dtype == object:
+            # Release the students' values held by the rows past the end
+            array[count:_size] = None
+
+    _live[:count] = True
+    _live[count:_size] = False
+    _size = count
+    _deleted = 0
+
+    _rows.clear()
+    _rows.update(zip(_columns["id"][:count].tolist(), range(count)))
+
+def add_student(student):
+    """
+    Append a student to the mirror.
+
+    Args:
+        student: A Student, Undergraduate, or Postgraduate object, or a StudentRecord.
+    """
+    global _size
+
+    if not _built:
+        return
+
+    data = student_to_dict(student)
+    row = _rows.get(data["id"])
+    if row is None:
+        if _size == len(_live):
+            _grow()
+        row = _size
+        _size += 1
+        _live[row] = True
+        _rows[data["id"]] = row
+    _write(row, data)
+
+def update_student(old_student, new_student):
+    """
+    Rewrite a student's row in place.
+
+    The old student may be the same object as the new one when it was
+    modified in place, as only the new values are read.
+
+    Args:
+        old_student: The student object or record currently in the mirror.
+        new_student: The student object replacing it.
+    """
+    add_student(new_student)
+
+def remove_student(student):
+    """
+    Mark a student's row as deleted.
+
+    Args:
+        student: A Student, Undergraduate, or Postgraduate object, or a StudentRecord.
+    """
+    global _deleted
+
+    if not _built:
+        return
+
+    row = _rows.pop(_student_id(student), None)
+    if row is None:
+        return
+
+    _live[row] = False
+    for array in _columns.values():
+        if array.dtype == object:
+            array[row] = None
+    _deleted += 1
+
+    if _deleted > _size * COMPACTION_THRESHOLD:
+        _compact()
+
+def rebuild(students):
+    """
+    Rebuild the mirror from scratch.
+
+    Args:
+        students (iterable): Student objects or StudentRecord tuples in insertion order.
+    """
+    global _built
+
+    students = list(students)
+    _reset(max(len(students), INITIAL_CAPACITY))
+    _built = True
+
+    for student in students:
+        add_student(student)
+
+def invalidate():
+    """
+    Drop the mirror contents until the next rebuild.
+
+    Changes made while the mirror is invalidated are ignored, since the
+    rebuild will pick them up.
+    """
+    global _built
+
+    _clear()
+    _built = False
+
+def is_built():
+    """
+    Check whether the mirror is up to date.
+
+    Returns:
+        bool: False before the first rebuild, or if the mirror was invalidated
+            and not rebuilt since.
+    """
+    return _built
+
+def count():
+    """
+    Get the number of students in the mirror.
+
+    Returns:
+        int: The number of rows that were not deleted.
+    """
+    return len(_rows)
+
+def frame(columns=None, ids=None):
+    """
+    Copy the students into a DataFrame.
+
+    Args:
+        columns (list, optional): Columns to include, all of COLUMNS by default.
+        ids (list, optional): IDs of the students to include, in the order
+            of the rows. Every student is included by default.
+
+    Returns:
+        pd.DataFrame: One row per student, in insertion order unless ids
+            are given, with a RangeIndex. Categorical columns have a
+            categorical dtype with missing values as NaN, and courses are tuples.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if ids is None:
+        rows = _live[:_size]
+    else:
+        rows = np.fromiter((_rows[student_id] for student_id in ids), dtype=np.int64, count=len(ids))
+
+    data = {}
+    for column in columns or COLUMNS:
+        values = _columns[column][:_size][rows]
+        if column in CATEGORICAL_COLUMNS:
+            values = pd.Categorical.from_codes(values, categories=pd.Index(_categories[column], dtype=object))
+        data[column] = values
+    return pd.DataFrame(data)
+
+def _casefold_ranks(values):
+    """Rank distinct values case-insensitively, giving equal ranks to values that only differ in case."""
+    import numpy as np
+
+    keys = [value.casefold() for value in values]
+    ranks = np.empty(len(keys) + 1, dtype=np.int64)
+    rank = -1
+    previous = None
+    for index in sorted(range(len(keys)), key=keys.__getitem__):
+        if keys[index] != previous:
+            rank += 1
+            previous = keys[index]
+        ranks[index] = rank
+    # The last entry is the rank of code -1, so missing values sort last
+    ranks[-1] = rank + 1
+    return ranks
+
+def sorted_ids(field):
+    """
+    Get the student IDs sorted by a field, in the same order as database.get_sorted_ids.
+
+    Text is compared case-insensitively, missing values sort last, and
+    students with equal values keep their insertion order.
+
+    Args:
+        field (str): One of database.SORT_FIELDS.
+
+    Returns:
+        list: Student IDs in ascending order.
+    """
+    import numpy as np
+    import pandas as pd
+
+    live = _live[:_size]
+    values = _columns[field][:_size][live]
+    if field in CATEGORICAL_COLUMNS:
+        keys = _casefold_ranks(_categories[field])[values]
+    elif field in INTEGER_COLUMNS:
+        keys = values
+    else:
+        # Text is ranked once per distinct value and sorted as integers
+        codes, uniques = pd.factorize(values)
+        keys = _casefold_ranks(uniques.tolist())[codes]
+
+    order = np.argsort(keys, kind="stable")
+    return _columns["id"][:_size][live][order].tolist()
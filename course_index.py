@@ -0,0 +1,165 @@
+"""
+Course Index Module
+Maintains the students enrolled in each course, keyed by course name.
+"""
+
+from serialization import StudentRecord
+
+# Student IDs keyed by course, each kept as a dict used as an ordered set so
+# that students are listed in the order they enrolled
+_enrolled = {}
+
+# Whether the index reflects the database; cleared by invalidate()
+_built = True
+
+def _student_id(student):
+    """Get the ID of a student object or record."""
+    if type(student) is StudentRecord:
+        return student.id
+    return student.get_student_id()
+
+def _courses(student):
+    """Get the courses of a student object or record."""
+    if type(student) is StudentRecord:
+        return student.courses
+    return student.get_courses()
+
+def _enroll(student_id, courses):
+    """Add a student to the entry of each course."""
+    for course in courses:
+        students = _enrolled.get(course)
+        if students is None:
+            _enrolled[course] = {student_id: None}
+        else:
+            students[student_id] = None
+
+def _unenroll(student_id, courses):
+    """Remove a student from the entry of each course."""
+    for course in courses:
+        students = _enrolled.get(course)
+        if students is not None:
+            students.pop(student_id, None)
+            if not students:
+                del _enrolled[course]
+
+def add_student(student):
+    """
+    Add a student to the index.
+
+    Args:
+        student: A Student, Undergraduate, or Postgraduate object, or a StudentRecord.
+    """
+    if _built:
+        _enroll(_student_id(student), _courses(student))
+
+def update_student(old_student, new_student):
+    """
+    Replace a student's courses in the index.
+
+    Args:
+        old_student: The student object or record currently in the index.
+        new_student: The student object replacing it.
+    """
+    if _built:
+        update_courses(_student_id(new_student), _courses(old_student), _courses(new_student))
+
+def update_courses(student_id, old_courses, new_courses):
+    """
+    Move a student between courses, leaving the courses kept untouched.
+
+    Args:
+        student_id (str): The student's ID.
+        old_courses (iterable): The courses currently in the index.
+        new_courses (iterable): The student's new courses.
+    """
+    if _built:
+        old_courses = set(old_courses)
+        new_courses = set(new_courses)
+        _unenroll(student_id, old_courses - new_courses)
+        _enroll(student_id, new_courses - old_courses)
+
+def remove_student(student):
+    """
+    Remove a student from the index.
+
+    Args:
+        student: A Student, Undergraduate, or Postgraduate object, or a StudentRecord.
+    """
+    if _built:
+        _unenroll(_student_id(student), _courses(student))
+
+def rebuild(students):
+    """
+    Rebuild the index from scratch.
+
+    Args:
+        students (iterable): Student objects or StudentRecord tuples in insertion order.
+    """
+    global _built
+
+    _enrolled.clear()
+    _built = True
+
+    for student in students:
+        add_student(student)
+
+def invalidate():
+    """
+    Drop the index contents until the next rebuild.
+
+    Changes made while the index is invalidated are ignored, since the
+    rebuild will pick them up.
+    """
+    global _built
+
+    _enrolled.clear()
+    _built = False
+
+def is_built():
+    """
+    Check whether the index is up to date.
+
+    Returns:
+        bool: False if the index was invalidated and not rebuilt since.
+    """
+    return _built
+
+def students_in(course):
+    """
+    Get the students enrolled in a course.
+
+    Args:
+        course (str): The exact course name.
+
+    Returns:
+        list: Student IDs in the order they enrolled.
+    """
+    return list(_enrolled.get(course, ()))
+
+def students_in_all(courses):
+    """
+    Get the students enrolled in every one of several courses.
+
+    Args:
+        courses (iterable): Exact course names.
+
+    Returns:
+        list: Student IDs in the order they enrolled in the least popular
+            of the courses, or an empty list if no courses are given.
+    """
+    entries = sorted((_enrolled.get(course, {}) for course in set(courses)), key=len)
+    if not entries:
+        return []
+
+    # Checking the smallest course against the others keeps this proportional to its size
+    smallest, others = entries[0], entries[1:]
+    return [student_id for student_id in smallest if all(student_id in other for other in others)]
+
+def enrollment_counts():
+    """
+    Get the number of students enrolled in each course.
+
+    Returns:
+        dict: Number of students keyed by course name.
+    """
+    return {course: len(students) for course, students in _enrolled.items()}
@@ -3,51 +3,666 @@ Database Module
 Provides storage and retrieval of student records.
 """
 
-# Global list to store all student records
-students = []
+import search_index
+import aggregates
+import course_index
+import columnar
+import metrics
+from locks import ReadWriteLock
+from serialization import StudentRecord, record_to_student, student_type
+
+# Global ID-keyed index of all student records.
+# Dictionaries preserve insertion order, so iterating over the values
+# yields students in the order they were added. Students loaded with
+# load_records() are kept as compact StudentRecord tuples until accessed.
+students_by_id = {}
+
+# Guards the students and the search index. Readers share the lock, while
+# changes take it exclusively.
+_lock = ReadWriteLock()
+
+def read_lock():
+    """
+    Hold the read lock across several reads so they see the same students.
+
+    Returns:
+        A context manager that holds the lock.
+    """
+    return _lock.read()
+
+def write_lock():
+    """
+    Hold the write lock across several operations so they happen as one step,
+    such as checking that a student exists and then changing it.
+
+    Returns:
+        A context manager that holds the lock.
+    """
+    return _lock.write()
+
+# Generation counter, bumped on every change to the database so that
+# derived views can tell whether they are out of date
+_version = 0
+
+def _record_change():
+    """Bump the version after a student changed."""
+    global _version
+    _version += 1
+
+def _record_reload():
+    """Bump the version after the whole database was replaced."""
+    global _version
+    _version += 1
+
+def get_version():
+    """
+    Get the current database version.
+
+    Returns:
+        int: A number that increases with every change to the database.
+    """
+    with _lock.read():
+        return _version
+
+# Fields that students can be sorted by
+SORT_FIELDS = ("id", "name", "age", "year", "field_of_study", "type")
+
+# Whether sorting, the student table and exports read the columnar mirror.
+# The mirror is built on first use and then kept up to date on every change.
+COLUMNAR_MIRROR = False
+
+# Whether students_by_id is a read-only roster rather than a dict
+_read_only = False
+
+# Student IDs in sorted order as (version, ids), keyed by sort field, with
+# None for insertion order. Entries are rebuilt once the version changes.
+_sorted_ids = {}
+
+def load_students(students):
+    """
+    Replace the contents of the database with the given students.
+
+    Args:
+        students (list): Student, Undergraduate or Postgraduate objects in insertion order.
+    """
+    global students_by_id, _read_only
+    with _lock.write():
+        students_by_id = {student.get_student_id(): student for student in students}
+        _read_only = False
+        for student in students_by_id.values():
+            student.take_old_values()
+        search_index.rebuild(students_by_id.values())
+        aggregates.rebuild(students_by_id.values())
+        course_index.rebuild(students_by_id.values())
+        columnar.invalidate()
+        _record_reload()
+
+def _invalidate_indexes():
+    """Drop every derived index, to be rebuilt from students_by_id when next used."""
+    search_index.invalidate()
+    aggregates.invalidate()
+    course_index.invalidate()
+    columnar.invalidate()
+
+def load_records(records):
+    """
+    Replace the contents of the database with compact records.
+
+    Student objects are only built when a record is first accessed, and
+    the search index, aggregates and course index are only built when
+    first needed.
+
+    Args:
+        records (list): StudentRecord tuples in insertion order.
+    """
+    global students_by_id, _read_only
+    with _lock.write():
+        students_by_id = {record.id: record for record in records}
+        _read_only = False
+        _invalidate_indexes()
+        _record_reload()
+
+def load_roster(roster):
+    """
+    Use a read-only roster in place of the database contents.
+
+    The roster is read on demand and student objects are built on every
+    access without being kept, so the students are never copied into
+    this process. The search index, aggregates and course index are
+    built when first needed. Changing students is not possible until students are loaded
+    with load_students() or load_records().
+
+    Args:
+        roster (Mapping): Maps student IDs to StudentRecord tuples in
+            insertion order, such as an mmap_roster.Roster.
+    """
+    global students_by_id, _read_only
+    with _lock.write():
+        students_by_id = roster
+        _read_only = True
+        _invalidate_indexes()
+        _record_reload()
+
+def _indexed_values(student):
+    """
+    Get the values a stored student is listed under in the derived indexes.
+
+    Changes made in place since the student was last stored are only
+    applied to the indexes when it is stored again, so the student's
+    earlier values are returned and forgotten here as the caller applies them.
+    """
+    if type(student) is StudentRecord:
+        return student
+    old_values = student.take_old_values()
+    return student if old_values is None else old_values
+
+def _hydrate(student_id, student):
+    """Replace a compact record with its student object on first access."""
+    if type(student) is StudentRecord:
+        student = record_to_student(student)
+        if not _read_only:
+            students_by_id[student_id] = student
+            student.take_old_values()
+    return student
 
 def add_student(student):
     """
     Add a student to the database.
-    
+
     Args:
         student: A Student or Undergraduate object.
     """
-    students.append(student)
+    add_students([student])
+
+def add_students(students):
+    """
+    Add several students to the database.
+
+    If the students cannot be added to the derived indexes, none of them
+    are added and the error is raised.
+
+    Args:
+        students (list): Student, Undergraduate or Postgraduate objects.
+    """
+    with _lock.write():
+        replaced = []
+        try:
+            for student in students:
+                student_id = student.get_student_id()
+                replaced.append((student_id, students_by_id.get(student_id)))
+                students_by_id[student_id] = student
+                if type(student) is not StudentRecord:
+                    # Earlier changes are part of the values indexed now
+                    student.take_old_values()
+                search_index.add_student(student)
+                aggregates.add_student(student)
+                course_index.add_student(student)
+                columnar.add_student(student)
+                _record_change()
+        except BaseException:
+            # The indexes may be partly updated, so they are rebuilt from the restored students
+            for student_id, previous in reversed(replaced):
+                if previous is None:
+                    students_by_id.pop(student_id, None)
+                else:
+                    students_by_id[student_id] = previous
+            _invalidate_indexes()
+            raise
 
 def update_student(updated_student):
     """
     Update an existing student in the database.
-    
+
+    The student keeps its original position in the insertion order. If
+    the stored student was modified in place, whether it is passed back
+    or replaced, the indexes are updated from the values it had before it
+    was modified. The columnar mirror only needs the new values.
+
+    If the derived indexes cannot be updated, the previous student is
+    restored and the error is raised.
+
     Args:
         updated_student: A Student or Undergraduate object with updated information.
     """
-    for i, student in enumerate(students):
-        if student.get_student_id() == updated_student.get_student_id():
-            students[i] = updated_student
-            break
+    student_id = updated_student.get_student_id()
+    with _lock.write():
+        old_student = students_by_id.get(student_id)
+        if old_student is not None:
+            students_by_id[student_id] = updated_student
+            try:
+                # A stored student edited in place and then replaced is
+                # still indexed under its values from before the edit
+                old_values = _indexed_values(old_student)
+                if old_student is not updated_student:
+                    updated_student.take_old_values()
+                search_index.update_student(old_values, updated_student)
+                aggregates.update_student(old_values, updated_student)
+                course_index.update_student(old_values, updated_student)
+                columnar.update_student(old_student, updated_student)
+            except BaseException:
+                students_by_id[student_id] = old_student
+                _invalidate_indexes()
+                raise
+            _record_change()
 
 def delete_student(student_id):
     """
     Delete a student from the database.
-    
+
     Args:
         student_id: ID of the student to delete.
     """
-    global students
-    students = [student for student in students if student.get_student_id() != student_id]
+    with _lock.write():
+        student = students_by_id.pop(student_id, None)
+        if student is not None:
+            indexed = _indexed_values(student)
+            search_index.remove_student(indexed)
+            aggregates.remove_student(indexed)
+            course_index.remove_student(indexed)
+            columnar.remove_student(student)
+            _record_change()
 
 def get_student_by_id(student_id):
     """
     Get a student by ID.
-    
+
     Args:
         student_id: ID of the student to retrieve.
-        
+
     Returns:
         Student or Undergraduate object, or None if not found.
     """
-    for student in students:
-        if student.get_student_id() == student_id:
-            return student
-    return None
+    with _lock.read():
+        student = students_by_id.get(student_id)
+        if student is None:
+            return None
+        return _hydrate(student_id, student)
+
+def student_exists(student_id):
+    """
+    Check whether a student with the given ID exists.
+
+    Args:
+        student_id: ID of the student to look up.
+
+    Returns:
+        bool: True if the student exists, False otherwise.
+    """
+    with _lock.read():
+        return student_id in students_by_id
+
+def list_students():
+    """
+    List all students in insertion order.
+
+    Returns:
+        list: A list of Student, Undergraduate and Postgraduate objects.
+    """
+    with _lock.read():
+        return [_hydrate(student_id, student) for student_id, student in students_by_id.items()]
+
+def list_entries():
+    """
+    List all stored entries in insertion order without building student objects.
+
+    Returns:
+        list: Student objects, and StudentRecord tuples for students that
+            have not been accessed yet.
+    """
+    with _lock.read():
+        return list(students_by_id.values())
+
+def iter_entry_chunks(chunk_size):
+    """
+    Iterate over the stored entries in insertion order, a chunk at a time.
+
+    The students are the ones stored when iteration starts. The read lock
+    is only held while each chunk is taken, so changes can be made between
+    chunks: students deleted since are skipped and updated students are
+    returned as they are when their chunk is taken.
+
+    Args:
+        chunk_size (int): Maximum number of entries in each chunk.
+
+    Yields:
+        list: Student objects, and StudentRecord tuples for students that
+            have not been accessed yet.
+    """
+    with _lock.read():
+        entries = students_by_id
+        read_only = _read_only
+        ids = None if read_only else get_sorted_ids()
+
+    if read_only:
+        # A roster never changes, so it is read a page at a time without copying its IDs
+        for offset in range(0, len(entries), chunk_size):
+            yield entries.page(offset, chunk_size)
+        return
+
+    for offset in range(0, len(ids), chunk_size):
+        with _lock.read():
+            chunk = [entries.get(student_id) for student_id in ids[offset:offset + chunk_size]]
+        yield [entry for entry in chunk if entry is not None]
+
+def count_students():
+    """
+    Get the number of students in the database.
+
+    Returns:
+        int: The number of students.
+    """
+    with _lock.read():
+        return len(students_by_id)
+
+def _ensure_search_index():
+    """Build the search index if it was invalidated by a lazy load or an in-place update."""
+    if not search_index.is_built():
+        # Rebuilding changes the index, so it must not run alongside readers
+        with _lock.write():
+            if not search_index.is_built():
+                search_index.rebuild(students_by_id.values())
+
+@metrics.timed("database.search_candidates")
+def search_candidates(keyword):
+    """
+    Get the students that may contain a search keyword, using the search index.
+
+    Args:
+        keyword (str): The lowercased search keyword.
+
+    Returns:
+        list: Candidate Student, Undergraduate and Postgraduate objects in
+            insertion order. Callers must check that each one actually matches.
+    """
+    _ensure_search_index()
+
+    with _lock.read():
+        candidate_ids = search_index.candidate_ids(keyword)
+        if candidate_ids is None:
+            return list_students()
+        return [_hydrate(student_id, students_by_id[student_id]) for student_id in candidate_ids]
+
+@metrics.timed("database.similar_students")
+def similar_students(keyword, limit, min_similarity):
+    """
+    Get the students most similar to a search keyword, using the search index.
+
+    Args:
+        keyword (str): The lowercased search keyword.
+        limit (int): Maximum number of students to return.
+        min_similarity (float): Smallest fraction of the keyword's trigrams
+            a student must share to be returned.
+
+    Returns:
+        list: (student, similarity) tuples, best match first. Keywords shorter
+            than a trigram only return exact matches, in insertion order.
+    """
+    _ensure_search_index()
+
+    with _lock.read():
+        matches = search_index.similar_ids(keyword, limit, min_similarity)
+        if matches is None:
+            # Keywords shorter than a trigram can only match exactly, so
+            # take the first exact matches without scanning further
+            matches = []
+            for student_id, student in students_by_id.items():
+                if any(keyword in field for field in search_index.searchable_fields(student)):
+                    matches.append((student_id, 1.0))
+                    if len(matches) == limit:
+                        break
+
+        return [(_hydrate(student_id, students_by_id[student_id]), similarity)
+                for student_id, similarity in matches]
+
+@metrics.timed("database.get_aggregates")
+def get_aggregates():
+    """
+    Get the student counts maintained on every change.
+
+    Returns:
+        dict: The number of students under "total" and a Counter for each
+            name in aggregates.AGGREGATES, mapping each value to its number
+            of students.
+    """
+    if not aggregates.is_built():
+        with _lock.write():
+            if not aggregates.is_built():
+                aggregates.rebuild(students_by_id.values())
+
+    with _lock.read():
+        return aggregates.snapshot()
+
+def verify_aggregates():
+    """
+    Check the maintained counts against a full recount of the students.
+
+    Returns:
+        list: A description of each count that differs, empty if they all match.
+    """
+    with _lock.read():
+        if not aggregates.is_built():
+            return []
+        return aggregates.differences(students_by_id.values())
+
+def _ensure_course_index():
+    """Build the course index if it was invalidated by a lazy load."""
+    if not course_index.is_built():
+        with _lock.write():
+            if not course_index.is_built():
+                course_index.rebuild(students_by_id.values())
+
+@metrics.timed("database.students_in_course")
+def students_in_course(course):
+    """
+    Get the students enrolled in a course, using the course index.
+
+    Args:
+        course (str): The exact course name.
+
+    Returns:
+        list: Student, Undergraduate and Postgraduate objects in the order they enrolled.
+    """
+    _ensure_course_index()
+
+    with _lock.read():
+        return [_hydrate(student_id, students_by_id[student_id])
+                for student_id in course_index.students_in(course)]
+
+@metrics.timed("database.students_in_courses")
+def students_in_courses(courses):
+    """
+    Get the students enrolled in every one of several courses, using the course index.
+
+    Args:
+        courses (list): Exact course names.
+
+    Returns:
+        list: Student, Undergraduate and Postgraduate objects, or an empty
+            list if no courses are given.
+    """
+    _ensure_course_index()
+
+    with _lock.read():
+        return [_hydrate(student_id, students_by_id[student_id])
+                for student_id in course_index.students_in_all(courses)]
+
+@metrics.timed("database.course_enrollment_counts")
+def course_enrollment_counts():
+    """
+    Get the number of students enrolled in each course, using the course index.
+
+    Returns:
+        dict: Number of students keyed by course name.
+    """
+    _ensure_course_index()
+
+    with _lock.read():
+        return course_index.enrollment_counts()
+
+def _ensure_columnar():
+    """Build the columnar mirror if it was not built yet or was invalidated by a load."""
+    if not columnar.is_built():
+        with _lock.write():
+            if not columnar.is_built():
+                columnar.rebuild(students_by_id.values())
+
+@metrics.timed("database.get_frame")
+def get_frame(columns=None):
+    """
+    Get the students as a DataFrame, copied from the columnar mirror.
+
+    Args:
+        columns (list, optional): Columns to include, all of columnar.COLUMNS by default.
+
+    Returns:
+        pd.DataFrame: One row per student in insertion order, with
+            categorical dtypes for field of study, type, minor and domain.
+    """
+    _ensure_columnar()
+
+    with _lock.read():
+        return columnar.frame(columns)
+
+def iter_frame_chunks(chunk_size, columns=None):
+    """
+    Iterate over the students in insertion order as DataFrames, a chunk at a time.
+
+    Only one chunk is copied from the columnar mirror at once. As with
+    iter_entry_chunks, the students are the ones stored when iteration
+    starts and changes can be made between chunks: students deleted since
+    are skipped and updated students are returned as they are when their
+    chunk is taken.
+
+    Args:
+        chunk_size (int): Maximum number of students in each chunk.
+        columns (list, optional): Columns to include, all of columnar.COLUMNS by default.
+
+    Yields:
+        pd.DataFrame: Up to chunk_size rows, as returned by get_frame.
+    """
+    ids = get_sorted_ids()
+
+    for offset in range(0, len(ids), chunk_size):
+        _ensure_columnar()
+        with _lock.read():
+            chunk = [student_id for student_id in ids[offset:offset + chunk_size] if student_id in students_by_id]
+            frame = columnar.frame(columns, ids=chunk)
+        yield frame
+
+def _field_value(student, field):
+    """Read a sortable field from a student object or record."""
+    if type(student) is StudentRecord:
+        return getattr(student, field)
+    if field == "id":
+        return student.get_student_id()
+    if field == "name":
+        return student.get_name()
+    if field == "age":
+        return student.get_age()
+    if field == "year":
+        return student.get_year()
+    if field == "field_of_study":
+        return student.get_field_of_study()
+    return student_type(student)
+
+def _sort_key(student, field):
+    """Build a sort key that orders missing values last and text case-insensitively."""
+    value = _field_value(student, field)
+    if isinstance(value, str):
+        value = value.casefold()
+    return (value is None, value)
+
+def get_sorted_ids(sort_by=None):
+    """
+    Get all student IDs in sorted order.
+
+    The order is computed once per database version and reused until the
+    next change.
+
+    Args:
+        sort_by (str, optional): One of SORT_FIELDS, or None for insertion order.
+
+    Returns:
+        list: Student IDs in ascending order. Callers must not modify it.
+    """
+    with _lock.read():
+        cached = _sorted_ids.get(sort_by)
+        if cached is not None and cached[0] == _version:
+            return cached[1]
+
+        if sort_by is None:
+            ids = list(students_by_id)
+        elif COLUMNAR_MIRROR and columnar.is_built():
+            ids = columnar.sorted_ids(sort_by)
+        else:
+            ids = sorted(students_by_id, key=lambda student_id: _sort_key(students_by_id[student_id], sort_by))
+
+        _sorted_ids[sort_by] = (_version, ids)
+        return ids
+
+@metrics.timed("database.get_page")
+def get_page(offset, limit, sort_by=None, descending=False):
+    """
+    Get one page of students, building only the objects on that page.
+
+    Args:
+        offset (int): Number of students to skip.
+        limit (int): Maximum number of students to return.
+        sort_by (str, optional): One of SORT_FIELDS, or None for insertion order.
+        descending (bool): Sort in descending order.
+
+    Returns:
+        list: Student, Undergraduate and Postgraduate objects on the page.
+    """
+    if COLUMNAR_MIRROR and sort_by is not None:
+        _ensure_columnar()
+
+    with _lock.read():
+        if _read_only and sort_by is None:
+            # Read only the students on the page from the roster
+            return [record_to_student(record) for record in students_by_id.page(offset, limit, descending)]
+
+        page_ids = _page_ids(get_sorted_ids(sort_by), offset, limit, descending)
+        return [get_student_by_id(student_id) for student_id in page_ids]
+
+def _page_ids(ids, offset, limit, descending):
+    """Take one page of sorted IDs, counting from the end when descending."""
+    if descending:
+        end = max(len(ids) - offset, 0)
+        return ids[max(end - limit, 0):end][::-1]
+    return ids[offset:offset + limit]
+
+@metrics.timed("database.get_frame_page")
+def get_frame_page(offset, limit, sort_by=None, descending=False):
+    """
+    Get one page of students as a DataFrame, copied from the columnar mirror.
+
+    Args:
+        offset (int): Number of students to skip.
+        limit (int): Maximum number of students to return.
+        sort_by (str, optional): One of SORT_FIELDS, or None for insertion order.
+        descending (bool): Sort in descending order.
+
+    Returns:
+        pd.DataFrame: One row per student on the page, as returned by get_frame.
+    """
+    _ensure_columnar()
+
+    with _lock.read():
+        return columnar.frame(ids=_page_ids(get_sorted_ids(sort_by), offset, limit, descending))
+
+def sort_students(students, sort_by, descending=False):
+    """
+    Sort a list of students by a field.
+
+    Args:
+        students (list): Student, Undergraduate and Postgraduate objects.
+        sort_by (str, optional): One of SORT_FIELDS, or None to keep the order.
+        descending (bool): Sort in descending order.
+
+    Returns:
+        list: The sorted students.
+    """
+    if sort_by is None:
+        return list(reversed(students)) if descending else list(students)
+    return sorted(students, key=lambda student: _sort_key(student, sort_by), reverse=descending)
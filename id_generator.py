@@ -6,15 +6,68 @@ Provides functionality to generate unique student IDs based on student informati
 import re
 import random
 import string
-from database import students
+import student_operations
+import metrics
 
-def generate_id_from_name(name, age):
+# IDs handed out but not yet added to the database, such as the IDs
+# generated for a bulk import before the batch is saved. Together with the
+# database's ID index this forms the registry of allocated IDs.
+_reserved_ids = set()
+
+def is_id_allocated(student_id):
+    """
+    Check whether an ID is used by a student or reserved.
+    
+    Args:
+        student_id (str): The ID to check
+        
+    Returns:
+        bool: True if the ID is taken, False otherwise
+    """
+    return student_operations.student_exists(student_id) or student_id in _reserved_ids
+
+def reserve_ids(student_ids):
+    """
+    Reserve IDs so they are not generated for other students.
+    
+    Args:
+        student_ids (iterable): The IDs to reserve
+    """
+    _reserved_ids.update(student_ids)
+
+def release_ids(student_ids):
+    """
+    Release reserved IDs, typically once their students have been added.
+    
+    Args:
+        student_ids (iterable): The IDs to release
+    """
+    _reserved_ids.difference_update(student_ids)
+
+@metrics.timed("id_generator.generate_ids")
+def generate_ids(people):
+    """
+    Generate and reserve unique IDs for many students at once.
+    
+    The IDs stay reserved until they are passed to release_ids.
+    
+    Args:
+        people (iterable): (name, age) tuples
+        
+    Returns:
+        list: One unique student ID per person, in order
+    """
+    return [generate_id_from_name(name, age, reserve=True) for name, age in people]
+
+@metrics.timed("id_generator.generate_id_from_name")
+def generate_id_from_name(name, age, reserve=False):
     """
     Generate a unique student ID based on the student's name and age.
     
     Args:
         name (str): The student's name
         age (int): The student's age
+        reserve (bool): Reserve the ID until it is passed to release_ids
         
     Returns:
         str: A unique student ID
@@ -38,8 +91,13 @@ def generate_id_from_name(name, age):
     if len(base_id) < 5:
         base_id += ''.join(random.choices(string.ascii_uppercase, k=5-len(base_id)))
     
-    # Ensure uniqueness by checking against existing IDs
-    return ensure_unique_id(base_id)
+    # Ensure uniqueness by checking against existing and reserved IDs
+    student_id = ensure_unique_id(base_id)
+    
+    if reserve:
+        _reserved_ids.add(student_id)
+    
+    return student_id
 
 def ensure_unique_id(base_id):
     """
@@ -51,11 +109,8 @@ def ensure_unique_id(base_id):
     Returns:
         str: A unique ID
     """
-    # Get existing student IDs
-    existing_ids = [student.get_student_id() for student in students]
-    
     # If base_id is already unique, return it
-    if base_id not in existing_ids:
+    if not is_id_allocated(base_id):
         return base_id
     
     # Otherwise, add a numerical suffix and try again
@@ -67,7 +122,7 @@ def ensure_unique_id(base_id):
         # Ensure total length doesn't exceed 10 characters
         new_id = base_id[:(10-len(suffix_str))] + suffix_str
         
-        if new_id not in existing_ids:
+        if not is_id_allocated(new_id):
             return new_id
         
         suffix += 1
@@ -75,4 +130,7 @@ def ensure_unique_id(base_id):
         # Safety check - if we somehow can't find a unique ID with suffixes 1-99
         # (extremely unlikely), generate a completely random ID
         if suffix > 99:
-            return ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
\ No newline at end of file
+            while True:
+                new_id = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
+                if not is_id_allocated(new_id):
+                    return new_id
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+Journal Module
+Provides an append-only log of changes to student records.
+"""
+
+import os
+import json
+from exceptions import StorageException
+
+def append_entries(path, entries):
+    """
+    Append change entries to the journal file.
+
+    Each entry is written as one compact JSON line of the form
+    [operation, student_id, data]. The entries are on disk when this returns.
+
+    Args:
+        path (str): Path of the journal file.
+        entries (list): (operation, student_id, data) tuples, where operation
+            is "add", "update" or "delete" and data is None for deletes.
+    """
+    lines = [json.dumps([operation, student_id, data], separators=(",", ":")) + "\n"
+             for operation, student_id, data in entries]
+
+    with open(path, 'a') as file:
+        file.write("".join(lines))
+        file.flush()
+        os.fsync(file.fileno())
+
+def read_entries(path):
+    """
+    Read change entries from the journal file.
+
+    A last line without a newline was left behind by an interrupted write.
+    It is ignored and cut from the file, so that the next entries are not
+    appended to it. Callers must hold the storage file lock.
+
+    Args:
+        path (str): Path of the journal file.
+
+    Returns:
+        list: (operation, student_id, data) tuples in the order they were written.
+
+    Raises:
+        StorageException: If a complete line is not a valid entry.
+    """
+    entries = []
+
+    if not os.path.exists(path):
+        return entries
+
+    # Size of the complete lines read so far
+    size = 0
+    torn = False
+    with open(path, 'rb') as file:
+        for number, line in enumerate(file, 1):
+            if not line.endswith(b"\n"):
+                torn = True
+                break
+            try:
+                operation, student_id, data = json.loads(line)
+            except ValueError:
+                raise StorageException(f"Corrupt journal entry on line {number} of {path}")
+            entries.append((operation, student_id, data))
+            size += len(line)
+
+    if torn:
+        _truncate(path, size)
+
+    return entries
+
+def _truncate(path, size):
+    """Cut the journal file to its first size bytes."""
+    with open(path, 'r+b') as file:
+        file.truncate(size)
+        file.flush()
+        os.fsync(file.fileno())
+
+def replay(path, records, convert=None):
+    """
+    Apply the journal on top of a snapshot.
+
+    Replaying is idempotent, so entries that are already part of the
+    snapshot can safely be applied again.
+
+    Args:
+        path (str): Path of the journal file.
+        records (dict): Student records keyed by ID, updated in place.
+        convert (callable, optional): Converts the dictionary stored in an
+            entry to the form kept in records.
+
+    Returns:
+        int: The number of entries applied.
+
+    Raises:
+        StorageException: If a complete line is not a valid entry.
+    """
+    entries = read_entries(path)
+
+    for operation, student_id, data in entries:
+        if operation == "delete":
+            records.pop(student_id, None)
+        else:
+            records[student_id] = convert(data) if convert else data
+
+    return len(entries)
+
+def clear(path):
+    """
+    Remove the journal file.
+
+    Args:
+        path (str): Path of the journal file.
+    """
+    if os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,172 @@
+"""
+Locks Module
+Provides the locks used to share student data between threads and processes.
+"""
+
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+class ReadWriteLock:
+    """
+    Lock that lets many threads read at once but only one thread write.
+
+    Both sides are reentrant: a thread may take the read or write lock again
+    while it holds it, and the writer may also take the read lock. Waiting
+    writers are served before new readers so writes are not starved.
+    """
+
+    def __init__(self):
+        """Initialize an unlocked ReadWriteLock."""
+        self.__condition = threading.Condition(threading.Lock())
+        self.__readers = {}  # Read lock depth by thread ID
+        self.__writer = None  # Thread ID of the writer
+        self.__write_depth = 0
+        self.__waiting_writers = 0
+
+    def acquire_read(self):
+        """Acquire the lock for reading, waiting for any writer to finish."""
+        me = threading.get_ident()
+        with self.__condition:
+            if self.__writer != me and me not in self.__readers:
+                while self.__writer is not None or self.__waiting_writers:
+                    self.__condition.wait()
+            self.__readers[me] = self.__readers.get(me, 0) + 1
+
+    def release_read(self):
+        """Release one level of the read lock held by this thread."""
+        me = threading.get_ident()
+        with self.__condition:
+            depth = self.__readers[me] - 1
+            if depth:
+                self.__readers[me] = depth
+            else:
+                del self.__readers[me]
+                if not self.__readers:
+                    self.__condition.notify_all()
+
+    def acquire_write(self):
+        """
+        Acquire the lock for writing, waiting for all other readers and writers.
+
+        Raises:
+            RuntimeError: If this thread holds only the read lock, since
+                upgrading it would deadlock.
+        """
+        me = threading.get_ident()
+        with self.__condition:
+            if self.__writer == me:
+                self.__write_depth += 1
+                return
+            if me in self.__readers:
+                raise RuntimeError("Cannot upgrade a read lock to a write lock")
+
+            self.__waiting_writers += 1
+            try:
+                while self.__writer is not None or self.__readers:
+                    self.__condition.wait()
+            finally:
+                self.__waiting_writers -= 1
+
+            self.__writer = me
+            self.__write_depth = 1
+
+    def release_write(self):
+        """Release one level of the write lock held by this thread."""
+        with self.__condition:
+            self.__write_depth -= 1
+            if not self.__write_depth:
+                self.__writer = None
+                self.__condition.notify_all()
+
+    @contextmanager
+    def read(self):
+        """Context manager that holds the read lock."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        """Context manager that holds the write lock."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+class FileLock:
+    """
+    Advisory lock on a file, used to coordinate processes that share storage.
+
+    The lock is exclusive between processes and reentrant within a process:
+    threads of the same process take turns, and a thread may take it again
+    while it holds it.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize a FileLock.
+
+        Args:
+            path (str): Path of the lock file, created if it does not exist.
+        """
+        self.__path = path
+        self.__thread_lock = threading.RLock()
+        self.__depth = 0
+        self.__file = None
+
+    def acquire(self):
+        """Acquire the lock, waiting for other threads and processes to release it."""
+        self.__thread_lock.acquire()
+        try:
+            if not self.__depth:
+                file = open(self.__path, 'a+')
+                try:
+                    if fcntl is not None:
+                        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+                    else:
+                        file.seek(0)
+                        while True:
+                            try:
+                                msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                                break
+                            except OSError:
+                                continue  # LK_LOCK gives up after 10 seconds
+                except BaseException:
+                    file.close()
+                    raise
+                self.__file = file
+            self.__depth += 1
+        except BaseException:
+            self.__thread_lock.release()
+            raise
+
+    def release(self):
+        """Release one level of the lock held by this thread."""
+        self.__depth -= 1
+        if not self.__depth:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(self.__file.fileno(), fcntl.LOCK_UN)
+                else:
+                    self.__file.seek(0)
+                    msvcrt.locking(self.__file.fileno(), msvcrt.LK_UNLCK, 1)
+            finally:
+                self.__file.close()
+                self.__file = None
+        self.__thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
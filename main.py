@@ -1,19 +1,33 @@
+import io
+import tempfile
 import streamlit as st
-import pandas as pd
+import metrics
+import database
 from id_generator import generate_id_from_name
 from student_operations import (
     add_student, 
     update_student, 
     delete_student, 
-    list_students,
+    list_student_ids,
+    list_students_page,
+    get_students_frame_page,
+    count_students,
+    sort_students,
     get_student_by_id,
     search_students,
-    initialize
+    fuzzy_search_students,
+    get_statistics,
+    students_in_all_courses,
+    course_enrollment_counts,
+    get_version
 )
 from models.student import Student
 from models.undergraduate import Undergraduate
 from models.postgraduate import Postgraduate
 from exceptions import StudentManagementException
+from bulk_import import import_students
+from bulk_export import FORMATS as EXPORT_FORMATS, COLUMNS as EXPORT_COLUMNS, export_students
+from catalog import FIELDS_OF_STUDY, MINORS, DOMAINS
 from validation import (
     validate_student_id,
     validate_year,
@@ -25,8 +39,8 @@ def main():
     """
     Main function to run the Student Management System with Streamlit interface.
     """
-    # Initialize the database
-    initialize()
+    # Students are loaded on first access and reloaded only when the
+    # storage changes, so there is nothing to initialize per session
     
     # Set up page config
     st.set_page_config(
@@ -54,10 +68,23 @@ def main():
         "Search Students", 
         "Add Student", 
         "Update Student", 
-        "Delete Student"
+        "Delete Student",
+        "Import Students",
+        "Statistics",
+        "Course Rosters"
     ]
     choice = st.sidebar.selectbox("Choose an option", menu_options)
     
+    # Measurements are shared by every session, so the checkbox only
+    # switches them on or off when it is changed
+    show_performance = st.sidebar.checkbox(
+        "Performance",
+        value=metrics.ENABLED,
+        key="show_performance",
+        on_change=lambda: setattr(metrics, "ENABLED", st.session_state.show_performance),
+        help="Measure how long operations take and show the results in the sidebar"
+    )
+    
     # Display selected page
     if choice == "View All Students":
         display_students()
@@ -69,85 +96,465 @@ def main():
         update_student_form()
     elif choice == "Delete Student":
         delete_student_form()
+    elif choice == "Import Students":
+        import_students_form()
+    elif choice == "Statistics":
+        statistics_page()
+    elif choice == "Course Rosters":
+        course_rosters_page()
+    
+    # Shown last so it includes the operations of this run
+    if show_performance:
+        performance_panel()
+
+def performance_panel():
+    """Sidebar panel with call counts and latency percentiles of the measured operations."""
+    st.sidebar.subheader("Performance")
+    
+    operations, counters = metrics.snapshot()
+    if not operations:
+        st.sidebar.caption("No operations measured yet.")
+    else:
+        import pandas as pd
+        rows = [{
+            "Operation": name,
+            "Calls": stats["calls"],
+            "p50 ms": stats["p50_seconds"] * 1000,
+            "p95 ms": stats["p95_seconds"] * 1000,
+            "p99 ms": stats["p99_seconds"] * 1000,
+            "Max ms": stats["max_seconds"] * 1000
+        } for name, stats in operations.items()]
+        st.sidebar.dataframe(pd.DataFrame(rows), hide_index=True)
+    
+    for name, value in counters.items():
+        st.sidebar.caption(f"{name}: {value}")
+    
+    st.sidebar.download_button(
+        "Export Metrics",
+        data=metrics.format_snapshot(),
+        file_name="metrics.txt",
+        mime="text/plain"
+    )
+    if st.sidebar.button("Reset Metrics"):
+        metrics.reset()
+        st.rerun()
+
+def student_to_row(student):
+    """
+    Convert a student object to a table row.
+    
+    Args:
+        student: A Student, Undergraduate, or Postgraduate object.
+        
+    Returns:
+        dict: The column values for the student.
+    """
+    student_dict = {
+        "ID": student.get_student_id(),
+        "Name": student.get_name(),
+        "Age": student.get_age(),
+        "Course": student.get_course(),
+        "Year": student.get_year(),
+        "Field of Study": student.get_field_of_study() or "N/A",
+        "Type": "Regular Student"
+    }
+    
+    if isinstance(student, Undergraduate):
+        student_dict["Type"] = "Undergraduate"
+        student_dict["Minor"] = student.get_minor()
+    elif isinstance(student, Postgraduate):
+        student_dict["Type"] = "Postgraduate"
+        student_dict["Research Domain"] = student.get_domain() or "N/A"
+    
+    return student_dict
+
+def students_to_frame(students):
+    """
+    Build a table of students indexed by student ID.
+    
+    Args:
+        students (list): Student, Undergraduate, or Postgraduate objects.
+        
+    Returns:
+        pd.DataFrame: One row per student.
+    """
+    # Imported here so that importing this module stays fast
+    import pandas as pd
+    
+    df = pd.DataFrame([student_to_row(student) for student in students])
+    if not df.empty:
+        df = df.set_index("ID", drop=False)
+    return df
+
+# Table labels of the storage type names
+TYPE_LABELS = {
+    "student": "Regular Student",
+    "undergraduate": "Undergraduate",
+    "postgraduate": "Postgraduate"
+}
+
+def columns_to_frame(columns):
+    """
+    Build a table of students from a columnar frame, without a row per student in Python.
+    
+    Args:
+        columns (pd.DataFrame): Students with one column per storage field,
+            as returned by get_students_frame_page.
+        
+    Returns:
+        pd.DataFrame: The same table as students_to_frame.
+    """
+    import pandas as pd
+    
+    types = columns["type"].astype(object)
+    df = pd.DataFrame({
+        "ID": columns["id"],
+        "Name": columns["name"],
+        "Age": columns["age"],
+        "Course": columns["courses"].map(", ".join),
+        "Year": columns["year"],
+        "Field of Study": columns["field_of_study"].astype(object).fillna("N/A"),
+        "Type": types.map(TYPE_LABELS)
+    })
+    
+    # Like students_to_frame, these columns only appear when a student has them
+    undergraduate = types == "undergraduate"
+    if undergraduate.any():
+        df["Minor"] = columns["minor"].astype(object).where(undergraduate)
+    postgraduate = types == "postgraduate"
+    if postgraduate.any():
+        df["Research Domain"] = columns["domain"].astype(object).fillna("N/A").where(postgraduate)
+    
+    if not df.empty:
+        df = df.set_index("ID", drop=False)
+    return df
+
+# Table columns that can be sorted, mapped to database sort fields
+SORT_COLUMNS = {
+    "Insertion order": None,
+    "ID": "id",
+    "Name": "name",
+    "Age": "age",
+    "Year": "year",
+    "Field of Study": "field_of_study",
+    "Type": "type"
+}
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+# Number of closest matches that a fuzzy search can show
+FUZZY_RESULT_LIMITS = [10, 20, 50, 100]
+
+def paged_table_controls(total, key):
+    """
+    Show the sorting and paging controls for a student table.
+    
+    Args:
+        total (int): Number of students in the table.
+        key (str): Prefix for the widget keys.
+        
+    Returns:
+        tuple: (offset, limit, sort_by, descending) for the selected page.
+    """
+    sort_col, order_col, size_col, page_col = st.columns(4)
+    sort_label = sort_col.selectbox("Sort by", list(SORT_COLUMNS), key=f"{key}_sort")
+    order = order_col.selectbox("Order", ["Ascending", "Descending"], key=f"{key}_order")
+    page_size = size_col.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_page_size")
+    
+    page_count = max(1, -(-total // page_size))
+    # Keep the selected page in range when the table shrinks
+    if st.session_state.get(f"{key}_page", 1) > page_count:
+        st.session_state[f"{key}_page"] = page_count
+    page = page_col.number_input("Page", min_value=1, max_value=page_count, step=1, key=f"{key}_page")
+    
+    offset = (page - 1) * page_size
+    st.caption(f"Showing {min(offset + 1, total)}-{min(offset + page_size, total)} of {total} "
+               f"students (page {page} of {page_count})")
+    return offset, page_size, SORT_COLUMNS[sort_label], order == "Descending"
+
+def get_page_frame(offset, limit, sort_by, descending):
+    """
+    Get one page of the table of all students, cached in the session state.
+    
+    Only the students on the page are loaded and converted. The cached page
+    is reused while the database version and page settings are unchanged.
+    
+    Args:
+        offset (int): Number of students to skip.
+        limit (int): Maximum number of students on the page.
+        sort_by (str): Database sort field, or None for insertion order.
+        descending (bool): Sort in descending order.
+        
+    Returns:
+        pd.DataFrame: One row per student on the page.
+    """
+    page_key = (get_version(), offset, limit, sort_by, descending)
+    cached = st.session_state.get("students_page")
+    if cached is not None and cached[0] == page_key:
+        return cached[1]
+    
+    if database.COLUMNAR_MIRROR:
+        df = columns_to_frame(get_students_frame_page(offset, limit, sort_by, descending))
+    else:
+        df = students_to_frame(list_students_page(offset, limit, sort_by, descending))
+    st.session_state.students_page = (page_key, df)
+    return df
+
+def get_search_results(search_term, fuzzy=False, limit=None):
+    """
+    Get the search results, cached in the session state.
+    
+    Args:
+        search_term (str): The search keyword.
+        fuzzy (bool): Rank students by similarity instead of matching exactly.
+        limit (int, optional): Maximum number of fuzzy results.
+        
+    Returns:
+        list: The matching Student, Undergraduate, or Postgraduate objects,
+            or (student, similarity) tuples for a fuzzy search.
+    """
+    results_key = (get_version(), search_term, fuzzy, limit)
+    cached = st.session_state.get("search_results")
+    if cached is not None and cached[0] == results_key:
+        return cached[1]
+    
+    if fuzzy:
+        students = fuzzy_search_students(search_term, limit)
+    else:
+        students = search_students(search_term)
+    st.session_state.search_results = (results_key, students)
+    return students
 
 def display_students():
-    """Display all students in a table format."""
+    """Display all students in a paginated table."""
     st.header("All Students")
     
-    students = list_students()
-    if not students:
+    total = count_students()
+    if not total:
         st.info("No students available. Add students to see them here.")
         return
     
-    # Convert student objects to a list of dictionaries
-    student_data = []
-    for student in students:
-        student_dict = {
-            "ID": student.get_student_id(),
-            "Name": student.get_name(),
-            "Age": student.get_age(),
-            "Course": student.get_course(),
-            "Year": student.get_year(),
-            "Field of Study": student.get_field_of_study() or "N/A",
-            "Type": "Regular Student"
-        }
-        
-        if isinstance(student, Undergraduate):
-            student_dict["Type"] = "Undergraduate"
-            student_dict["Minor"] = student.get_minor()
-        elif isinstance(student, Postgraduate):
-            student_dict["Type"] = "Postgraduate"
-            student_dict["Research Domain"] = student.get_domain() or "N/A"
-        
-        student_data.append(student_dict)
+    offset, limit, sort_by, descending = paged_table_controls(total, "view")
     
     # Display the student data as a table
-    df = pd.DataFrame(student_data)
-    st.dataframe(df)
+    st.dataframe(get_page_frame(offset, limit, sort_by, descending), hide_index=True)
+    
+    export_panel()
+
+# MIME type of each export format
+EXPORT_MIME_TYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/jsonl",
+    "parquet": "application/vnd.apache.parquet"
+}
+
+def export_panel():
+    """Show the controls to download the students as CSV, JSON Lines or Parquet."""
+    with st.expander("Export"):
+        format_col, type_col, field_col = st.columns(3)
+        file_format = format_col.selectbox("Format", EXPORT_FORMATS, key="export_format")
+        types = type_col.multiselect("Types", ["student", "undergraduate", "postgraduate"], key="export_types",
+                                     help="Export every type if none are selected")
+        fields = field_col.multiselect("Fields of study", list(FIELDS_OF_STUDY), key="export_fields",
+                                       help="Export every field of study if none are selected")
+        columns = st.multiselect("Columns", EXPORT_COLUMNS, default=EXPORT_COLUMNS, key="export_columns")
+        
+        filters = {}
+        if types:
+            filters["type"] = set(types)
+        if fields:
+            filters["field_of_study"] = set(fields)
+        
+        def build_export():
+            # Called only when the button is clicked. The students are
+            # streamed into a temporary file rather than built up in memory
+            file = tempfile.TemporaryFile()
+            export_students(file, file_format, columns, filters)
+            file.seek(0)
+            return file
+        
+        st.download_button(
+            "Download",
+            data=build_export,
+            file_name=f"students.{file_format}",
+            mime=EXPORT_MIME_TYPES[file_format],
+            disabled=not columns,
+            key="export_download"
+        )
 
 def search_students_form():
     """Form to search for students."""
     st.header("Search Students")
     
     search_term = st.text_input("Enter search term (name, ID, course, or field of study)", key="search_term_input")
+    fuzzy = st.toggle("Fuzzy match", key="search_fuzzy",
+                      help="Tolerate typos and show the closest matches first")
     
     if st.button("Search"):
         if not search_term:
             st.warning("Please enter a search term")
             return
         
-        students = search_students(search_term)
-        
-        if not students:
-            st.info(f"No students found matching '{search_term}'")
-            return
+        # Keep showing the results while paging and sorting them
+        st.session_state.active_search_term = search_term
+    
+    search_term = st.session_state.get("active_search_term")
+    if not search_term:
+        return
+    
+    if fuzzy:
+        fuzzy_results_table(search_term)
+        return
+    
+    students = get_search_results(search_term)
+    
+    if not students:
+        st.info(f"No students found matching '{search_term}'")
+        return
+    
+    # Display the student data as a table
+    st.subheader(f"Search Results for '{search_term}'")
+    offset, limit, sort_by, descending = paged_table_controls(len(students), "search")
+    page = sort_students(students, sort_by, descending)[offset:offset + limit]
+    st.dataframe(students_to_frame(page), hide_index=True)
+
+def fuzzy_results_table(search_term):
+    """
+    Show the closest matches of a fuzzy search, best match first.
+    
+    Args:
+        search_term (str): The search keyword.
+    """
+    limit = st.selectbox("Top results", FUZZY_RESULT_LIMITS, index=1, key="search_fuzzy_limit")
+    matches = get_search_results(search_term, fuzzy=True, limit=limit)
+    
+    if not matches:
+        st.info(f"No students found similar to '{search_term}'")
+        return
+    
+    st.subheader(f"Closest Matches for '{search_term}'")
+    df = students_to_frame([student for student, _ in matches])
+    df.insert(0, "Match", [f"{similarity:.0%}" for _, similarity in matches])
+    st.dataframe(df, hide_index=True)
+
+# Edges of the age ranges shown in the age histogram
+AGE_BINS = [16, 18, 21, 25, 30, 40, 101]
+
+# Number of most popular courses shown in the statistics
+TOP_COURSES = 20
+
+def count_frame(counts, label):
+    """
+    Build a one-column table of counts, largest first.
+    
+    Args:
+        counts (Counter): Number of students keyed by value.
+        label (str): Name of the counted value.
         
-        # Convert student objects to a list of dictionaries
-        student_data = []
-        for student in students:
-            student_dict = {
-                "ID": student.get_student_id(),
-                "Name": student.get_name(),
-                "Age": student.get_age(),
-                "Course": student.get_course(),
-                "Year": student.get_year(),
-                "Field of Study": student.get_field_of_study() or "N/A",
-                "Type": "Regular Student"
-            }
-            
-            if isinstance(student, Undergraduate):
-                student_dict["Type"] = "Undergraduate"
-                student_dict["Minor"] = student.get_minor()
-            elif isinstance(student, Postgraduate):
-                student_dict["Type"] = "Postgraduate"
-                student_dict["Research Domain"] = student.get_domain() or "N/A"
-            
-            student_data.append(student_dict)
+    Returns:
+        pd.DataFrame: The counts indexed by value.
+    """
+    import pandas as pd
+    
+    rows = [(str(key) if key is not None else "Not specified", count) for key, count in counts.most_common()]
+    return pd.DataFrame(rows, columns=[label, "Students"]).set_index(label)
+
+def statistics_page():
+    """Show student counts by field of study, type, year, course and age."""
+    import numpy as np
+    import pandas as pd
+    
+    st.header("Statistics")
+    
+    stats = get_statistics()
+    if not stats["total"]:
+        st.info("No students available. Add students to see statistics here.")
+        return
+    
+    st.metric("Total Students", stats["total"])
+    
+    type_col, field_col = st.columns(2)
+    with type_col:
+        st.subheader("By Type")
+        st.bar_chart(count_frame(stats["type"], "Type"))
+    with field_col:
+        st.subheader("By Field of Study")
+        st.bar_chart(count_frame(stats["field_of_study"], "Field of Study"))
+    
+    # Histograms are computed from the value counts rather than one entry per student
+    age_col, year_col = st.columns(2)
+    with age_col:
+        st.subheader("Age Distribution")
+        ages = np.fromiter(stats["age"].keys(), dtype=float, count=len(stats["age"]))
+        weights = np.fromiter(stats["age"].values(), dtype=float, count=len(stats["age"]))
+        histogram, edges = np.histogram(ages, bins=AGE_BINS, weights=weights)
+        labels = [f"{int(low)}-{int(high) - 1}" for low, high in zip(edges[:-1], edges[1:])]
+        st.bar_chart(pd.DataFrame({"Students": histogram.astype(int)}, index=pd.Index(labels, name="Age")))
+        st.caption(f"Mean age {np.average(ages, weights=weights):.1f}")
+    with year_col:
+        st.subheader("By Year of Study")
+        years = np.fromiter(stats["year"].keys(), dtype=int, count=len(stats["year"]))
+        weights = np.fromiter(stats["year"].values(), dtype=int, count=len(stats["year"]))
+        per_year = np.bincount(years, weights=weights)[1:].astype(int)
+        st.bar_chart(pd.DataFrame({"Students": per_year},
+                                  index=pd.Index(range(1, len(per_year) + 1), name="Year")))
+    
+    st.subheader(f"Top {TOP_COURSES} Courses")
+    courses = count_frame(stats["course"], "Course")
+    st.bar_chart(courses.head(TOP_COURSES))
+    st.caption(f"{len(courses)} distinct courses")
+
+def get_course_roster(courses):
+    """
+    Get the students enrolled in every selected course, cached in the session state.
+    
+    Args:
+        courses (list): The selected course names.
         
-        # Display the student data as a table
-        st.subheader(f"Search Results for '{search_term}'")
-        df = pd.DataFrame(student_data)
-        st.dataframe(df)
+    Returns:
+        list: The enrolled Student, Undergraduate, or Postgraduate objects.
+    """
+    roster_key = (get_version(), tuple(courses))
+    cached = st.session_state.get("course_roster")
+    if cached is not None and cached[0] == roster_key:
+        return cached[1]
+    
+    students = students_in_all_courses(courses)
+    st.session_state.course_roster = (roster_key, students)
+    return students
+
+def course_rosters_page():
+    """Show the students enrolled in one or more courses and the enrollment of every course."""
+    from collections import Counter
+    
+    st.header("Course Rosters")
+    
+    counts = Counter(course_enrollment_counts())
+    if not counts:
+        st.info("No students available. Add students to see course rosters here.")
+        return
+    
+    # Most popular courses first, labelled with their enrollment
+    courses = [course for course, _ in counts.most_common()]
+    selected = st.multiselect(
+        "Courses",
+        options=courses,
+        format_func=lambda course: f"{course} ({counts[course]})",
+        key="roster_courses",
+        help="Select several courses to list the students enrolled in all of them"
+    )
+    
+    if selected:
+        students = get_course_roster(selected)
+        if not students:
+            st.info("No students are enrolled in all the selected courses")
+        else:
+            offset, limit, sort_by, descending = paged_table_controls(len(students), "roster")
+            page = sort_students(students, sort_by, descending)[offset:offset + limit]
+            st.dataframe(students_to_frame(page), hide_index=True)
+    
+    st.subheader("Enrollment by Course")
+    st.dataframe(count_frame(counts, "Course"))
 
 def add_student_form():
     """Form to add a new student."""
@@ -163,17 +570,7 @@ def add_student_form():
         year = st.number_input("Year of Study", min_value=1, max_value=7, step=1, key="add_year")
         
         # Field of Study fields for all students
-        field_of_study_options = {
-            "Software Engineering": ["Programming", "Data Structures", "Algorithms", "Software Design", "Web Development"],
-            "Data Science": ["Statistics", "Machine Learning", "Data Mining", "Big Data", "Neural Networks"],
-            "Civil Engineering": ["Mechanics", "Structures", "Materials", "Hydraulics", "Surveying"],
-            "Mechanical Engineering": ["Thermodynamics", "Fluid Dynamics", "Machine Design", "Control Systems", "Manufacturing"],
-            "Business": ["Accounting", "Marketing", "Finance", "Management", "Economics", "Business Ethics"],
-            "Arts": ["Fine Arts", "Music", "Theater", "Literature", "Philosophy", "History"],
-            "Sciences": ["Physics", "Chemistry", "Biology", "Mathematics", "Astronomy", "Geology"],
-            "Medicine": ["Anatomy", "Physiology", "Pathology", "Pharmacology", "Microbiology", "Immunology"],
-            "Law": ["Constitutional Law", "Criminal Law", "Civil Law", "International Law", "Corporate Law", "Human Rights Law"]
-        }
+        field_of_study_options = FIELDS_OF_STUDY
         
         field_of_study = st.selectbox("Field of Study", list(field_of_study_options.keys()), key="add_field")
         
@@ -194,13 +591,7 @@ def add_student_form():
         # Student type specific fields
         if student_type == "Undergraduate":
             # Minor options based on field of study
-            minor_options = [
-                "Mathematics", "Business", "Electronics", "Psychology", "Communication",
-                "Business Management", "Computer Science", "Renewable Energy", "Physics",
-                "Foreign Language", "Law", "Data Analytics", "Digital Media", "Education",
-                "Environmental Studies", "Public Health", "Ethics", "Nutrition", "Management",
-                "International Relations", "Political Science", "Economics", "Philosophy"
-            ]
+            minor_options = MINORS
             
             # Show minor options
             minor = st.selectbox("Minor Subject", [""] + minor_options, key="add_minor")
@@ -209,15 +600,7 @@ def add_student_form():
             domain = ""
         else:  # Postgraduate
             # Research domains based on field of study
-            domain_options = [
-                "Artificial Intelligence", "Machine Learning", "Computer Vision", 
-                "Natural Language Processing", "Cybersecurity", "Networks", 
-                "Human-Computer Interaction", "Robotics", "Materials Science", 
-                "Structural Engineering", "Energy Systems", "Control Systems", 
-                "Biomedical Engineering", "Nanotechnology", "Finance", 
-                "Marketing Analytics", "Operations Management", "Leadership", 
-                "Business Analytics", "Entrepreneurship", "Supply Chain Management"
-            ]
+            domain_options = DOMAINS
             
             domain = st.selectbox("Research Domain", domain_options, key="add_domain_dropdown")
                 
@@ -264,14 +647,12 @@ def update_student_form():
     """Form to update an existing student."""
     st.header("Update Student")
     
-    # Get all student IDs
-    students = list_students()
-    if not students:
+    # Get all student IDs without building the students
+    student_ids = list_student_ids()
+    if not student_ids:
         st.info("No students available to update.")
         return
     
-    student_ids = [student.get_student_id() for student in students]
-    
     # Select student to update
     selected_id = st.selectbox("Select Student ID to Update", student_ids, key="update_select_id")
     
@@ -296,17 +677,7 @@ def update_student_form():
             st.info(f"Field of Study: {current_field} (cannot be changed)")
             
             # Field of Study dictionary for course options
-            field_of_study_options = {
-                "Software Engineering": ["Programming", "Data Structures", "Algorithms", "Software Design", "Web Development"],
-                "Data Science": ["Statistics", "Machine Learning", "Data Mining", "Big Data", "Neural Networks"],
-                "Civil Engineering": ["Mechanics", "Structures", "Materials", "Hydraulics", "Surveying"],
-                "Mechanical Engineering": ["Thermodynamics", "Fluid Dynamics", "Machine Design", "Control Systems", "Manufacturing"],
-                "Business": ["Accounting", "Marketing", "Finance", "Management", "Economics", "Business Ethics"],
-                "Arts": ["Fine Arts", "Music", "Theater", "Literature", "Philosophy", "History"],
-                "Sciences": ["Physics", "Chemistry", "Biology", "Mathematics", "Astronomy", "Geology"],
-                "Medicine": ["Anatomy", "Physiology", "Pathology", "Pharmacology", "Microbiology", "Immunology"],
-                "Law": ["Constitutional Law", "Criminal Law", "Civil Law", "International Law", "Corporate Law", "Human Rights Law"]
-            }
+            field_of_study_options = FIELDS_OF_STUDY
             
             # Current courses as a list
             current_courses = []
@@ -358,13 +729,7 @@ def update_student_form():
             # Student type specific fields
             if student_type == "Undergraduate":
                 # Minor options based on field of study
-                minor_options = [
-                    "Mathematics", "Business", "Electronics", "Psychology", "Communication",
-                    "Business Management", "Computer Science", "Renewable Energy", "Physics",
-                    "Foreign Language", "Law", "Data Analytics", "Digital Media", "Education",
-                    "Environmental Studies", "Public Health", "Ethics", "Nutrition", "Management",
-                    "International Relations", "Political Science", "Economics", "Philosophy"
-                ]
+                minor_options = MINORS
                 
                 # Get current minor if available
                 current_minor = ""
@@ -382,15 +747,7 @@ def update_student_form():
                 domain = ""
             elif student_type == "Postgraduate":
                 # Research domains based on field of study
-                domain_options = [
-                    "Artificial Intelligence", "Machine Learning", "Computer Vision", 
-                    "Natural Language Processing", "Cybersecurity", "Networks", 
-                    "Human-Computer Interaction", "Robotics", "Materials Science", 
-                    "Structural Engineering", "Energy Systems", "Control Systems", 
-                    "Biomedical Engineering", "Nanotechnology", "Finance", 
-                    "Marketing Analytics", "Operations Management", "Leadership", 
-                    "Business Analytics", "Entrepreneurship", "Supply Chain Management"
-                ]
+                domain_options = DOMAINS
                 
                 # Get current domain if available
                 current_domain = "" if not isinstance(selected_student, Postgraduate) else selected_student.get_domain() or ""
@@ -449,14 +806,12 @@ def delete_student_form():
     """Form to delete a student."""
     st.header("Delete Student")
     
-    # Get all student IDs
-    students = list_students()
-    if not students:
+    # Get all student IDs without building the students
+    student_ids = list_student_ids()
+    if not student_ids:
         st.info("No students available to delete.")
         return
     
-    student_ids = [student.get_student_id() for student in students]
-    
     # Select student to delete
     selected_id = st.selectbox("Select Student ID to Delete", student_ids, key="delete_select_id")
     
@@ -469,5 +824,36 @@ def delete_student_form():
             st.session_state.error_message = str(e)
             st.rerun()
 
+def import_students_form():
+    """Form to import students in bulk from a CSV or JSON file."""
+    st.header("Import Students")
+    
+    st.write("Upload a CSV file with a header row or a JSON list of students. "
+             "Columns: id (optional), name, age, courses, year, field_of_study, "
+             "type (student, undergraduate or postgraduate), minor, domain.")
+    
+    uploaded_file = st.file_uploader("Choose a file", type=["csv", "json"], key="import_file")
+    dry_run = st.checkbox("Only validate, don't add students", key="import_dry_run")
+    
+    if uploaded_file is not None and st.button("Import"):
+        file_format = uploaded_file.name.rsplit(".", 1)[-1].lower()
+        
+        try:
+            with io.TextIOWrapper(uploaded_file, encoding="utf-8-sig", newline="") as file:
+                added, errors = import_students(file, file_format, dry_run)
+        except StudentManagementException as e:
+            st.error(str(e))
+            return
+        
+        if dry_run:
+            st.info(f"{len(added)} students are valid and would be added.")
+        else:
+            st.success(f"Imported {len(added)} students.")
+        
+        if errors:
+            st.warning(f"{len(errors)} rows were rejected.")
+            import pandas as pd
+            st.dataframe(pd.DataFrame(errors, columns=["Row", "Error"]))
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
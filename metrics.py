@@ -0,0 +1,157 @@
+"""
+Metrics Module
+Collects call counts and latencies of the hot paths for performance monitoring.
+"""
+
+import time
+import threading
+import functools
+from collections import deque
+
+# Whether measurements are recorded. When disabled, instrumented functions
+# only pay for checking this flag.
+ENABLED = False
+
+# Number of recent durations kept per operation for computing percentiles
+MAX_SAMPLES = 1000
+
+# Percentiles reported for each operation
+PERCENTILES = (0.5, 0.95, 0.99)
+
+_lock = threading.Lock()
+
+# Recent durations in seconds, keyed by operation name
+_samples = {}
+
+# Number of calls and total seconds since the last reset, keyed by operation name
+_calls = {}
+_total_seconds = {}
+
+# Event counters keyed by name
+_counters = {}
+
+def record(name, seconds):
+    """
+    Record one call of an operation.
+
+    Args:
+        name (str): Name of the operation.
+        seconds (float): How long the call took.
+    """
+    with _lock:
+        samples = _samples.get(name)
+        if samples is None:
+            samples = _samples[name] = deque(maxlen=MAX_SAMPLES)
+        samples.append(seconds)
+        _calls[name] = _calls.get(name, 0) + 1
+        _total_seconds[name] = _total_seconds.get(name, 0.0) + seconds
+
+def increment(name, amount=1):
+    """
+    Increase an event counter, if metrics are enabled.
+
+    Args:
+        name (str): Name of the counter.
+        amount (int): Amount to add.
+    """
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+def timed(name):
+    """
+    Decorator that records the latency of every call while metrics are enabled.
+
+    Calls that raise an exception are recorded too.
+
+    Args:
+        name (str): Name of the operation.
+
+    Returns:
+        callable: The decorator.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def _percentile(sorted_values, fraction):
+    """Get a percentile of sorted values using the nearest rank."""
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+def snapshot():
+    """
+    Get the current measurements.
+
+    Returns:
+        tuple: (operations, counters), where operations maps each operation
+            name to a dictionary with "calls", "total_seconds", "mean_seconds",
+            "max_seconds" and one "p50_seconds"-style entry per percentile, and
+            counters maps each counter name to its value. Percentiles and the
+            maximum cover the last MAX_SAMPLES calls.
+    """
+    with _lock:
+        samples = {name: sorted(values) for name, values in _samples.items()}
+        calls = dict(_calls)
+        total_seconds = dict(_total_seconds)
+        counters = dict(_counters)
+
+    operations = {}
+    for name in sorted(samples):
+        values = samples[name]
+        stats = {
+            "calls": calls[name],
+            "total_seconds": total_seconds[name],
+            "mean_seconds": total_seconds[name] / calls[name],
+            "max_seconds": values[-1]
+        }
+        for fraction in PERCENTILES:
+            stats[f"p{fraction * 100:g}_seconds"] = _percentile(values, fraction)
+        operations[name] = stats
+
+    return operations, dict(sorted(counters.items()))
+
+def format_snapshot():
+    """
+    Format the current measurements as text in the Prometheus exposition format.
+
+    Returns:
+        str: One line per value, ready to be saved or scraped.
+    """
+    operations, counters = snapshot()
+    lines = [
+        "# HELP sms_operation_seconds Latency of student management operations.",
+        "# TYPE sms_operation_seconds summary"
+    ]
+
+    for name, stats in operations.items():
+        for fraction in PERCENTILES:
+            value = stats[f"p{fraction * 100:g}_seconds"]
+            lines.append(f'sms_operation_seconds{{operation="{name}",quantile="{fraction:g}"}} {value:.9f}')
+        lines.append(f'sms_operation_seconds_sum{{operation="{name}"}} {stats["total_seconds"]:.9f}')
+        lines.append(f'sms_operation_seconds_count{{operation="{name}"}} {stats["calls"]}')
+
+    if counters:
+        lines.append("# HELP sms_events_total Number of notable events, such as reloads from storage.")
+        lines.append("# TYPE sms_events_total counter")
+        for name, value in counters.items():
+            lines.append(f'sms_events_total{{event="{name}"}} {value}')
+
+    return "\n".join(lines) + "\n"
+
+def reset():
+    """Discard all measurements."""
+    with _lock:
+        _samples.clear()
+        _calls.clear()
+        _total_seconds.clear()
+        _counters.clear()
@@ -0,0 +1,280 @@
+"""
+Memory-Mapped Roster Module
+Read-only roster file that is memory-mapped and read record by record.
+
+Looking up a student or reading a page only touches the bytes of those
+students, so opening a large roster costs nothing up front, and every
+process opening the same file shares its pages through the OS page cache
+instead of keeping a private copy of the students.
+
+File layout (little-endian):
+    header      magic b"SMSR", schema version (uint16), student count (uint32),
+                ID width in bytes (uint32), and the byte offsets of the
+                position table, ID index and records (uint64 each)
+    positions   one entry per student in insertion order: record offset
+                (uint64), record length (uint32) and ID index slot (uint32)
+    ID index    one entry per student sorted by ID: the UTF-8 ID padded
+                with zero bytes to the ID width, and its position (uint32)
+    records     one compact JSON line per student in storage format
+
+Usage: python mmap_roster.py <students.json> <students.roster>
+       python mmap_roster.py <students.roster> <students.json>
+"""
+
+import sys
+import json
+import mmap
+import struct
+from collections.abc import Mapping, ValuesView, ItemsView
+from serialization import student_to_dict, dict_to_record, record_to_dict
+
+MAGIC = b"SMSR"
+SCHEMA_VERSION = 1
+
+HEADER = struct.Struct("<4sHIIQQQ")
+POSITION = struct.Struct("<QII")
+SLOT = struct.Struct("<I")
+
+def dump(students, file):
+    """
+    Write students as a roster.
+
+    Args:
+        students (list): Student, Undergraduate, and Postgraduate objects or
+            StudentRecord tuples, in insertion order.
+        file: A file open for writing in binary mode.
+    """
+    lines = []
+    ids = []
+    for student in students:
+        data = student_to_dict(student)
+        lines.append(json.dumps(data, separators=(",", ":")).encode("utf-8") + b"\n")
+        ids.append(data["id"].encode("utf-8"))
+
+    count = len(lines)
+    id_width = max(map(len, ids), default=0)
+    ids = [student_id.ljust(id_width, b"\0") for student_id in ids]
+    order = sorted(range(count), key=ids.__getitem__)
+    slots = [0] * count
+    for slot, position in enumerate(order):
+        slots[position] = slot
+
+    positions_offset = HEADER.size
+    index_offset = positions_offset + count * POSITION.size
+    records_offset = index_offset + count * (id_width + SLOT.size)
+
+    file.write(HEADER.pack(MAGIC, SCHEMA_VERSION, count, id_width, positions_offset, index_offset, records_offset))
+
+    offset = records_offset
+    positions = bytearray()
+    for line, slot in zip(lines, slots):
+        positions += POSITION.pack(offset, len(line), slot)
+        offset += len(line)
+    file.write(positions)
+
+    index = bytearray()
+    for position in order:
+        index += ids[position] + SLOT.pack(position)
+    file.write(index)
+
+    file.write(b"".join(lines))
+
+class _RosterValues(ValuesView):
+    """Records of a roster in insertion order, read sequentially."""
+
+    def __iter__(self):
+        return self._mapping.iter_records()
+
+class _RosterItems(ItemsView):
+    """(ID, record) pairs of a roster in insertion order, read sequentially."""
+
+    def __iter__(self):
+        return ((record.id, record) for record in self._mapping.iter_records())
+
+class Roster(Mapping):
+    """
+    Read-only mapping of student IDs to StudentRecord tuples backed by a
+    memory-mapped roster file.
+
+    Iteration follows the insertion order. Records are parsed on every
+    access and not kept, so repeated lookups of the same student parse it again.
+    """
+
+    def __init__(self, path):
+        """
+        Open a roster file.
+
+        Args:
+            path (str): Path of the roster file.
+
+        Raises:
+            OSError: If the file cannot be opened.
+            ValueError: If the file is not a roster of a supported version.
+        """
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._map) < HEADER.size:
+            raise ValueError("Not a student roster file")
+        (magic, version, self._count, self._id_width,
+         self._positions_offset, self._index_offset, self._records_offset) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a student roster file")
+        if version != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported roster version: {version}")
+
+        self._entry_size = self._id_width + SLOT.size
+
+    def _find(self, student_id):
+        """Binary search the ID index, returning the student's position or None."""
+        if not isinstance(student_id, str):
+            return None
+        key = student_id.encode("utf-8")
+        if len(key) > self._id_width:
+            return None
+        key = key.ljust(self._id_width, b"\0")
+
+        data = self._map
+        width = self._id_width
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            start = self._index_offset + middle * self._entry_size
+            entry_id = data[start:start + width]
+            if entry_id < key:
+                low = middle + 1
+            elif entry_id > key:
+                high = middle
+            else:
+                return SLOT.unpack_from(data, start + width)[0]
+        return None
+
+    def _record_at(self, position):
+        """Parse the record at a position in insertion order."""
+        offset, length, _ = POSITION.unpack_from(self._map, self._positions_offset + position * POSITION.size)
+        return dict_to_record(json.loads(self._map[offset:offset + length]))
+
+    def _id_at(self, position):
+        """Read the ID at a position in insertion order from the ID index, without parsing the record."""
+        _, _, slot = POSITION.unpack_from(self._map, self._positions_offset + position * POSITION.size)
+        start = self._index_offset + slot * self._entry_size
+        return self._map[start:start + self._id_width].rstrip(b"\0").decode("utf-8")
+
+    def __getitem__(self, student_id):
+        position = self._find(student_id)
+        if position is None:
+            raise KeyError(student_id)
+        return self._record_at(position)
+
+    def __contains__(self, student_id):
+        return self._find(student_id) is not None
+
+    def __iter__(self):
+        return map(self._id_at, range(self._count))
+
+    def __len__(self):
+        return self._count
+
+    def values(self):
+        return _RosterValues(self)
+
+    def items(self):
+        return _RosterItems(self)
+
+    def iter_records(self):
+        """
+        Read every record in insertion order.
+
+        Yields:
+            StudentRecord: Each student's record.
+        """
+        data = self._map
+        positions = data[self._positions_offset:self._positions_offset + self._count * POSITION.size]
+        for offset, length, _ in POSITION.iter_unpack(positions):
+            yield dict_to_record(json.loads(data[offset:offset + length]))
+
+    def page(self, offset, limit, descending=False):
+        """
+        Read one page of records in insertion order.
+
+        Args:
+            offset (int): Number of records to skip.
+            limit (int): Maximum number of records to return.
+            descending (bool): Page through the records from the last one.
+
+        Returns:
+            list: StudentRecord tuples on the page.
+        """
+        if descending:
+            end = max(self._count - offset, 0)
+            positions = range(end - 1, max(end - limit, 0) - 1, -1)
+        else:
+            positions = range(offset, min(offset + limit, self._count))
+        return [self._record_at(position) for position in positions]
+
+    def close(self):
+        """Unmap the file. The roster cannot be read afterwards."""
+        self._map.close()
+
+def load_records(path):
+    """
+    Read every record of a roster file.
+
+    Args:
+        path (str): Path of the roster file.
+
+    Returns:
+        list: StudentRecord tuples in insertion order.
+    """
+    roster = Roster(path)
+    try:
+        return list(roster.iter_records())
+    finally:
+        roster.close()
+
+def json_to_roster(json_path, path):
+    """
+    Convert a JSON storage file to a roster file.
+
+    Args:
+        json_path (str): Path of the JSON storage file.
+        path (str): Path of the roster file to write.
+
+    Returns:
+        int: The number of students converted.
+    """
+    with open(json_path, 'r') as file:
+        records = [dict_to_record(data) for data in json.load(file)]
+
+    with open(path, 'wb') as file:
+        dump(records, file)
+    return len(records)
+
+def roster_to_json(path, json_path):
+    """
+    Convert a roster file to a JSON storage file.
+
+    Args:
+        path (str): Path of the roster file.
+        json_path (str): Path of the JSON storage file to write.
+
+    Returns:
+        int: The number of students converted.
+    """
+    records = load_records(path)
+
+    with open(json_path, 'w') as file:
+        json.dump([record_to_dict(record) for record in records], file, indent=4)
+    return len(records)
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1].endswith(".json"):
+        count = json_to_roster(sys.argv[1], sys.argv[2])
+    elif len(sys.argv) == 3 and sys.argv[2].endswith(".json"):
+        count = roster_to_json(sys.argv[1], sys.argv[2])
+    else:
+        print("Usage: python mmap_roster.py <students.json> <students.roster>")
+        print("       python mmap_roster.py <students.roster> <students.json>")
+        sys.exit(1)
+
+    print(f"Converted {count} students to {sys.argv[2]}")
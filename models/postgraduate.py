@@ -11,6 +11,10 @@ class Postgraduate(Student):
     functionality specific to postgraduate students.
     """
     
+    __slots__ = ("__domain",)
+    
+    FIELDS = Student.FIELDS + ("domain",)
+    
     def __init__(self, student_id, name, age, course, year, graduation_year=0, domain=None, department=None):
         """
         Initialize a Postgraduate object.
@@ -48,7 +52,10 @@ class Postgraduate(Student):
         Args:
             domain (str): The new research domain
         """
-        self.__domain = domain
+        if domain != self.__domain:
+            self._remember_old_values()
+            self.__domain = domain
+            self.mark_dirty("domain")
     
     def get_details(self):
         """
@@ -72,7 +79,7 @@ class Postgraduate(Student):
         Args:
             new_domain (str): The new research domain
         """
-        self.__domain = new_domain
+        self.set_domain(new_domain)
         
     # For compatibility with older code
     def get_graduation_year(self):
@@ -3,12 +3,49 @@ Student Module
 Defines the base Student class with encapsulation.
 """
 
+import sys
+
+def _parse_courses(course):
+    """
+    Convert a course string or list into a tuple of interned course names.
+
+    Args:
+        course (str or list): A single course, a comma-separated string of
+            courses, or a list of courses
+
+    Returns:
+        tuple: The course names
+    """
+    if isinstance(course, str):
+        if ',' in course:
+            courses = [c.strip() for c in course.split(',')]
+        else:
+            courses = [course]
+    else:
+        courses = course or []
+
+    # Course names repeat across students, so share a single copy of each
+    return tuple(sys.intern(c) if type(c) is str else c for c in courses)
+
 class Student:
     """
     Student class that demonstrates encapsulation by using private attributes
     with getter and setter methods.
+    
+    Attributes are declared in __slots__ so each student is stored without a
+    per-object __dict__, and courses are kept as a tuple of interned strings.
+    
+    Setters record which fields changed since the student was last saved,
+    so storage can skip students that did not change and write only the
+    changed fields of those that did.
     """
     
+    __slots__ = ("__student_id", "__name", "__age", "__courses", "__year", "__field_of_study",
+                 "__dirty", "__edits", "__old_values")
+    
+    # Names of the stored fields, as used in the storage format
+    FIELDS = ("name", "age", "courses", "year", "field_of_study")
+    
     def __init__(self, student_id, name, age, course, year, department=None):
         """
         Initialize a Student object.
@@ -25,17 +62,20 @@ class Student:
         self.__name = name
         self.__age = age
         
-        # Convert single course to list if needed
-        if isinstance(course, str):
-            if ',' in course:
-                self.__courses = [c.strip() for c in course.split(',')]
-            else:
-                self.__courses = [course]
-        else:
-            self.__courses = course or []
+        # Convert single course or list of courses to a tuple
+        self.__courses = _parse_courses(course)
             
         self.__year = year
         self.__field_of_study = None  # Field of study replacing department
+        
+        # A new student has never been saved, so the whole record is dirty
+        self.__dirty = self.FIELDS
+        self.__edits = 0
+        
+        # Values before the changes not yet applied to the database, as a
+        # StudentRecord. None while no changes are waiting, and False until
+        # the database stores the student, so detached copies record nothing.
+        self.__old_values = False
     
     # Getter methods
     def get_student_id(self):
@@ -52,7 +92,7 @@ class Student:
     
     def get_courses(self):
         """Get the student's courses as a list."""
-        return self.__courses
+        return list(self.__courses)
     
     def get_course(self):
         """
@@ -73,6 +113,85 @@ class Student:
         """Get the student's field of study."""
         return self.__field_of_study
     
+    # Change tracking methods
+    def is_dirty(self):
+        """Check whether the student changed since it was last saved."""
+        return self.__dirty is not None
+    
+    def get_dirty_fields(self):
+        """
+        Get the fields changed since the student was last saved.
+        
+        Returns:
+            frozenset: Names of the changed fields, as listed in FIELDS
+        """
+        return frozenset(self.__dirty or ())
+    
+    def get_edit_count(self):
+        """
+        Get the number of changes made to the student so far.
+        
+        Storage reads it before saving the student, to tell whether the
+        student changed again while it was being saved.
+        
+        Returns:
+            int: A count that grows with every change
+        """
+        return self.__edits
+    
+    def mark_dirty(self, *fields):
+        """
+        Record that fields changed since the student was last saved.
+        
+        Args:
+            *fields (str): Names of the changed fields, as listed in FIELDS.
+                With no names, the whole record is marked as changed.
+        """
+        self.__edits += 1
+        dirty = self.__dirty
+        if not fields:
+            self.__dirty = self.FIELDS
+        elif dirty is None:
+            self.__dirty = set(fields)
+        elif type(dirty) is set:
+            dirty.update(fields)
+        # Otherwise the whole record is already dirty
+    
+    def take_old_values(self):
+        """
+        Get the values the student had before it was changed, and start
+        recording changes afresh.
+        
+        The database calls this whenever it stores the student, so that
+        its indexes can remove the values they hold before adding the new ones.
+        
+        Returns:
+            StudentRecord: The earlier values, or None if the student did not
+            change since it was last stored
+        """
+        old_values = self.__old_values
+        self.__old_values = None
+        return old_values or None
+    
+    def _remember_old_values(self):
+        """Keep the current values before the first change not yet applied to the database."""
+        if self.__old_values is None:
+            # Imported here since serialization imports this module
+            from serialization import student_to_record
+            self.__old_values = student_to_record(self)
+    
+    def mark_clean(self, edit_count=None):
+        """
+        Record that the student was saved and has no unsaved changes.
+        
+        Args:
+            edit_count (int, optional): The edit count read before the student
+                was saved. If the student changed since, it stays dirty, as
+                the save may not include the newer changes.
+        """
+        if edit_count is None or edit_count == self.__edits:
+            self.__dirty = None
+    
     # Setter methods
     def set_student_id(self, student_id):
         """
@@ -81,7 +200,10 @@ class Student:
         Args:
             student_id (str): The new student ID
         """
-        self.__student_id = student_id
+        if student_id != self.__student_id:
+            self._remember_old_values()
+            self.__student_id = student_id
+            self.mark_dirty()
     
     def set_name(self, name):
         """
@@ -90,7 +212,10 @@ class Student:
         Args:
             name (str): The new name
         """
-        self.__name = name
+        if name != self.__name:
+            self._remember_old_values()
+            self.__name = name
+            self.mark_dirty("name")
     
     def set_age(self, age):
         """
@@ -99,7 +224,17 @@ class Student:
         Args:
             age (int): The new age
         """
-        self.__age = age
+        if age != self.__age:
+            self._remember_old_values()
+            self.__age = age
+            self.mark_dirty("age")
+    
+    def _replace_courses(self, courses):
+        """Replace the course tuple, recording the change if it differs."""
+        if courses != self.__courses:
+            self._remember_old_values()
+            self.__courses = courses
+            self.mark_dirty("courses")
     
     def set_courses(self, courses):
         """
@@ -108,13 +243,7 @@ class Student:
         Args:
             courses (list): The new courses
         """
-        if isinstance(courses, str):
-            if ',' in courses:
-                self.__courses = [c.strip() for c in courses.split(',')]
-            else:
-                self.__courses = [courses]
-        else:
-            self.__courses = courses or []
+        self._replace_courses(_parse_courses(courses))
     
     def set_course(self, course):
         """
@@ -124,10 +253,7 @@ class Student:
         Args:
             course (str): The new course
         """
-        if ',' in course:
-            self.__courses = [c.strip() for c in course.split(',')]
-        else:
-            self.__courses = [course] if course else []
+        self._replace_courses(_parse_courses(course) if course else ())
         
     def set_year(self, year):
         """
@@ -136,7 +262,10 @@ class Student:
         Args:
             year (int): The new year of study
         """
-        self.__year = year
+        if year != self.__year:
+            self._remember_old_values()
+            self.__year = year
+            self.mark_dirty("year")
         
     def set_department(self, department):
         """
@@ -154,7 +283,10 @@ class Student:
         Args:
             field (str): The new field of study
         """
-        self.__field_of_study = field
+        if field != self.__field_of_study:
+            self._remember_old_values()
+            self.__field_of_study = field
+            self.mark_dirty("field_of_study")
     
     def get_details(self):
         """
@@ -181,7 +313,7 @@ class Student:
             new_course (str): The course to add
         """
         if new_course and new_course not in self.__courses:
-            self.__courses.append(new_course)
+            self._replace_courses(self.__courses + (sys.intern(new_course),))
     
     def remove_course(self, course):
         """
@@ -191,7 +323,8 @@ class Student:
             course (str): The course to remove
         """
         if course in self.__courses and len(self.__courses) > 1:  # Don't remove the last course
-            self.__courses.remove(course)
+            index = self.__courses.index(course)
+            self._replace_courses(self.__courses[:index] + self.__courses[index + 1:])
     
     def update_courses(self, new_courses):
         """
@@ -209,4 +342,4 @@ class Student:
         Args:
             new_year (int): The new year of study
         """
-        self.__year = new_year
+        self.set_year(new_year)
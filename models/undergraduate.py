@@ -11,6 +11,10 @@ class Undergraduate(Student):
     functionality specific to undergraduate students.
     """
     
+    __slots__ = ("__minor",)
+    
+    FIELDS = Student.FIELDS + ("minor",)
+    
     def __init__(self, student_id, name, age, course, year, minor, department=None):
         """
         Initialize an Undergraduate object.
@@ -43,7 +47,10 @@ class Undergraduate(Student):
         Args:
             minor (str): The minor subject
         """
-        self.__minor = minor
+        if minor != self.__minor:
+            self._remember_old_values()
+            self.__minor = minor
+            self.mark_dirty("minor")
     
     def get_details(self):
         """
@@ -68,7 +75,7 @@ class Undergraduate(Student):
         Args:
             new_minor (str): The new minor subject
         """
-        self.__minor = new_minor
+        self.set_minor(new_minor)
         
     def has_minor(self):
         """
@@ -0,0 +1,182 @@
+"""
+Persistence Module
+Groups changes to student records and saves them from a background thread.
+"""
+
+import time
+import atexit
+import threading
+from exceptions import StorageException
+
+# Seconds to collect further changes before saving them together.
+# With 0, every change is saved immediately on the calling thread.
+FLUSH_WINDOW_SECONDS = 0.0
+
+_condition = threading.Condition()
+
+# Changes waiting to be saved, as passed to storage.save_changes
+_pending = []
+
+# Changes currently being saved, which are not on disk yet either
+_in_flight = []
+
+# Saves a batch of changes, as passed to the last record_changes call
+_save = None
+
+# Number of changes queued and saved so far, used by flush() to tell when
+# the changes it waits for are on disk
+_queued_count = 0
+_saved_count = 0
+
+# Error raised by the last failed save and the number of failed saves so far
+_last_error = None
+_failure_count = 0
+
+_flush_requested = False
+_worker = None
+
+def record_changes(changes, save):
+    """
+    Save changes to student records, either now or in the next group commit.
+
+    Changes are saved in the order they are recorded, so they are only
+    saved immediately when no earlier changes are still waiting.
+
+    Args:
+        changes (list): (operation, student_id, student) tuples, where operation
+            is "add", "update" or "delete" and student is None for deletes.
+        save (callable): Saves a list of changes to storage.
+
+    Raises:
+        StorageException: If the changes are saved immediately and saving fails.
+    """
+    global _save, _queued_count, _in_flight
+
+    with _condition:
+        immediate = FLUSH_WINDOW_SECONDS <= 0 and not _pending and not _in_flight
+        if immediate:
+            _in_flight = changes
+        else:
+            _pending.extend(changes)
+            _save = save
+            _queued_count += len(changes)
+            _start_worker()
+            _condition.notify_all()
+
+    if immediate:
+        try:
+            save(changes)
+        finally:
+            with _condition:
+                _in_flight = []
+
+def flush(timeout=None):
+    """
+    Wait until every change recorded so far has been saved.
+
+    Args:
+        timeout (float, optional): Maximum number of seconds to wait.
+
+    Raises:
+        StorageException: If saving the changes failed or timed out.
+    """
+    global _flush_requested
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    with _condition:
+        target = _queued_count
+        failures = _failure_count
+        while _saved_count < target:
+            if _failure_count > failures:
+                raise StorageException(f"Error saving student data: {str(_last_error)}")
+
+            _flush_requested = True
+            _condition.notify_all()
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise StorageException("Timed out waiting for student data to be saved")
+            _condition.wait(remaining)
+
+def pending_count():
+    """
+    Get the number of changes waiting to be saved.
+
+    Returns:
+        int: The number of unsaved changes.
+    """
+    with _condition:
+        return len(_pending)
+
+def unsaved_changes():
+    """
+    Get the changes that have been recorded but are not saved yet.
+
+    Used to re-apply them after the students are reloaded from storage.
+
+    Returns:
+        list: (operation, student_id, student) tuples in the order they were recorded.
+    """
+    with _condition:
+        return _in_flight + _pending
+
+def _start_worker():
+    """Start the background thread if it is not running. Must hold _condition."""
+    global _worker
+
+    if _worker is None or not _worker.is_alive():
+        _worker = threading.Thread(target=_run_worker, name="student-persistence", daemon=True)
+        _worker.start()
+
+def _run_worker():
+    """Save pending changes in batches, one batch per flush window."""
+    global _pending, _in_flight, _saved_count, _last_error, _failure_count, _flush_requested
+
+    while True:
+        with _condition:
+            while not _pending:
+                _condition.wait()
+
+            # Give further changes the rest of the window to arrive, unless
+            # a caller is waiting for them to be saved
+            deadline = time.monotonic() + FLUSH_WINDOW_SECONDS
+            while not _flush_requested:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                _condition.wait(remaining)
+
+            batch = _pending
+            save = _save
+            _in_flight = batch
+            _pending = []
+
+        try:
+            save(batch)
+        except Exception as e:
+            with _condition:
+                # Keep the batch ahead of newer changes and report the error
+                _pending = batch + _pending
+                _in_flight = []
+                _last_error = e
+                _failure_count += 1
+                _flush_requested = False
+                _condition.notify_all()
+            continue
+
+        with _condition:
+            _saved_count += len(batch)
+            _in_flight = []
+            if not _pending:
+                _flush_requested = False
+            _condition.notify_all()
+
+def _flush_at_exit():
+    """Save outstanding changes before the interpreter exits."""
+    try:
+        flush(timeout=30)
+    except StorageException:
+        pass
+
+atexit.register(_flush_at_exit)
@@ -0,0 +1,273 @@
+"""
+Search Index Module
+Maintains an inverted trigram index over the searchable student fields.
+"""
+
+import heapq
+from math import ceil
+from models.undergraduate import Undergraduate
+from models.postgraduate import Postgraduate
+from serialization import StudentRecord
+
+# Length of the substrings stored in the index
+GRAM_SIZE = 3
+
+# Sets of student IDs keyed by trigram
+_postings = {}
+
+# Insertion sequence numbers keyed by student ID, used to order results
+_sequence = {}
+_next_sequence = 0
+
+# Whether the index reflects the database; cleared by invalidate()
+_built = True
+
+def searchable_fields(student):
+    """
+    Get the lowercased fields that search_students matches against.
+
+    Args:
+        student: A Student, Undergraduate, or Postgraduate object, or a StudentRecord.
+
+    Returns:
+        list: The lowercased ID, name, courses, field of study, and minor or domain.
+    """
+    if isinstance(student, StudentRecord):
+        fields = [
+            student.id.lower(),
+            student.name.lower(),
+            ", ".join(student.courses).lower(),
+            (student.field_of_study or "").lower()
+        ]
+        if student.type == "undergraduate":
+            fields.append((student.minor or "").lower())
+        elif student.type == "postgraduate":
+            fields.append((student.domain or "").lower())
+        return fields
+
+    fields = [
+        (student.get_student_id() or "").lower(),
+        (student.get_name() or "").lower(),
+        (student.get_course() or "").lower(),
+        (student.get_field_of_study() or "").lower()
+    ]
+
+    if isinstance(student, Undergraduate):
+        fields.append((student.get_minor() or "").lower())
+    elif isinstance(student, Postgraduate):
+        fields.append((student.get_domain() or "").lower())
+
+    return fields
+
+def grams(text):
+    """
+    Split text into its distinct trigrams.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        set: The trigrams contained in the text.
+    """
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+def _student_id(student):
+    """Get the ID of a student object or record."""
+    if isinstance(student, StudentRecord):
+        return student.id
+    return student.get_student_id()
+
+def _student_grams(student):
+    """Get the trigrams of every searchable field of a student."""
+    student_grams = set()
+    for field in searchable_fields(student):
+        student_grams.update(grams(field))
+    return student_grams
+
+def _index(student):
+    """Add a student's trigrams to the postings."""
+    student_id = _student_id(student)
+    for gram in _student_grams(student):
+        postings = _postings.get(gram)
+        if postings is None:
+            _postings[gram] = {student_id}
+        else:
+            postings.add(student_id)
+
+def _unindex(student):
+    """Remove a student's trigrams from the postings."""
+    student_id = _student_id(student)
+    for gram in _student_grams(student):
+        postings = _postings.get(gram)
+        if postings is not None:
+            postings.discard(student_id)
+            if not postings:
+                del _postings[gram]
+
+def add_student(student):
+    """
+    Add a student to the index.
+
+    Args:
+        student: A Student, Undergraduate, or Postgraduate object, or a StudentRecord.
+    """
+    global _next_sequence
+
+    if not _built:
+        return
+
+    _index(student)
+    _sequence[_student_id(student)] = _next_sequence
+    _next_sequence += 1
+
+def update_student(old_student, new_student):
+    """
+    Replace a student's entry in the index, keeping its position in the results.
+
+    Args:
+        old_student: The student object or record currently in the index.
+        new_student: The student object replacing it.
+    """
+    if not _built:
+        return
+
+    _unindex(old_student)
+    _index(new_student)
+
+def remove_student(student):
+    """
+    Remove a student from the index.
+
+    Args:
+        student: A Student, Undergraduate, or Postgraduate object, or a StudentRecord.
+    """
+    if not _built:
+        return
+
+    _unindex(student)
+    _sequence.pop(_student_id(student), None)
+
+def rebuild(students):
+    """
+    Rebuild the index from scratch.
+
+    Args:
+        students (list): Student objects or StudentRecord tuples in insertion order.
+    """
+    global _next_sequence, _built
+
+    _postings.clear()
+    _sequence.clear()
+    _next_sequence = 0
+    _built = True
+
+    for student in students:
+        add_student(student)
+
+def invalidate():
+    """
+    Drop the index contents until the next rebuild.
+
+    Changes made while the index is invalidated are ignored, since the
+    rebuild will pick them up.
+    """
+    global _built
+
+    _postings.clear()
+    _sequence.clear()
+    _built = False
+
+def is_built():
+    """
+    Check whether the index is up to date.
+
+    Returns:
+        bool: False if the index was invalidated and not rebuilt since.
+    """
+    return _built
+
+def candidate_ids(keyword):
+    """
+    Get the IDs of students that may contain the keyword.
+
+    Every student whose fields contain the keyword is returned, but some
+    returned students may not match, so callers must verify each candidate.
+
+    Args:
+        keyword (str): The lowercased search keyword.
+
+    Returns:
+        list: Candidate student IDs in insertion order, or None if the keyword
+            is shorter than GRAM_SIZE and every student is a candidate.
+    """
+    keyword_grams = grams(keyword)
+    if not keyword_grams:
+        return None
+
+    postings = []
+    for gram in keyword_grams:
+        gram_postings = _postings.get(gram)
+        if not gram_postings:
+            return []
+        postings.append(gram_postings)
+
+    # Intersect starting from the smallest set to keep the work small
+    postings.sort(key=len)
+    candidates = set(postings[0])
+    for gram_postings in postings[1:]:
+        candidates &= gram_postings
+        if not candidates:
+            return []
+
+    return sorted(candidates, key=_sequence.__getitem__)
+
+def similar_ids(keyword, limit, min_similarity):
+    """
+    Get the IDs of the students whose fields share the most trigrams with the keyword.
+
+    The similarity of a student is the fraction of the keyword's trigrams
+    found in its fields, so 1.0 means every trigram matches, as for an
+    exact substring. A student sharing at least r of the keyword's n
+    trigrams must appear in one of the n - r + 1 rarest postings, so the
+    threshold starts at n and is lowered one posting at a time only until
+    enough students qualify. Common trigrams are therefore only scanned
+    when the rarer ones do not find enough matches, and a bounded heap
+    keeps only the best of them.
+
+    Args:
+        keyword (str): The lowercased search keyword.
+        limit (int): Maximum number of IDs to return.
+        min_similarity (float): Smallest similarity to return, between 0 and 1.
+
+    Returns:
+        list: (student_id, similarity) tuples, best match first and ties in
+            insertion order, or None if the keyword is shorter than GRAM_SIZE.
+    """
+    keyword_grams = grams(keyword)
+    if not keyword_grams:
+        return None
+
+    gram_count = len(keyword_grams)
+    min_required = max(1, ceil(gram_count * min_similarity))
+    postings = sorted((_postings.get(gram, ()) for gram in keyword_grams), key=len)
+
+    # Number of keyword trigrams shared by each student seen so far
+    shared = {}
+    required = gram_count
+    while True:
+        for student_id in postings[gram_count - required]:
+            if student_id not in shared:
+                count = 0
+                for gram_postings in postings:
+                    if student_id in gram_postings:
+                        count += 1
+                shared[student_id] = count
+
+        qualifying = sum(1 for count in shared.values() if count >= required)
+        if qualifying >= limit or required == min_required:
+            break
+        required -= 1
+
+    best = heapq.nlargest(limit, ((count, -_sequence[student_id], student_id)
+                                  for student_id, count in shared.items() if count >= required))
+    return [(student_id, count / gram_count) for count, _, student_id in best]
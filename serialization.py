@@ -0,0 +1,237 @@
+"""
+Serialization Module
+Converts student objects to and from plain dictionaries for storage.
+"""
+
+import sys
+from collections import namedtuple
+from models.student import Student
+from models.undergraduate import Undergraduate
+from models.postgraduate import Postgraduate
+
+# Compact, immutable form of a stored student, kept in place of the full
+# object until the student is actually accessed
+StudentRecord = namedtuple(
+    "StudentRecord",
+    ["id", "name", "age", "courses", "year", "field_of_study", "type", "minor", "domain"]
+)
+
+def _intern(value):
+    """Intern repeated string values so records share a single copy."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+def student_type(student):
+    """
+    Get the storage type name of a student object.
+
+    Args:
+        student: A Student, Undergraduate, or Postgraduate object.
+
+    Returns:
+        str: "undergraduate", "postgraduate" or "student".
+    """
+    if isinstance(student, Undergraduate):
+        return "undergraduate"
+    if isinstance(student, Postgraduate):
+        return "postgraduate"
+    return "student"
+
+def student_to_dict(student):
+    """
+    Convert a student object to a dictionary.
+
+    Args:
+        student: A Student, Undergraduate, or Postgraduate object, or a StudentRecord.
+
+    Returns:
+        dict: The student data in storage format.
+    """
+    if isinstance(student, StudentRecord):
+        return record_to_dict(student)
+
+    student_dict = {
+        "id": student.get_student_id(),
+        "name": student.get_name(),
+        "age": student.get_age(),
+        "courses": student.get_courses(),  # Storing list of courses
+        "year": student.get_year(),
+        "field_of_study": student.get_field_of_study(),
+        "type": "student"
+    }
+
+    # Add undergraduate specific data
+    if isinstance(student, Undergraduate):
+        student_dict["type"] = "undergraduate"
+        student_dict["minor"] = student.get_minor()
+    # Add postgraduate specific data
+    elif isinstance(student, Postgraduate):
+        student_dict["type"] = "postgraduate"
+        student_dict["domain"] = student.get_domain()
+
+    return student_dict
+
+def dict_to_record(data):
+    """
+    Convert a dictionary in storage format to a compact record.
+
+    Args:
+        data (dict): The student data.
+
+    Returns:
+        StudentRecord: The compact record.
+    """
+    # Handle courses data - could be string in old format or list in new format
+    courses = data.get("courses", data.get("course", ""))
+    if isinstance(courses, str):
+        if ',' in courses:
+            courses = [c.strip() for c in courses.split(',')]
+        else:
+            courses = [courses]
+
+    student_type = data["type"]
+    if student_type not in ("undergraduate", "postgraduate"):
+        student_type = "student"
+
+    return StudentRecord(
+        data["id"],
+        data["name"],
+        data["age"],
+        tuple(_intern(course) for course in courses or ()),
+        data["year"],
+        _intern(data.get("field_of_study") or None),
+        _intern(student_type),
+        _intern(data.get("minor", "")),  # Get minor with empty string default
+        _intern(data.get("domain", ""))  # Get domain with empty string default
+    )
+
+def student_to_record(student):
+    """
+    Convert a student object to a compact record.
+
+    Args:
+        student: A Student, Undergraduate, or Postgraduate object.
+
+    Returns:
+        StudentRecord: The compact record, with the values as dict_to_record
+            would read them back from storage.
+    """
+    return StudentRecord(
+        student.get_student_id(),
+        student.get_name(),
+        student.get_age(),
+        tuple(student.get_courses()),
+        student.get_year(),
+        student.get_field_of_study() or None,
+        student_type(student),
+        student.get_minor() if isinstance(student, Undergraduate) else "",
+        student.get_domain() if isinstance(student, Postgraduate) else ""
+    )
+
+def record_to_dict(record):
+    """
+    Convert a compact record to a dictionary in storage format.
+
+    Args:
+        record (StudentRecord): The compact record.
+
+    Returns:
+        dict: The student data in storage format.
+    """
+    student_dict = {
+        "id": record.id,
+        "name": record.name,
+        "age": record.age,
+        "courses": list(record.courses),
+        "year": record.year,
+        "field_of_study": record.field_of_study,
+        "type": record.type
+    }
+
+    if record.type == "undergraduate":
+        student_dict["minor"] = record.minor
+    elif record.type == "postgraduate":
+        student_dict["domain"] = record.domain
+
+    return student_dict
+
+def record_to_student(record):
+    """
+    Build a student object from a compact record.
+
+    Args:
+        record (StudentRecord): The compact record.
+
+    Returns:
+        Student, Undergraduate, or Postgraduate object, marked clean since
+        it matches the stored record.
+    """
+    courses = record.courses
+
+    if record.type == "undergraduate":
+        student = Undergraduate(
+            record.id,
+            record.name,
+            record.age,
+            courses,
+            record.year,
+            record.minor,
+            None  # No department
+        )
+    elif record.type == "postgraduate":
+        student = Postgraduate(
+            record.id,
+            record.name,
+            record.age,
+            courses,
+            record.year,
+            0,  # No graduation year (phased out)
+            record.domain,
+            None  # No department
+        )
+    else:
+        student = Student(
+            record.id,
+            record.name,
+            record.age,
+            courses,
+            record.year,
+            None  # No department
+        )
+
+    # Set field of study if available
+    if record.field_of_study:
+        student.set_field_of_study(record.field_of_study)
+
+    student.mark_clean()
+    return student
+
+def dict_to_student(data):
+    """
+    Convert a dictionary in storage format to a student object.
+
+    Args:
+        data (dict): The student data.
+
+    Returns:
+        Student, Undergraduate, or Postgraduate object.
+    """
+    return record_to_student(dict_to_record(data))
+
+def changed_fields(old_student, new_student):
+    """
+    Compare two versions of a student field by field.
+
+    Args:
+        old_student: The stored Student, Undergraduate, or Postgraduate object, or StudentRecord.
+        new_student: The Student, Undergraduate, or Postgraduate object replacing it.
+
+    Returns:
+        set: Names of the fields whose stored values differ, or None if the
+            ID or type differs, which changes the whole record.
+    """
+    old_data = student_to_dict(old_student)
+    new_data = student_to_dict(new_student)
+
+    if old_data["id"] != new_data["id"] or old_data["type"] != new_data["type"]:
+        return None
+    return {name for name, value in new_data.items() if old_data.get(name) != value}
@@ -0,0 +1,395 @@
+"""
+Sharded Storage Module
+Splits student records across several files by a hash of their ID, so a
+change only rewrites the file holding the changed students.
+
+The shards live in a directory next to the storage file, together with a
+manifest listing them. Each shard is a JSON array of [seq, student] pairs
+in seq order, where seq preserves the insertion order across shards.
+A new layout, written on a full save or when resharding, gets new file
+names and only takes effect once its manifest replaces the old one, so
+an interrupted save leaves the previous layout intact.
+"""
+
+import gc
+import os
+import sys
+import json
+import heapq
+import zlib
+import argparse
+from operator import itemgetter
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from atomic_files import write_atomically
+from exceptions import StorageException
+from serialization import student_to_dict, dict_to_record, record_to_dict
+
+MANIFEST_FILE = "manifest.json"
+
+# Version of the layout written to the manifest
+FORMAT_VERSION = 1
+
+# Number of shards read or written at the same time
+IO_WORKERS = 8
+
+# Manifests keyed by path, with the file state they were read at
+_manifests = {}
+
+# Next insertion sequence number keyed by shard directory
+_next_seq = {}
+
+def shard_of(student_id, shard_count):
+    """
+    Get the shard a student belongs to.
+
+    Args:
+        student_id (str): The student ID.
+        shard_count (int): Number of shards in the layout.
+
+    Returns:
+        int: The shard index, from 0 to shard_count - 1.
+    """
+    return zlib.crc32(student_id.encode("utf-8")) % shard_count
+
+def _manifest_path(directory):
+    """Get the path of the manifest in a shard directory."""
+    return os.path.join(directory, MANIFEST_FILE)
+
+def read_manifest(directory):
+    """
+    Read the manifest of a shard directory.
+
+    The parsed manifest is cached until the file changes.
+
+    Args:
+        directory (str): The shard directory.
+
+    Returns:
+        dict: The manifest with "format", "shard_count", "generation" and
+            "shards" (the shard file names in shard order), or None if
+            there is no layout yet.
+
+    Raises:
+        StorageException: If the manifest cannot be read.
+    """
+    path = _manifest_path(directory)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    state = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    cached = _manifests.get(path)
+    if cached is not None and cached[0] == state:
+        return cached[1]
+
+    try:
+        with open(path, 'r') as file:
+            manifest = json.load(file)
+    except (OSError, ValueError) as e:
+        raise StorageException(f"Error reading shard manifest: {str(e)}")
+    if manifest.get("format") != FORMAT_VERSION:
+        raise StorageException(f"Unsupported shard manifest format: {manifest.get('format')}")
+
+    _manifests[path] = (state, manifest)
+    return manifest
+
+def get_shard_count(directory):
+    """
+    Get the number of shards in a directory's layout.
+
+    Args:
+        directory (str): The shard directory.
+
+    Returns:
+        int: The number of shards, or None if there is no layout yet.
+    """
+    manifest = read_manifest(directory)
+    return manifest["shard_count"] if manifest else None
+
+def layout_files(directory):
+    """
+    Get the files making up a directory's layout.
+
+    Args:
+        directory (str): The shard directory.
+
+    Returns:
+        list: The manifest path followed by the path of every shard.
+    """
+    manifest = read_manifest(directory)
+    shards = manifest["shards"] if manifest else []
+    return [_manifest_path(directory)] + [os.path.join(directory, name) for name in shards]
+
+@contextmanager
+def _gc_paused():
+    """
+    Pause garbage collection while parsing shards.
+
+    Parsing allocates many containers, which would otherwise trigger
+    repeated collections of every student in memory that find nothing to free.
+    """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+def _read_shard(path):
+    """Read the [seq, student data] pairs of a shard file."""
+    with open(path, 'r') as file:
+        return json.load(file)
+
+def _write_shard(path, entries):
+    """Write [seq, student data] pairs to a shard file."""
+    # Encoding to a string first uses the C encoder, which json.dump does not
+    data = json.dumps(entries, separators=(",", ":"))
+    write_atomically(path, lambda file: file.write(data))
+
+def _load_shard(path):
+    """Read a shard file as (seq, record) tuples."""
+    return [(seq, dict_to_record(data)) for seq, data in _read_shard(path)]
+
+def _run(function, items):
+    """Call a function on every item using IO_WORKERS threads, returning the results in order."""
+    with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+        return list(executor.map(function, items))
+
+def save_students(students, directory, shard_count):
+    """
+    Write every student as a new layout, replacing the current one.
+
+    Args:
+        students (list): Student, Undergraduate, and Postgraduate objects or
+            StudentRecord tuples, in insertion order.
+        directory (str): The shard directory, created if needed.
+        shard_count (int): Number of shards to split the students into.
+
+    Raises:
+        StorageException: If there's an error saving the data.
+    """
+    if shard_count < 1:
+        raise StorageException("The number of shards must be at least 1")
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+        old_manifest = read_manifest(directory)
+        generation = old_manifest["generation"] + 1 if old_manifest else 1
+
+        shards = [[] for _ in range(shard_count)]
+        seq = -1
+        for seq, student in enumerate(students):
+            data = student_to_dict(student)
+            shards[shard_of(data["id"], shard_count)].append([seq, data])
+
+        names = [f"shard-{generation:04d}-{index:04d}.json" for index in range(shard_count)]
+        _run(lambda shard: _write_shard(os.path.join(directory, shard[0]), shard[1]), zip(names, shards))
+
+        manifest = {
+            "format": FORMAT_VERSION,
+            "hash": "crc32",
+            "shard_count": shard_count,
+            "generation": generation,
+            "shards": names
+        }
+        write_atomically(_manifest_path(directory), lambda file: json.dump(manifest, file, indent=4))
+        _next_seq[directory] = seq + 1
+
+        # The old shards are no longer referenced by the manifest
+        if old_manifest:
+            for name in set(old_manifest["shards"]) - set(names):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+    except StorageException:
+        raise
+    except Exception as e:
+        raise StorageException(f"Error saving student data: {str(e)}")
+
+def save_changes(changes, directory):
+    """
+    Apply a batch of changes, rewriting only the shards they touch.
+
+    Each affected shard is replaced atomically, but a batch spanning
+    several shards is not, so a crash can leave part of the batch unsaved.
+
+    Args:
+        changes (list): (operation, student_id, student) tuples, where operation
+            is "add", "update" or "delete" and student is None for deletes.
+        directory (str): The shard directory, which must hold a layout.
+
+    Raises:
+        StorageException: If there's an error saving the data.
+    """
+    try:
+        manifest = read_manifest(directory)
+        if manifest is None:
+            raise StorageException(f"No shard layout in {directory}")
+        shard_count = manifest["shard_count"]
+        paths = [os.path.join(directory, name) for name in manifest["shards"]]
+
+        changes_by_shard = {}
+        for change in changes:
+            changes_by_shard.setdefault(shard_of(change[1], shard_count), []).append(change)
+
+        if directory not in _next_seq:
+            # Nothing was loaded or saved yet; each shard ends with its highest seq
+            with _gc_paused():
+                last = [entries[-1][0] for entries in _run(_read_shard, paths) if entries]
+            _next_seq[directory] = max(last) + 1 if last else 0
+
+        for index, shard_changes in changes_by_shard.items():
+            with _gc_paused():
+                entries = {data["id"]: [seq, data] for seq, data in _read_shard(paths[index])}
+
+            for operation, student_id, student in shard_changes:
+                if operation == "delete":
+                    entries.pop(student_id, None)
+                elif student_id in entries:
+                    entries[student_id][1] = student_to_dict(student)
+                else:
+                    entries[student_id] = [_next_seq[directory], student_to_dict(student)]
+                    _next_seq[directory] += 1
+
+            _write_shard(paths[index], list(entries.values()))
+
+    except StorageException:
+        raise
+    except Exception as e:
+        raise StorageException(f"Error saving student data: {str(e)}")
+
+def load_records(directory):
+    """
+    Load every student as compact records, reading the shards in parallel.
+
+    Args:
+        directory (str): The shard directory, which must hold a layout.
+
+    Returns:
+        list: StudentRecord tuples in insertion order.
+
+    Raises:
+        StorageException: If there's an error loading the data.
+    """
+    try:
+        manifest = read_manifest(directory)
+        if manifest is None:
+            raise StorageException(f"No shard layout in {directory}")
+
+        with _gc_paused():
+            shards = _run(_load_shard, [os.path.join(directory, name) for name in manifest["shards"]])
+
+            # Every shard is in seq order, so merging them restores the insertion order
+            records = []
+            seq = -1
+            for seq, record in heapq.merge(*shards, key=itemgetter(0)):
+                records.append(record)
+        _next_seq[directory] = max(seq + 1, _next_seq.get(directory, 0))
+
+    except StorageException:
+        raise
+    except Exception as e:
+        raise StorageException(f"Error loading student data: {str(e)}")
+
+    return records
+
+def reshard(directory, shard_count):
+    """
+    Split the students of a layout into a different number of shards.
+
+    Args:
+        directory (str): The shard directory, which must hold a layout.
+        shard_count (int): The new number of shards.
+
+    Returns:
+        int: The number of students written.
+
+    Raises:
+        StorageException: If there's an error loading or saving the data.
+    """
+    records = load_records(directory)
+    save_students(records, directory, shard_count)
+    return len(records)
+
+def split_json(json_path, directory, shard_count):
+    """
+    Write the students of a JSON storage file as a sharded layout.
+
+    Args:
+        json_path (str): Path of the JSON storage file.
+        directory (str): The shard directory.
+        shard_count (int): Number of shards.
+
+    Returns:
+        int: The number of students written.
+
+    Raises:
+        StorageException: If there's an error reading or writing the data.
+    """
+    try:
+        with open(json_path, 'r') as file:
+            records = [dict_to_record(data) for data in json.load(file)]
+    except Exception as e:
+        raise StorageException(f"Error loading student data: {str(e)}")
+
+    save_students(records, directory, shard_count)
+    return len(records)
+
+def join_json(directory, json_path):
+    """
+    Write the students of a sharded layout to a JSON storage file.
+
+    Args:
+        directory (str): The shard directory, which must hold a layout.
+        json_path (str): Path of the JSON storage file to write.
+
+    Returns:
+        int: The number of students written.
+
+    Raises:
+        StorageException: If there's an error reading or writing the data.
+    """
+    student_data = [record_to_dict(record) for record in load_records(directory)]
+
+    try:
+        write_atomically(json_path, lambda file: json.dump(student_data, file, indent=4))
+    except Exception as e:
+        raise StorageException(f"Error saving student data: {str(e)}")
+    return len(student_data)
+
+def main(argv):
+    """Split, reshard or join the shards of a storage file while holding its lock."""
+    import storage
+
+    parser = argparse.ArgumentParser(description="Manage the sharded layout of a storage file.")
+    parser.add_argument("command", choices=["split", "reshard", "join"],
+                        help="split the JSON file into shards, change the number of shards, "
+                             "or join the shards back into the JSON file")
+    parser.add_argument("storage_file", help="path of the JSON storage file, such as students.json")
+    parser.add_argument("shards", nargs="?", type=int, help="number of shards for split and reshard")
+    args = parser.parse_args(argv)
+
+    storage.STORAGE_FILE = args.storage_file
+    directory = storage.get_shard_directory()
+    shard_count = args.shards or storage.SHARD_COUNT
+
+    with storage.file_lock():
+        if args.command == "split":
+            count = split_json(args.storage_file, directory, shard_count)
+        elif args.command == "reshard":
+            count = reshard(directory, shard_count)
+        else:
+            count = join_json(directory, args.storage_file)
+
+    if args.command == "join":
+        print(f"Wrote {count} students to {args.storage_file}")
+    else:
+        print(f"Wrote {count} students to {shard_count} shards in {directory}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,278 @@
+"""
+SQLite Storage Module
+Persists student records in a local SQLite database with per-record writes.
+"""
+
+import sys
+import json
+import sqlite3
+from contextlib import closing
+from exceptions import StorageException
+from serialization import StudentRecord, student_to_dict, dict_to_student, dict_to_record, record_to_student
+
+# Students are ordered by seq, which preserves insertion order across upserts
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    field_of_study TEXT,
+    type TEXT NOT NULL,
+    minor TEXT,
+    domain TEXT
+);
+CREATE TABLE IF NOT EXISTS student_courses (
+    student_id TEXT NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    course TEXT NOT NULL,
+    PRIMARY KEY (student_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_student_courses_course ON student_courses(course);
+"""
+
+UPSERT_STUDENT = """
+INSERT INTO students (id, name, age, year, field_of_study, type, minor, domain)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    name = excluded.name,
+    age = excluded.age,
+    year = excluded.year,
+    field_of_study = excluded.field_of_study,
+    type = excluded.type,
+    minor = excluded.minor,
+    domain = excluded.domain
+"""
+
+# Fields stored as columns of the students table, which can be updated one by one
+UPDATABLE_COLUMNS = ("name", "age", "year", "field_of_study", "minor", "domain")
+
+def connect(path):
+    """
+    Open a connection to the SQLite database, creating the schema if needed.
+
+    Args:
+        path (str): Path of the SQLite database file.
+
+    Returns:
+        sqlite3.Connection: The open connection.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+def _replace_courses(conn, data):
+    """Replace the stored courses of one student."""
+    conn.execute("DELETE FROM student_courses WHERE student_id = ?", (data["id"],))
+    conn.executemany(
+        "INSERT INTO student_courses (student_id, position, course) VALUES (?, ?, ?)",
+        [(data["id"], position, course) for position, course in enumerate(data["courses"])]
+    )
+
+def _update_fields(conn, data, fields):
+    """
+    Write only some fields of an existing student record.
+
+    Returns:
+        bool: False if there is no record with the student's ID.
+    """
+    columns = [column for column in UPDATABLE_COLUMNS if column in fields]
+    if columns:
+        assignments = ", ".join(f"{column} = ?" for column in columns)
+        cursor = conn.execute(f"UPDATE students SET {assignments} WHERE id = ?",
+                              [data.get(column) for column in columns] + [data["id"]])
+        if cursor.rowcount == 0:
+            return False
+    elif conn.execute("SELECT 1 FROM students WHERE id = ?", (data["id"],)).fetchone() is None:
+        return False
+
+    if "courses" in fields:
+        _replace_courses(conn, data)
+    return True
+
+def _upsert(conn, data):
+    """Insert or update one student record and replace its courses."""
+    conn.execute(UPSERT_STUDENT, (
+        data["id"],
+        data["name"],
+        data["age"],
+        data["year"],
+        data.get("field_of_study"),
+        data["type"],
+        data.get("minor"),
+        data.get("domain")
+    ))
+    _replace_courses(conn, data)
+
+def save_students(students, path):
+    """
+    Replace all student records in the database.
+
+    Args:
+        students (list): List of Student, Undergraduate, and Postgraduate objects.
+        path (str): Path of the SQLite database file.
+
+    Raises:
+        StorageException: If there's an error saving the data.
+    """
+    try:
+        with closing(connect(path)) as conn, conn:
+            conn.execute("DELETE FROM students")
+            for student in students:
+                _upsert(conn, student_to_dict(student))
+    except sqlite3.Error as e:
+        raise StorageException(f"Error saving student data: {str(e)}")
+
+def _changed_fields(operation, student):
+    """Get the fields to write for an updated student, or None to write the whole record."""
+    if operation != "update" or type(student) is StudentRecord or not student.is_dirty():
+        return None
+    fields = student.get_dirty_fields()
+    return fields if len(fields) < len(student.FIELDS) else None
+
+def save_changes(changes, path):
+    """
+    Apply a batch of changes to the database in a single transaction.
+
+    Updated students that track which of their fields changed only have
+    those fields written.
+
+    Args:
+        changes (list): (operation, student_id, student) tuples, where operation
+            is "add", "update" or "delete" and student is None for deletes.
+        path (str): Path of the SQLite database file.
+
+    Raises:
+        StorageException: If there's an error saving the data.
+    """
+    try:
+        with closing(connect(path)) as conn, conn:
+            for operation, student_id, student in changes:
+                if operation == "delete":
+                    conn.execute("DELETE FROM students WHERE id = ?", (student_id,))
+                    continue
+
+                data = student_to_dict(student)
+                fields = _changed_fields(operation, student)
+                if fields is None or not _update_fields(conn, data, fields):
+                    _upsert(conn, data)
+    except sqlite3.Error as e:
+        raise StorageException(f"Error saving student data: {str(e)}")
+
+def upsert_student(student, path):
+    """
+    Insert or update a single student record.
+
+    Args:
+        student: A Student, Undergraduate, or Postgraduate object.
+        path (str): Path of the SQLite database file.
+
+    Raises:
+        StorageException: If there's an error saving the data.
+    """
+    save_changes([("update", student.get_student_id(), student)], path)
+
+def delete_student(student_id, path):
+    """
+    Delete a single student record.
+
+    Args:
+        student_id (str): ID of the student to delete.
+        path (str): Path of the SQLite database file.
+
+    Raises:
+        StorageException: If there's an error saving the data.
+    """
+    save_changes([("delete", student_id, None)], path)
+
+def load_records(path):
+    """
+    Load all student records from the database as compact records.
+
+    Args:
+        path (str): Path of the SQLite database file.
+
+    Returns:
+        list: StudentRecord tuples in insertion order.
+
+    Raises:
+        StorageException: If there's an error loading the data.
+    """
+    try:
+        with closing(connect(path)) as conn:
+            courses = {}
+            for student_id, course in conn.execute(
+                    "SELECT student_id, course FROM student_courses ORDER BY student_id, position"):
+                courses.setdefault(student_id, []).append(course)
+
+            records = []
+            for row in conn.execute(
+                    "SELECT id, name, age, year, field_of_study, type, minor, domain "
+                    "FROM students ORDER BY seq"):
+                student_id, name, age, year, field_of_study, student_type, minor, domain = row
+                records.append(dict_to_record({
+                    "id": student_id,
+                    "name": name,
+                    "age": age,
+                    "courses": courses.get(student_id, []),
+                    "year": year,
+                    "field_of_study": field_of_study,
+                    "type": student_type,
+                    "minor": minor or "",
+                    "domain": domain or ""
+                }))
+    except sqlite3.Error as e:
+        raise StorageException(f"Error loading student data: {str(e)}")
+
+    return records
+
+def load_students(path):
+    """
+    Load all student records from the database.
+
+    Args:
+        path (str): Path of the SQLite database file.
+
+    Returns:
+        list: List of Student, Undergraduate, and Postgraduate objects in insertion order.
+
+    Raises:
+        StorageException: If there's an error loading the data.
+    """
+    return [record_to_student(record) for record in load_records(path)]
+
+def migrate_from_json(json_path, path):
+    """
+    Copy every student from a JSON storage file into the database.
+
+    Existing records with the same IDs are overwritten.
+
+    Args:
+        json_path (str): Path of the JSON storage file.
+        path (str): Path of the SQLite database file.
+
+    Returns:
+        int: The number of students migrated.
+
+    Raises:
+        StorageException: If there's an error reading or writing the data.
+    """
+    try:
+        with open(json_path, 'r') as file:
+            students = [dict_to_student(data) for data in json.load(file)]
+    except Exception as e:
+        raise StorageException(f"Error loading student data: {str(e)}")
+
+    save_changes([("update", student.get_student_id(), student) for student in students], path)
+    return len(students)
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python sqlite_storage.py <students.json> <students.db>")
+        sys.exit(1)
+
+    count = migrate_from_json(sys.argv[1], sys.argv[2])
+    print(f"Migrated {count} students to {sys.argv[2]}")
@@ -5,121 +5,498 @@ Handles file operations for persistent storage.
 
 import os
 import json
+import journal
+import binary_storage
+import sqlite_storage
+import sharded_storage
+import mmap_roster
+import metrics
+from locks import FileLock
+from atomic_files import write_atomically
 from exceptions import StorageException
-from models.student import Student
-from models.undergraduate import Undergraduate
-from models.postgraduate import Postgraduate
+from serialization import StudentRecord, student_to_dict, dict_to_record, record_to_student
 
 # File path for storing student data
 STORAGE_FILE = "students.json"
 
+# Storage mode: "json" rewrites the whole file after every change,
+# "journal" appends each change to a log next to the file and only rewrites
+# the file when the log is compacted, "sqlite" upserts individual rows
+# in a SQLite database next to the file, "sharded" splits the students
+# across several files by ID and only rewrites the files that change, and
+# "mmap" opens a memory-mapped roster file next to the file read-only
+STORAGE_MODE = "json"
+
+# Number of journal entries after which the journal is folded into a snapshot
+JOURNAL_COMPACTION_THRESHOLD = 1000
+
+# Number of characters read at a time when streaming the storage file
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Snapshot format used by the "json" and "journal" modes: "json" writes the
+# storage file itself, "binary" writes a compact binary snapshot next to it
+# that loads much faster. A missing binary snapshot falls back to the JSON file.
+SNAPSHOT_FORMAT = "json"
+
+# Number of shards a new sharded layout is split into. An existing layout
+# keeps its number of shards until it is resharded with
+# python sharded_storage.py reshard students.json N
+SHARD_COUNT = 16
+
+# Keep the JSON text of every student written to a JSON snapshot, so the
+# next snapshot only serializes the students that changed. Costs about as
+# much memory as the size of the storage file.
+REUSE_SERIALIZED = True
+
+# Number of entries currently in the journal
+_journal_entries = 0
+
+# File locks keyed by lock file path
+_file_locks = {}
+
+# State of the storage files when this process last loaded or saved them
+_disk_state = None
+
+# (entry, edit count, text) of each student in the last JSON snapshot, keyed
+# by ID. The edit count is None for records, which never change.
+_serialized = {}
+
+def get_journal_file():
+    """
+    Get the path of the journal file that belongs to the storage file.
+
+    Returns:
+        str: The journal file path.
+    """
+    return os.path.splitext(STORAGE_FILE)[0] + ".journal"
+
+def get_binary_file():
+    """
+    Get the path of the binary snapshot used by the "binary" snapshot format.
+
+    Returns:
+        str: The binary snapshot file path.
+    """
+    return os.path.splitext(STORAGE_FILE)[0] + ".bin"
+
+def get_sqlite_file():
+    """
+    Get the path of the SQLite database used by the "sqlite" storage mode.
+
+    Returns:
+        str: The SQLite database file path.
+    """
+    return os.path.splitext(STORAGE_FILE)[0] + ".db"
+
+def get_shard_directory():
+    """
+    Get the path of the directory holding the shards used by the "sharded" storage mode.
+
+    Returns:
+        str: The shard directory path.
+    """
+    return os.path.splitext(STORAGE_FILE)[0] + ".shards"
+
+def get_roster_file():
+    """
+    Get the path of the memory-mapped roster used by the "mmap" storage mode.
+
+    Returns:
+        str: The roster file path.
+    """
+    return os.path.splitext(STORAGE_FILE)[0] + ".roster"
+
+def get_lock_file():
+    """
+    Get the path of the lock file that guards the storage files.
+
+    A separate file is locked because the storage file itself is replaced
+    on every snapshot, which would drop a lock held on it.
+
+    Returns:
+        str: The lock file path.
+    """
+    return os.path.splitext(STORAGE_FILE)[0] + ".lock"
+
+def file_lock():
+    """
+    Get the lock shared by every process that uses the storage files.
+
+    Hold it while loading or saving, and around any check of the stored
+    students that a following save depends on.
+
+    Returns:
+        FileLock: The lock for the current storage file, usable as a context manager.
+    """
+    path = get_lock_file()
+    lock = _file_locks.get(path)
+    if lock is None:
+        lock = _file_locks.setdefault(path, FileLock(path))
+    return lock
+
+def _file_state(path):
+    """Get the modification time, size and inode of a file, or None if it is missing."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+def get_disk_state():
+    """
+    Get the current state of the storage files for the storage mode.
+
+    Returns:
+        tuple: The modification time, size and inode of each file, which
+            changes whenever any process writes to them.
+    """
+    if STORAGE_MODE == "sqlite":
+        path = get_sqlite_file()
+        return (_file_state(path), _file_state(path + "-wal"))
+    if STORAGE_MODE == "mmap":
+        return (_file_state(get_roster_file()),)
+    if STORAGE_MODE == "sharded":
+        files = sharded_storage.layout_files(get_shard_directory())
+        return (_file_state(STORAGE_FILE),) + tuple(_file_state(path) for path in files)
+    if SNAPSHOT_FORMAT == "binary":
+        return (_file_state(get_binary_file()), _file_state(STORAGE_FILE), _file_state(get_journal_file()))
+    return (_file_state(STORAGE_FILE), _file_state(get_journal_file()))
+
+def _remember_disk_state():
+    """Remember the state of the storage files after this process loaded or saved them."""
+    global _disk_state
+    _disk_state = get_disk_state()
+
+def has_changed_on_disk():
+    """
+    Check whether another process changed the storage since this process
+    last loaded or saved it.
+
+    Returns:
+        bool: True if the students have to be reloaded.
+    """
+    return get_disk_state() != _disk_state
+
+def _is_dirty(student):
+    """Check whether a student object or record has unsaved changes."""
+    return type(student) is not StudentRecord and student.is_dirty()
+
+def _edit_counts(students):
+    """Read the edit count of the dirty students about to be saved, for _mark_clean."""
+    return [(student, student.get_edit_count()) for student in students if _is_dirty(student)]
+
+def _mark_clean(edit_counts):
+    """Record that students were saved, unless they changed again since their edit count was read."""
+    for student, edit_count in edit_counts:
+        student.mark_clean(edit_count)
+
+def _serialize(student):
+    """Format a student the way json.dump(..., indent=4) formats an element of the students array."""
+    return "    " + json.dumps(student_to_dict(student), indent=4).replace("\n", "\n    ")
+
+def _write_json_snapshot(students):
+    """
+    Write the JSON storage file, reusing the text of students that did not
+    change since the last snapshot when REUSE_SERIALIZED is set.
+    """
+    global _serialized
+
+    serialized = {}
+    texts = []
+    for student in students:
+        student_id = student.id if type(student) is StudentRecord else student.get_student_id()
+        edit_count = None if type(student) is StudentRecord else student.get_edit_count()
+        cached = _serialized.get(student_id)
+        # The same object or record is still in place and was not changed
+        # since it was serialized, whether or not that snapshot was the last save
+        if cached is not None and cached[0] is student and cached[1] == edit_count:
+            text = cached[2]
+        else:
+            text = _serialize(student)
+        if REUSE_SERIALIZED:
+            serialized[student_id] = (student, edit_count, text)
+        texts.append(text)
+
+    content = "[\n" + ",\n".join(texts) + "\n]" if texts else "[]"
+    write_atomically(STORAGE_FILE, lambda file: file.write(content))
+    _serialized = serialized
+
+@metrics.timed("storage.save_students")
 def save_students(students):
     """
-    Save student data to a JSON file.
-    
+    Save student data to a JSON file, or a binary snapshot if SNAPSHOT_FORMAT is "binary".
+
+    Writing a full snapshot also clears the journal, since every change
+    in it is now part of the snapshot. Students that did not change since
+    the previous JSON snapshot are not serialized again, and every student
+    is marked clean once saved unless it changed again during the save.
+
     Args:
-        students (list): List of Student, Undergraduate, and Postgraduate objects.
-        
+        students (list): List of Student, Undergraduate, and Postgraduate objects,
+            or StudentRecord tuples for students that were never accessed.
+
     Raises:
         StorageException: If there's an error saving the data.
     """
+    global _journal_entries
+
+    saving = _edit_counts(students)
+
+    if STORAGE_MODE == "sqlite":
+        sqlite_storage.save_students(students, get_sqlite_file())
+        _mark_clean(saving)
+        _remember_disk_state()
+        return
+
+    if STORAGE_MODE == "sharded":
+        directory = get_shard_directory()
+        sharded_storage.save_students(students, directory,
+                                      sharded_storage.get_shard_count(directory) or SHARD_COUNT)
+        _mark_clean(saving)
+        _remember_disk_state()
+        return
+
+    if STORAGE_MODE == "mmap":
+        # Writing a whole roster is how one is built; changes are not supported
+        try:
+            write_atomically(get_roster_file(), lambda file: mmap_roster.dump(students, file), 'wb')
+        except Exception as e:
+            raise StorageException(f"Error saving student data: {str(e)}")
+        _mark_clean(saving)
+        _remember_disk_state()
+        return
+
     try:
-        # Convert student objects to dictionaries
-        student_data = []
-        
-        for student in students:
-            student_dict = {
-                "id": student.get_student_id(),
-                "name": student.get_name(),
-                "age": student.get_age(),
-                "courses": student.get_courses(),  # Storing list of courses
-                "year": student.get_year(),
-                "field_of_study": student.get_field_of_study(),
-                "type": "student"
-            }
-            
-            # Add undergraduate specific data
-            if isinstance(student, Undergraduate):
-                student_dict["type"] = "undergraduate"
-                student_dict["minor"] = student.get_minor()
-            # Add postgraduate specific data
-            elif isinstance(student, Postgraduate):
-                student_dict["type"] = "postgraduate"
-                student_dict["domain"] = student.get_domain()
-                
-            student_data.append(student_dict)
-        
-        # Write to file
-        with open(STORAGE_FILE, 'w') as file:
-            json.dump(student_data, file, indent=4)
-            
+        if SNAPSHOT_FORMAT == "binary":
+            write_atomically(get_binary_file(), lambda file: binary_storage.dump(students, file), 'wb')
+        else:
+            _write_json_snapshot(students)
+
+        journal.clear(get_journal_file())
+        _journal_entries = 0
+
     except Exception as e:
         raise StorageException(f"Error saving student data: {str(e)}")
 
-def load_students():
+    _mark_clean(saving)
+    _remember_disk_state()
+
+@metrics.timed("storage.save_changes")
+def save_changes(changes, get_students):
     """
-    Load student data from a JSON file.
-    
+    Persist a batch of changes to student records.
+
+    In journal mode the changes are appended to the journal, and the journal
+    is compacted once it grows past JOURNAL_COMPACTION_THRESHOLD entries.
+    In sqlite mode only the affected rows are written, with only the
+    changed fields of updated students, and in sharded mode only the shards
+    holding them. Otherwise the whole file is rewritten.
+
+    Args:
+        changes (list): (operation, student_id, student) tuples, where operation
+            is "add", "update" or "delete" and student is None for deletes.
+        get_students (callable): Returns the full list of students, used when
+            a snapshot has to be written.
+
+    Raises:
+        StorageException: If there's an error saving the data.
+    """
+    global _journal_entries
+
+    if STORAGE_MODE == "mmap":
+        raise StorageException("The memory-mapped roster is read-only")
+
+    saving = _edit_counts(student for _, _, student in changes if student)
+
+    if STORAGE_MODE == "sqlite":
+        sqlite_storage.save_changes(changes, get_sqlite_file())
+        _mark_clean(saving)
+        _remember_disk_state()
+        return
+
+    if STORAGE_MODE == "sharded" and sharded_storage.get_shard_count(get_shard_directory()):
+        sharded_storage.save_changes(changes, get_shard_directory())
+        _mark_clean(saving)
+        _remember_disk_state()
+        return
+
+    if STORAGE_MODE != "journal":
+        save_students(get_students())
+        return
+
+    try:
+        entries = [(operation, student_id, student_to_dict(student) if student else None)
+                   for operation, student_id, student in changes]
+        journal.append_entries(get_journal_file(), entries)
+        _journal_entries += len(entries)
+    except Exception as e:
+        raise StorageException(f"Error saving student data: {str(e)}")
+
+    _mark_clean(saving)
+    _remember_disk_state()
+
+    if _journal_entries >= JOURNAL_COMPACTION_THRESHOLD:
+        compact_journal(get_students())
+
+def compact_journal(students):
+    """
+    Fold the journal into a fresh snapshot of the storage file.
+
+    Args:
+        students (list): List of Student, Undergraduate, and Postgraduate objects.
+
+    Raises:
+        StorageException: If there's an error saving the data.
+    """
+    save_students(students)
+
+def iter_student_data(file):
+    """
+    Parse a JSON array of student dictionaries incrementally.
+
+    Only one chunk of the file and the record being parsed are held in
+    memory at a time, instead of the whole document.
+
+    Args:
+        file: An open text file containing a JSON array.
+
+    Yields:
+        dict: Each student dictionary in file order.
+
+    Raises:
+        ValueError: If the file is not a valid JSON array.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    started = False
+    at_end = False
+
+    while True:
+        # Skip whitespace and separators between records
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+
+        if position == len(buffer):
+            if at_end:
+                if started:
+                    raise ValueError("Unexpected end of student data")
+                return
+            buffer = file.read(STREAM_CHUNK_SIZE)
+            position = 0
+            at_end = not buffer
+            continue
+
+        if not started:
+            if buffer[position] != '[':
+                raise ValueError("Student data must be a JSON array")
+            started = True
+            position += 1
+            continue
+
+        if buffer[position] == ']':
+            return
+
+        try:
+            data, position = decoder.raw_decode(buffer, position)
+        except ValueError:
+            # The record continues in the next chunk
+            if at_end:
+                raise
+            chunk = file.read(STREAM_CHUNK_SIZE)
+            at_end = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        yield data
+
+@metrics.timed("storage.load_records")
+def load_records():
+    """
+    Load student data as compact records without building student objects.
+
+    The binary snapshot or JSON file is read, the JSON file incrementally,
+    and any changes left in the journal are replayed on top of it. In sharded
+    mode the shards are read instead, falling back to the JSON file until
+    the first save splits it into shards.
+
     Returns:
-        list: List of Student, Undergraduate, and Postgraduate objects.
-        
+        list: StudentRecord tuples in insertion order.
+
     Raises:
         StorageException: If there's an error loading the data.
     """
-    students = []
-    
+    global _journal_entries
+
+    if STORAGE_MODE == "sqlite":
+        records = sqlite_storage.load_records(get_sqlite_file())
+        _remember_disk_state()
+        return records
+
+    if STORAGE_MODE == "sharded" and sharded_storage.get_shard_count(get_shard_directory()):
+        records = sharded_storage.load_records(get_shard_directory())
+        _remember_disk_state()
+        return records
+
+    if STORAGE_MODE == "mmap":
+        roster = open_roster()
+        return list(roster.values()) if roster is not None else []
+
+    try:
+        records = {}
+
+        # Read from file if it exists
+        if SNAPSHOT_FORMAT == "binary" and os.path.exists(get_binary_file()):
+            for record in binary_storage.load_records(get_binary_file()):
+                records[record.id] = record
+        elif os.path.exists(STORAGE_FILE):
+            with open(STORAGE_FILE, 'r') as file:
+                for data in iter_student_data(file):
+                    records[data["id"]] = dict_to_record(data)
+
+        # Replay changes made since the last snapshot
+        _journal_entries = journal.replay(get_journal_file(), records, dict_to_record)
+
+    except Exception as e:
+        raise StorageException(f"Error loading student data: {str(e)}")
+
+    _remember_disk_state()
+    return list(records.values())
+
+@metrics.timed("storage.open_roster")
+def open_roster():
+    """
+    Open the memory-mapped roster without reading any students.
+
+    Returns:
+        mmap_roster.Roster: A read-only mapping of IDs to StudentRecord
+            tuples, or None if there is no roster file.
+
+    Raises:
+        StorageException: If the roster file cannot be opened.
+    """
+    path = get_roster_file()
+    _remember_disk_state()
+    if not os.path.exists(path):
+        return None
+
     try:
-        # Check if file exists
-        if not os.path.exists(STORAGE_FILE):
-            return students
-        
-        # Read from file
-        with open(STORAGE_FILE, 'r') as file:
-            student_data = json.load(file)
-        
-        # Convert dictionaries to student objects
-        for data in student_data:
-            # Handle courses data - could be string in old format or list in new format
-            courses = data.get("courses", data.get("course", ""))
-            
-            if data["type"] == "undergraduate":
-                student = Undergraduate(
-                    data["id"], 
-                    data["name"], 
-                    data["age"], 
-                    courses,
-                    data["year"],
-                    data.get("minor", ""),  # Get minor with empty string default
-                    None  # No department
-                )
-            elif data["type"] == "postgraduate":
-                student = Postgraduate(
-                    data["id"], 
-                    data["name"], 
-                    data["age"], 
-                    courses,
-                    data["year"],
-                    0,  # No graduation year (phased out)
-                    data.get("domain", ""),  # Get domain with empty string default
-                    None  # No department
-                )
-            else:
-                student = Student(
-                    data["id"], 
-                    data["name"], 
-                    data["age"], 
-                    courses,
-                    data["year"],
-                    None  # No department
-                )
-            
-            # Set field of study if available
-            if "field_of_study" in data and data["field_of_study"]:
-                student.set_field_of_study(data["field_of_study"])
-                
-            students.append(student)
-            
+        return mmap_roster.Roster(path)
     except Exception as e:
         raise StorageException(f"Error loading student data: {str(e)}")
-    
-    return students
+
+@metrics.timed("storage.load_students")
+def load_students():
+    """
+    Load student data from a JSON file.
+
+    Any changes left in the journal are replayed on top of the file.
+
+    Returns:
+        list: List of Student, Undergraduate, and Postgraduate objects.
+
+    Raises:
+        StorageException: If there's an error loading the data.
+    """
+    return [record_to_student(record) for record in load_records()]
@@ -3,19 +3,24 @@ Student Operations Module
 Contains core functionalities for managing student records.
 """
 
+import threading
 import database
 from exceptions import (
     StudentManagementException, 
+    StorageException, 
     InvalidIDException, 
     DuplicateStudentIDException, 
     StudentNotFoundException
 )
 from validation import validate_student_id
-from storage import save_students, load_students
-from models.student import Student
-from models.undergraduate import Undergraduate
-from models.postgraduate import Postgraduate
+import storage
+import persistence
+import metrics
+from storage import load_students, load_records
+from search_index import searchable_fields
+from serialization import changed_fields
 
+@metrics.timed("student_operations.add_student")
 def add_student(student):
     """
     Add a new student to the system.
@@ -26,50 +31,162 @@ def add_student(student):
     Raises:
         InvalidIDException: If the student ID format is invalid.
         DuplicateStudentIDException: If a student with the ID already exists.
+        StorageException: If the storage mode is read-only.
     """
+    _ensure_writable()
+    # Loading takes the database lock itself, so it must happen before it is held
+    _ensure_initialized()
+    
     # Validate student ID
     try:
         validate_student_id(student.get_student_id())
     except Exception as e:
         raise InvalidIDException(f"Invalid student ID: {str(e)}")
     
-    # Check if student already exists
-    if database.get_student_by_id(student.get_student_id()):
-        raise DuplicateStudentIDException(f"Student with ID {student.get_student_id()} already exists.")
+    with database.write_lock(), storage.file_lock():
+        # Pick up changes saved by other processes before checking
+        refresh()
+        
+        # Check if student already exists
+        if database.student_exists(student.get_student_id()):
+            raise DuplicateStudentIDException(f"Student with ID {student.get_student_id()} already exists.")
+        
+        # Add student to database
+        database.add_student(student)
+        
+        # Save changes to file
+        persistence.record_changes([("add", student.get_student_id(), student)], _save_changes)
+
+@metrics.timed("student_operations.validate_students")
+def validate_students(students):
+    """
+    Validate a batch of new students without adding them.
+
+    Each student is checked for a valid ID that is not already in use,
+    either in the system or by an earlier student in the same batch.
+
+    Args:
+        students (list): Student, Undergraduate, or Postgraduate objects.
+
+    Returns:
+        list: (index, message) tuples for each rejected student, where index
+            is the student's position in the batch.
+    """
+    errors = []
+    batch_ids = set()
+    refresh()
     
-    # Add student to database
-    database.add_student(student)
+    for index, student in enumerate(students):
+        student_id = student.get_student_id()
+        
+        try:
+            validate_student_id(student_id)
+        except Exception as e:
+            errors.append((index, f"Invalid student ID: {str(e)}"))
+            continue
+        
+        if database.student_exists(student_id):
+            errors.append((index, f"Student with ID {student_id} already exists."))
+        elif student_id in batch_ids:
+            errors.append((index, f"Student with ID {student_id} appears more than once in the batch."))
+        else:
+            batch_ids.add(student_id)
     
-    # Save changes to file
-    save_students(database.students)
+    return errors
 
+@metrics.timed("student_operations.bulk_add_students")
+def bulk_add_students(students):
+    """
+    Add a batch of new students to the system with a single save.
+    
+    Students that fail validation are skipped and reported; all the
+    others are added.
+    
+    Args:
+        students (list): Student, Undergraduate, or Postgraduate objects.
+        
+    Returns:
+        tuple: (added, errors), where added is the list of students that were
+            added and errors is a list of (index, message) tuples for the
+            students that were rejected.
+            
+    Raises:
+        StorageException: If the storage mode is read-only.
+    """
+    _ensure_writable()
+    _ensure_initialized()
+    
+    with database.write_lock(), storage.file_lock():
+        errors = validate_students(students)
+        rejected = {index for index, _ in errors}
+        added = [student for index, student in enumerate(students) if index not in rejected]
+        
+        if added:
+            # Add students to database
+            database.add_students(added)
+            
+            # Save all changes to file at once
+            persistence.record_changes([("add", student.get_student_id(), student) for student in added],
+                                       _save_changes)
+    
+    return added, errors
+
+@metrics.timed("student_operations.update_student")
 def update_student(student):
     """
     Update an existing student in the system.
     
+    Only the fields that differ from the stored student are marked as
+    changed for storage, and nothing is saved if none differ. The stored
+    student itself may also be modified in place and passed back here.
+    
     Args:
         student: A Student or Undergraduate object with updated information.
         
     Raises:
         InvalidIDException: If the student ID format is invalid.
         StudentNotFoundException: If no student with the ID exists.
+        StorageException: If the storage mode is read-only.
     """
+    _ensure_writable()
+    _ensure_initialized()
+    
     # Validate student ID
     try:
         validate_student_id(student.get_student_id())
     except Exception as e:
         raise InvalidIDException(f"Invalid student ID: {str(e)}")
     
-    # Check if student exists
-    if not database.get_student_by_id(student.get_student_id()):
-        raise StudentNotFoundException(f"Student with ID {student.get_student_id()} does not exist.")
-    
-    # Update student in database
-    database.update_student(student)
-    
-    # Save changes to file
-    save_students(database.students)
+    with database.write_lock(), storage.file_lock():
+        # Pick up changes saved by other processes before checking
+        refresh()
+        
+        # Check if student exists
+        if not database.student_exists(student.get_student_id()):
+            raise StudentNotFoundException(f"Student with ID {student.get_student_id()} does not exist.")
+        
+        # Work out which fields changed, skipping the save if none did
+        current = database.get_student_by_id(student.get_student_id())
+        if current is student:
+            if not student.is_dirty():
+                return
+        else:
+            fields = changed_fields(current, student)
+            if fields is None:
+                student.mark_dirty()
+            elif not fields:
+                return
+            else:
+                student.mark_clean()
+                student.mark_dirty(*fields)
+        
+        # Update student in database
+        database.update_student(student)
+        
+        # Save changes to file
+        persistence.record_changes([("update", student.get_student_id(), student)], _save_changes)
 
+@metrics.timed("student_operations.delete_student")
 def delete_student(student_id):
     """
     Delete a student from the system.
@@ -79,17 +196,117 @@ def delete_student(student_id):
         
     Raises:
         StudentNotFoundException: If no student with the ID exists.
+        StorageException: If the storage mode is read-only.
     """
-    # Check if student exists
-    if not database.get_student_by_id(student_id):
-        raise StudentNotFoundException(f"Student with ID {student_id} does not exist.")
+    _ensure_writable()
+    _ensure_initialized()
     
-    # Delete student from database
-    database.delete_student(student_id)
+    with database.write_lock(), storage.file_lock():
+        # Pick up changes saved by other processes before checking
+        refresh()
+        
+        # Check if student exists
+        if not database.student_exists(student_id):
+            raise StudentNotFoundException(f"Student with ID {student_id} does not exist.")
+        
+        # Delete student from database
+        database.delete_student(student_id)
+        
+        # Save changes to file
+        persistence.record_changes([("delete", student_id, None)], _save_changes)
+
+def _ensure_writable():
+    """
+    Check that students can be changed in the current storage mode.
+    
+    Raises:
+        StorageException: If the storage mode is read-only.
+    """
+    if storage.STORAGE_MODE == "mmap":
+        raise StorageException("Students cannot be changed: the memory-mapped roster is read-only.")
+
+def _save_changes(changes):
+    """
+    Save a batch of changes to storage, called by the persistence module.
+    
+    If another process saved changes since this one last loaded or saved,
+    they are loaded first so that writing a snapshot does not overwrite them.
     
-    # Save changes to file
-    save_students(database.students)
+    Args:
+        changes (list): (operation, student_id, student) tuples.
+        
+    Raises:
+        StorageException: If there's an error loading or saving the data.
+    """
+    with database.write_lock(), storage.file_lock():
+        if storage.has_changed_on_disk():
+            _reload()
+        storage.save_changes(changes, database.list_entries)
 
+def _reload():
+    """
+    Reload the students from storage, keeping the changes not saved yet.
+    
+    Callers must hold the database write lock and the storage file lock.
+    """
+    metrics.increment("student_operations.reloads")
+    
+    if storage.STORAGE_MODE == "mmap":
+        # Nothing can be changed in this mode, so there are no unsaved changes
+        roster = storage.open_roster()
+        if roster is not None:
+            database.load_roster(roster)
+        else:
+            database.load_records([])
+        return
+    
+    if LAZY_LOADING:
+        database.load_records(load_records())
+    else:
+        database.load_students(load_students())
+    
+    for operation, student_id, student in persistence.unsaved_changes():
+        if operation == "delete":
+            database.delete_student(student_id)
+        elif database.student_exists(student_id):
+            database.update_student(student)
+        else:
+            database.add_student(student)
+
+def refresh():
+    """
+    Reload the students if another process changed the storage since they
+    were last loaded or saved.
+    
+    Only the modification time, size and inode of the storage files are
+    checked, so this is cheap when nothing changed. The students are
+    loaded here on first access if initialize() was not called.
+    
+    Raises:
+        StorageException: If there's an error loading the data.
+    """
+    _ensure_initialized()
+    
+    if not storage.has_changed_on_disk():
+        return
+    
+    with database.write_lock(), storage.file_lock():
+        if storage.has_changed_on_disk():
+            _reload()
+
+def flush():
+    """
+    Wait until every change made so far has been saved to storage.
+    
+    Changes are saved in the background when persistence.FLUSH_WINDOW_SECONDS
+    is set, so callers that need them on disk should call this first.
+    
+    Raises:
+        StorageException: If saving the changes failed.
+    """
+    persistence.flush()
+
+@metrics.timed("student_operations.list_students")
 def list_students():
     """
     List all students in the system.
@@ -97,8 +314,77 @@ def list_students():
     Returns:
         list: A list of Student and Undergraduate objects.
     """
-    return database.students
+    refresh()
+    return database.list_students()
+
+@metrics.timed("student_operations.count_students")
+def count_students():
+    """
+    Count the students in the system.
+    
+    Returns:
+        int: The number of students.
+    """
+    refresh()
+    return database.count_students()
+
+@metrics.timed("student_operations.list_student_ids")
+def list_student_ids():
+    """
+    List the IDs of all students in the system, without building student objects.
+    
+    Returns:
+        list: Student IDs in insertion order. Callers must not modify it.
+    """
+    refresh()
+    return database.get_sorted_ids()
+
+@metrics.timed("student_operations.list_students_page")
+def list_students_page(offset, limit, sort_by=None, descending=False):
+    """
+    List one page of students, sorted on the server side.
+    
+    Args:
+        offset (int): Number of students to skip.
+        limit (int): Maximum number of students to return.
+        sort_by (str, optional): One of database.SORT_FIELDS, or None for insertion order.
+        descending (bool): Sort in descending order.
+        
+    Returns:
+        list: The Student, Undergraduate, and Postgraduate objects on the page.
+    """
+    refresh()
+    return database.get_page(offset, limit, sort_by, descending)
+
+def sort_students(students, sort_by, descending=False):
+    """
+    Sort a list of students, such as search results, by a field.
+    
+    Args:
+        students (list): Student, Undergraduate, or Postgraduate objects.
+        sort_by (str, optional): One of database.SORT_FIELDS, or None to keep the order.
+        descending (bool): Sort in descending order.
+        
+    Returns:
+        list: The sorted students.
+    """
+    return database.sort_students(students, sort_by, descending)
+
+@metrics.timed("student_operations.student_exists")
+def student_exists(student_id):
+    """
+    Check whether a student with the given ID exists.
+    
+    Args:
+        student_id: ID of the student to look up.
+        
+    Returns:
+        bool: True if the student exists, False otherwise.
+    """
+    refresh()
+    return database.student_exists(student_id)
 
+@metrics.timed("student_operations.get_student_by_id")
 def get_student_by_id(student_id):
     """
     Get a student by ID.
@@ -109,8 +395,20 @@ def get_student_by_id(student_id):
     Returns:
         Student or Undergraduate object, or None if not found.
     """
+    refresh()
     return database.get_student_by_id(student_id)
 
+def get_version():
+    """
+    Get the current database version.
+    
+    Returns:
+        int: A number that increases with every change to the students.
+    """
+    refresh()
+    return database.get_version()
+
+@metrics.timed("student_operations.search_students")
 def search_students(keyword):
     """
     Search for students by keyword in name, course, ID, or field of study.
@@ -125,40 +423,225 @@ def search_students(keyword):
         return []
     
     keyword = keyword.lower()
-    matches = []
-    
-    for student in database.students:
-        # Search in ID, name, course, and field of study
-        student_id = student.get_student_id() or ""
-        name = student.get_name() or ""
-        course = student.get_course() or ""
-        field_of_study = student.get_field_of_study() or ""
-        
-        if (keyword in student_id.lower() or
-            keyword in name.lower() or
-            keyword in course.lower() or
-            keyword in field_of_study.lower()):
-            matches.append(student)
+    refresh()
+    
+    # The search index narrows the roster down to candidates, which are
+    # then checked against ID, name, course, field of study, and minor or domain
+    return [student for student in database.search_candidates(keyword)
+            if any(keyword in field for field in searchable_fields(student))]
+
+@metrics.timed("student_operations.get_students_frame")
+def get_students_frame(columns=None):
+    """
+    Get all students as a DataFrame with one column per field.
+    
+    The frame is copied from the columnar mirror, which is built on first
+    use and kept up to date on every change, so it can be filtered, sorted
+    and aggregated with vectorized operations.
+    
+    Args:
+        columns (list, optional): Columns to include, all of columnar.COLUMNS by default
+        
+    Returns:
+        pd.DataFrame: One row per student in insertion order
+    """
+    refresh()
+    return database.get_frame(columns)
+
+@metrics.timed("student_operations.get_students_frame_page")
+def get_students_frame_page(offset, limit, sort_by=None, descending=False):
+    """
+    Get one page of students as a DataFrame, copied from the columnar mirror.
+    
+    Args:
+        offset (int): Number of students to skip.
+        limit (int): Maximum number of students to return.
+        sort_by (str, optional): One of database.SORT_FIELDS, or None for insertion order.
+        descending (bool): Sort in descending order.
+        
+    Returns:
+        pd.DataFrame: One row per student on the page
+    """
+    refresh()
+    return database.get_frame_page(offset, limit, sort_by, descending)
+
+def iter_student_frame_chunks(chunk_size, columns=None):
+    """
+    Iterate over all students in insertion order as DataFrames, a chunk at a time.
+    
+    Each chunk is copied from the columnar mirror when it is taken, so only
+    one chunk is held at once.
+    
+    Args:
+        chunk_size (int): Maximum number of students in each chunk
+        columns (list, optional): Columns to include, all of columnar.COLUMNS by default
+        
+    Returns:
+        iterator: DataFrames as returned by get_students_frame
+    """
+    refresh()
+    return database.iter_frame_chunks(chunk_size, columns)
+
+def iter_student_chunks(chunk_size):
+    """
+    Iterate over all students in insertion order, a chunk at a time.
+    
+    Only one chunk is held at once, and students that were not accessed
+    yet are returned as compact records rather than built as objects.
+    
+    Args:
+        chunk_size (int): Maximum number of students in each chunk
+        
+    Returns:
+        iterator: Lists of Student objects and StudentRecord tuples
+    """
+    refresh()
+    return database.iter_entry_chunks(chunk_size)
+
+@metrics.timed("student_operations.get_statistics")
+def get_statistics():
+    """
+    Get student counts by field of study, type, year, course and age.
+    
+    The counts are kept up to date on every change, so this does not
+    iterate over the students.
+    
+    Returns:
+        dict: The number of students under "total" and a Counter under each
+            of "field_of_study", "type", "year", "course" and "age".
+    """
+    refresh()
+    return database.get_aggregates()
+
+def verify_statistics():
+    """
+    Check that the maintained counts match a full recount of the students.
+    
+    Returns:
+        list: A description of each count that differs, empty if they all match.
+    """
+    refresh()
+    return database.verify_aggregates()
+
+@metrics.timed("student_operations.students_in_course")
+def students_in_course(course):
+    """
+    Get the students enrolled in a course.
+
+    Students are looked up in the course index, which is kept up to date
+    on every change, so this does not iterate over the students.
+
+    Args:
+        course (str): The exact course name
+
+    Returns:
+        list: Student objects in the order they enrolled
+    """
+    refresh()
+    return database.students_in_course(course)
+
+@metrics.timed("student_operations.students_in_all_courses")
+def students_in_all_courses(courses):
+    """
+    Get the students enrolled in every one of several courses.
+
+    Args:
+        courses (list): Exact course names
+
+    Returns:
+        list: Student objects, or an empty list if no courses are given
+    """
+    refresh()
+    return database.students_in_courses(courses)
+
+def course_enrollment_counts():
+    """
+    Get the number of students enrolled in each course.
+
+    Returns:
+        dict: Number of students keyed by course name
+    """
+    refresh()
+    return database.course_enrollment_counts()
+
+# Number of results returned by a fuzzy search unless a limit is given
+FUZZY_SEARCH_LIMIT = 20
+
+# Fraction of the keyword's trigrams a student must share to match a fuzzy search
+FUZZY_MIN_SIMILARITY = 0.4
+
+@metrics.timed("student_operations.fuzzy_search_students")
+def fuzzy_search_students(keyword, limit=None):
+    """
+    Search for students by similarity, tolerating typos, and rank the results.
+    
+    Students are compared by the share of the keyword's trigrams found in
+    their ID, name, courses, field of study, and minor or domain, and only
+    the best matches are returned.
+    
+    Args:
+        keyword (str): The search keyword.
+        limit (int, optional): Maximum number of results, FUZZY_SEARCH_LIMIT by default.
+        
+    Returns:
+        list: (student, similarity) tuples, best match first, where similarity
+            is between FUZZY_MIN_SIMILARITY and 1.0 for an exact match.
+    """
+    if not keyword:
+        return []
+    
+    if limit is None:
+        limit = FUZZY_SEARCH_LIMIT
+    keyword = keyword.lower()
+    refresh()
+    
+    return database.similar_students(keyword, limit, FUZZY_MIN_SIMILARITY)
+
+# Keep loaded students as compact records and only build student objects
+# when they are accessed, which speeds up startup for large rosters
+LAZY_LOADING = False
+
+# Whether the students have been loaded, by initialize() or on first access
+_initialized = False
+
+# Makes threads wait for the first load instead of loading again. It is
+# never taken while holding the database lock, since initialize() waits
+# for background saves that need that lock.
+_init_lock = threading.Lock()
+
+@metrics.timed("student_operations.initialize")
+def initialize(path=None):
+    """
+    Initialize the database by loading students from file.
+    
+    This happens automatically the first time students are accessed, so it
+    only needs to be called to choose the storage file or to force a reload.
+    
+    Args:
+        path (str, optional): Path of the storage file, replacing storage.STORAGE_FILE.
+            The journal, binary snapshot and SQLite database are kept next to it.
             
-        # Also search in Undergraduate minor or Postgraduate domain if applicable
-        if isinstance(student, Undergraduate):
-            minor = student.get_minor() or ""
-            if keyword in minor.lower():
-                if student not in matches:
-                    matches.append(student)
-        elif isinstance(student, Postgraduate):
-            domain = student.get_domain() or ""
-            if keyword in domain.lower():
-                if student not in matches:
-                    matches.append(student)
-    
-    return matches
-
-# Initialize database by loading students from file
-def initialize():
-    """Initialize the database by loading students from file."""
-    students = load_students()
-    database.students = students
-
-# Initialize the database when module is imported
-initialize()
+    Raises:
+        StorageException: If there's an error loading the data.
+    """
+    global _initialized
+    
+    # Changes still waiting to be saved would be lost by reloading
+    persistence.flush()
+    
+    with database.write_lock():
+        if path is not None:
+            storage.STORAGE_FILE = path
+        
+        with storage.file_lock():
+            _reload()
+        _initialized = True
+
+def _ensure_initialized():
+    """Load the students if they have not been loaded yet."""
+    if _initialized:
+        return
+    
+    with _init_lock:
+        if not _initialized:
+            initialize()